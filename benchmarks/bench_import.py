@@ -0,0 +1,119 @@
+"""
+Import-time benchmark for PlotEase, with a regression budget.
+
+Every statement is timed in fresh interpreters (the median of several runs is
+kept, so one slow start does not count), and the modules it loads are
+checked: `import plotease` must not pull in pandas, scipy or matplotlib, and
+the summary classes must not pull in matplotlib or seaborn.
+
+Usage:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --runs 9 --json import_times.json
+    python benchmarks/bench_import.py --budget-scale 2   # slower machines
+
+Exits with status 1 when a statement exceeds its budget or loads a module
+it should not.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Any
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# statement -> (time budget in seconds, modules it must not load)
+BUDGETS = {
+    'import plotease': (0.05, ('pandas', 'scipy', 'matplotlib', 'seaborn')),
+    'from plotease import SummaryGenerator': (1.0, ('scipy', 'matplotlib', 'seaborn')),
+    'from plotease import PlotEase': (1.0, ('scipy', 'matplotlib', 'seaborn')),
+    'from plotease import StreamingSummary': (1.0, ('scipy', 'matplotlib', 'seaborn')),
+}
+
+# Heavy third-party modules reported for every statement
+WATCHED_MODULES = ('pandas', 'numpy', 'scipy', 'matplotlib', 'seaborn')
+
+_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'modules': [m for m in {watched!r} if m in sys.modules]}}))
+"""
+
+
+def time_statement(statement: str, runs: int = 5) -> Dict[str, Any]:
+    """
+    Times one import statement in `runs` fresh interpreters.
+
+    Args:
+        statement: Python statement to time.
+        runs: Number of interpreters started.
+
+    Returns:
+        Dictionary with the median and all 'seconds', and the watched modules loaded.
+
+    Raises:
+        RuntimeError: If the statement fails.
+    """
+    code = _PROBE.format(statement=statement, watched=WATCHED_MODULES)
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=REPO_ROOT)
+        if result.returncode != 0:
+            raise RuntimeError(f"'{statement}' failed:\n{result.stderr}")
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return {
+        'statement': statement,
+        'seconds': statistics.median(s['seconds'] for s in samples),
+        'runs': [s['seconds'] for s in samples],
+        'modules': samples[-1]['modules'],
+    }
+
+
+def check(results: List[Dict[str, Any]], budget_scale: float = 1.0) -> List[str]:
+    """
+    Compares measured import times and loaded modules against BUDGETS.
+
+    Returns:
+        One message per violation (empty when everything is within budget).
+    """
+    failures = []
+    for result in results:
+        budget, forbidden = BUDGETS[result['statement']]
+        budget *= budget_scale
+        if result['seconds'] > budget:
+            failures.append(f"'{result['statement']}' took {result['seconds']:.3f}s (budget {budget:.3f}s)")
+        loaded = sorted(set(forbidden) & set(result['modules']))
+        if loaded:
+            failures.append(f"'{result['statement']}' loaded {loaded}")
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters per statement')
+    parser.add_argument('--budget-scale', type=float, default=1.0, help='multiplier applied to every time budget')
+    parser.add_argument('--json', help='write the results to this file')
+    args = parser.parse_args(argv)
+
+    results = [time_statement(statement, args.runs) for statement in BUDGETS]
+    for result in results:
+        budget = BUDGETS[result['statement']][0] * args.budget_scale
+        print(f"{result['statement']:<42} {result['seconds'] * 1000:8.1f} ms"
+              f"  (budget {budget * 1000:.0f} ms)  loads: {', '.join(result['modules']) or '-'}")
+
+    failures = check(results, args.budget_scale)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version, 'results': results, 'failures': failures}, f, indent=2)
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
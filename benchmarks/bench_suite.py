@@ -0,0 +1,256 @@
+"""
+Benchmark suite for PlotEase's public hot paths.
+
+Data comes from `utils.generate_sample_data`, scaled over a grid of row and
+column counts. Every benchmark is timed (best of several repeats, each on a
+fresh PlotEase so statistics caches start cold) and then run once more under
+`tracemalloc` for its peak memory, which covers NumPy and pandas buffers.
+Package import is timed in fresh interpreters (see `bench_import.py`).
+
+Usage:
+    python benchmarks/bench_suite.py --preset quick --json results.json
+    python benchmarks/bench_suite.py --preset default --baseline results.json
+    python benchmarks/bench_suite.py --rows 1000000 --cols 10 100 --only tabular_summary
+
+With --baseline, every case is compared with the stored run and the script
+exits with status 1 when one got slower or grew its peak memory by more
+than the tolerance.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+import plotease
+from plotease import PlotEase, ModelComparator, utils
+from bench_import import time_statement
+
+# (rows, columns) grids; 'full' needs a machine with tens of GB of memory
+PRESETS = {
+    'quick': ([1_000, 10_000], [10]),
+    'default': ([1_000, 100_000, 1_000_000], [10, 100]),
+    'full': ([1_000, 100_000, 10_000_000, 100_000_000], [10, 100, 1_000, 5_000]),
+}
+
+# Cases larger than this many cells are skipped unless --max-cells says otherwise
+DEFAULT_MAX_CELLS = 200_000_000
+
+# A case regresses when it is this much slower / bigger than the baseline...
+DEFAULT_TOLERANCE = 0.25
+# ...and slower by at least this many seconds (timer noise on tiny cases)
+MIN_SECONDS_DELTA = 0.005
+
+
+def _quiet(fn: Callable[[], Any]) -> Any:
+    """Runs `fn` with stdout discarded (several API methods print)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn()
+
+
+# name -> (setup(data) -> state, run(state)); setup is not timed
+BENCHMARKS: Dict[str, Tuple[Callable[[pd.DataFrame], Any], Callable[[Any], Any]]] = {
+    'tabular_summary': (
+        lambda data: PlotEase(data),
+        lambda pe: pe.tabular_summary(style='full'),
+    ),
+    'autoplot': (
+        lambda data: PlotEase(data),
+        lambda pe: pe.autoplot(target='salary'),
+    ),
+    'quick_plot': (
+        lambda data: PlotEase(data),
+        lambda pe: pe.quick_plot('satisfaction', 'salary'),
+    ),
+    'find_highly_correlated_pairs': (
+        lambda data: data.select_dtypes('number'),
+        lambda numeric: utils.find_highly_correlated_pairs(numeric, threshold=0.8),
+    ),
+    'detect_outliers_iqr': (
+        lambda data: data['satisfaction'],
+        lambda column: utils.detect_outliers_iqr(column),
+    ),
+    'compare_models': (
+        lambda data: ModelComparator(utils.generate_model_results(min(len(data.columns), 50))),
+        lambda comparator: _quiet(comparator.compare_models),
+    ),
+}
+
+# Statements timed by the 'import' benchmark
+IMPORT_STATEMENTS = ('import plotease', 'from plotease import PlotEase')
+
+
+def measure(setup: Callable[[], Any], run: Callable[[Any], Any], repeats: int = 3) -> Dict[str, float]:
+    """
+    Times `run(setup())` and records its peak traced memory.
+
+    Args:
+        setup: Builds the state for one run (not timed).
+        run: The operation being measured.
+        repeats: Timed runs; the fastest is kept.
+
+    Returns:
+        Dictionary with 'seconds' (best), 'mean_seconds' and 'peak_mb'.
+    """
+    times = []
+    for _ in range(repeats):
+        state = setup()
+        gc.collect()
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+        plt.close('all')
+        del state
+
+    # Memory is traced in a separate run: tracing slows Python code down
+    state = setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        plt.close('all')
+    return {'seconds': min(times), 'mean_seconds': sum(times) / len(times), 'peak_mb': peak / 2 ** 20}
+
+
+def run_suite(rows: List[int], cols: List[int], names: Optional[List[str]] = None,
+              repeats: int = 3, max_cells: int = DEFAULT_MAX_CELLS,
+              log: Callable[[str], None] = print) -> List[Dict[str, Any]]:
+    """
+    Runs every selected benchmark over the rows x columns grid.
+
+    Args:
+        rows: Row counts.
+        cols: Column counts (at least the 6 base columns of the sample data).
+        names: Benchmarks to run, including 'import' (default: all).
+        repeats: Timed runs per case.
+        max_cells: Cases with more rows x columns are skipped.
+        log: Called with one line per finished case.
+
+    Returns:
+        One result dictionary per case.
+    """
+    names = names or ['import', *BENCHMARKS]
+    results = []
+    if 'import' in names:
+        for statement in IMPORT_STATEMENTS:
+            timing = time_statement(statement, runs=max(repeats, 3))
+            results.append({'benchmark': 'import', 'case': statement, 'rows': None, 'cols': None,
+                            'seconds': timing['seconds'], 'mean_seconds': sum(timing['runs']) / len(timing['runs']),
+                            'peak_mb': None})
+            log(_format(results[-1]))
+
+    for n_rows in rows:
+        for n_cols in cols:
+            if n_rows * n_cols > max_cells:
+                log(f"skipping {n_rows:,} x {n_cols:,}: more than {max_cells:,} cells")
+                continue
+            data = utils.generate_sample_data(n_rows, n_columns=n_cols)
+            for name in names:
+                if name == 'import':
+                    continue
+                setup, run = BENCHMARKS[name]
+                timing = measure(lambda: setup(data), run, repeats)
+                results.append({'benchmark': name, 'case': f'{n_rows}x{n_cols}',
+                                'rows': n_rows, 'cols': n_cols, **timing})
+                log(_format(results[-1]))
+            del data
+    return results
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Compares results with a baseline run, case by case.
+
+    Returns:
+        One message per regression (empty when none). Cases missing from the
+        baseline are ignored.
+    """
+    previous = {(r['benchmark'], r['case']): r for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result['benchmark'], result['case']))
+        if before is None:
+            continue
+        label = f"{result['benchmark']} [{result['case']}]"
+        slower = result['seconds'] - before['seconds']
+        if slower > MIN_SECONDS_DELTA and result['seconds'] > before['seconds'] * (1 + tolerance):
+            regressions.append(f"{label}: {before['seconds']:.4f}s -> {result['seconds']:.4f}s")
+        if result['peak_mb'] and before.get('peak_mb') and result['peak_mb'] > before['peak_mb'] * (1 + tolerance) + 1:
+            regressions.append(f"{label}: peak {before['peak_mb']:.1f} MB -> {result['peak_mb']:.1f} MB")
+    return regressions
+
+
+def environment() -> Dict[str, str]:
+    """Versions and machine details stored with every run."""
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'plotease': plotease.__version__,
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'matplotlib': matplotlib.__version__,
+    }
+
+
+def _format(result: Dict[str, Any]) -> str:
+    peak = f"{result['peak_mb']:9.1f} MB" if result['peak_mb'] is not None else ' ' * 12
+    return f"{result['benchmark']:<30} {result['case']:<32} {result['seconds'] * 1000:10.1f} ms {peak}"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='quick', help='rows x columns grid')
+    parser.add_argument('--rows', type=int, nargs='+', help='row counts (overrides the preset)')
+    parser.add_argument('--cols', type=int, nargs='+', help='column counts (overrides the preset)')
+    parser.add_argument('--only', nargs='+', choices=['import', *BENCHMARKS], help='benchmarks to run')
+    parser.add_argument('--repeats', type=int, default=3, help='timed runs per case (best is kept)')
+    parser.add_argument('--max-cells', type=int, default=DEFAULT_MAX_CELLS, help='skip larger cases')
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--baseline', help='results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='allowed relative slowdown / memory growth')
+    args = parser.parse_args(argv)
+
+    rows, cols = PRESETS[args.preset]
+    results = run_suite(args.rows or rows, args.cols or cols, args.only, args.repeats, args.max_cells)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f)['results'], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if not regressions:
+            print(f"No regressions against {args.baseline}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(), 'results': results, 'regressions': regressions}, f, indent=2)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -19,16 +19,43 @@ __author__ = 'PlotEase Team'
 __email__ = 'your.email@example.com'
 __license__ = 'MIT'
 
-# Import main classes
-from .visualization import VisualizationBase
-from .plotease import PlotEase
-from .diagnostic import DiagnosticPlotter
-from .summary import SummaryGenerator
-from .model_comp import ModelComparator
-from .quick_plotter import QuickPlotter
+import importlib
 
-# Import utilities
-from . import utils
+# Main classes and utilities, imported from their submodule on first access
+# (PEP 562), so `import plotease` does not load pandas, scipy or matplotlib
+_LAZY_ATTRIBUTES = {
+    'VisualizationBase': 'visualization',
+    'PlotEase': 'plotease',
+    'DiagnosticPlotter': 'diagnostic',
+    'SummaryGenerator': 'summary',
+    'ModelComparator': 'model_comp',
+    'QuickPlotter': 'quick_plotter',
+    'StreamingSummary': 'streaming',
+    'summarize_chunks': 'streaming',
+    'render_batch': 'batch',
+    'DataSource': 'sources',
+    'ColumnCache': 'cache',
+    'ResultCache': 'cache',
+}
+
+# Submodules exposed as attributes of the package
+_LAZY_MODULES = ('utils',)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(f'.{_LAZY_ATTRIBUTES[name]}', __name__), name)
+    elif name in _LAZY_MODULES:
+        value = importlib.import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    # Cache it: later lookups no longer go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | set(_LAZY_MODULES))
 
 # Define what gets imported with "from plotease import *"
 __all__ = [
@@ -39,6 +66,12 @@ __all__ = [
     'SummaryGenerator',
     'ModelComparator',
     'QuickPlotter',
+    'StreamingSummary',
+    'summarize_chunks',
+    'render_batch',
+    'DataSource',
+    'ColumnCache',
+    'ResultCache',
     
     # Utilities module
     'utils',
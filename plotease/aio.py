@@ -0,0 +1,155 @@
+import asyncio
+import os
+import threading
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+from typing import Optional, Dict, Any, Hashable
+from .batch import render_bytes
+from .profile import DataProfile
+
+# Renders in flight or queued per event loop before callers have to wait
+DEFAULT_MAX_PENDING = 64
+
+
+class AsyncRenderer:
+    """
+    Renders plots to image bytes off the event loop, for asyncio services.
+
+    Work runs on a bounded pool: threads by default, which share each
+    dataset's statistics cache, or processes (`processes=True`), which
+    sidestep the GIL but receive a pickled copy of the data with every call.
+    At most `max_pending` renders are queued or running per event loop;
+    further callers wait for a slot (backpressure) instead of piling up work.
+
+    Identical concurrent requests share one computation: a request whose key
+    is already in flight awaits the same result. Cancelling a request only
+    cancels the underlying work once no other request is waiting for it, and
+    only if it has not started yet (a running render cannot be interrupted).
+
+    Example:
+        >>> renderer = AsyncRenderer(max_workers=4)
+        >>> png = await pe.autoplot_async(target='price', renderer=renderer)
+
+    Attributes:
+        max_pending (int): Renders allowed in flight per event loop.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: int = DEFAULT_MAX_PENDING,
+                 processes: bool = False, executor: Optional[Executor] = None):
+        """
+        Args:
+            max_workers: Pool size (default: the CPU count, at most 8).
+            max_pending: Renders allowed in flight per event loop.
+            processes: Use a process pool instead of threads.
+            executor: An existing executor to use instead of creating a pool.
+
+        Raises:
+            ValueError: If max_pending is not positive.
+        """
+        if max_pending < 1:
+            raise ValueError("max_pending must be positive")
+        workers = max_workers or min(8, os.cpu_count() or 1)
+        self._processes = processes or isinstance(executor, ProcessPoolExecutor)
+        if executor is None:
+            executor = (ProcessPoolExecutor if processes else ThreadPoolExecutor)(max_workers=workers)
+        self._executor = executor
+        self.max_pending = max_pending
+        # Per event loop: the slot semaphore and the renders in flight by key
+        self._slots: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]' = \
+            weakref.WeakKeyDictionary()
+        self._in_flight: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, list]]' = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _loop_state(self, loop: asyncio.AbstractEventLoop):
+        with self._lock:
+            if loop not in self._slots:
+                self._slots[loop] = asyncio.Semaphore(self.max_pending)
+                self._in_flight[loop] = {}
+            return self._slots[loop], self._in_flight[loop]
+
+    async def render(self, job: Dict[str, Any], fmt: str = 'png', dpi: float = 100,
+                     profile: Optional[DataProfile] = None, key: Optional[Hashable] = None) -> bytes:
+        """
+        Renders a job (see `batch.render_batch`) to image bytes.
+
+        Args:
+            job: Job specification.
+            fmt: 'png', 'svg' or 'pdf'.
+            dpi: Resolution for raster output.
+            profile: DataProfile of the job's DataFrame (used by thread pools only).
+            key: Requests with equal keys share one render while it is in flight
+                 (default: no sharing).
+
+        Returns:
+            The encoded image.
+        """
+        loop = asyncio.get_running_loop()
+        slots, in_flight = self._loop_state(loop)
+        if key is not None and key in in_flight:
+            return await self._wait(in_flight, key)
+
+        await slots.acquire()
+        if key is not None and key in in_flight:
+            # Started by another request while this one waited for a slot
+            slots.release()
+            return await self._wait(in_flight, key)
+        try:
+            work = self._executor.submit(render_bytes, job, fmt, dpi, None if self._processes else profile)
+        except BaseException:
+            slots.release()
+            raise
+        # The slot is freed when the work really ends, even if its waiters left early
+        work.add_done_callback(partial(_release_slot, loop, slots))
+        future = asyncio.wrap_future(work, loop=loop)
+        if key is None:
+            return await future
+        # [shared future, number of requests waiting for it]
+        in_flight[key] = [future, 0]
+        future.add_done_callback(lambda _: in_flight.pop(key, None))
+        return await self._wait(in_flight, key)
+
+    @staticmethod
+    async def _wait(in_flight: Dict[Hashable, list], key: Hashable) -> bytes:
+        entry = in_flight[key]
+        future = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.done() and entry[1] == 1:
+                # The last interested request left: drop the work if not yet started
+                future.cancel()
+            raise
+        finally:
+            entry[1] -= 1
+
+    def shutdown(self, wait: bool = True):
+        """Shuts the pool down."""
+        self._executor.shutdown(wait=wait)
+
+    def __repr__(self) -> str:
+        kind = 'processes' if self._processes else 'threads'
+        return f"AsyncRenderer({kind}, max_pending={self.max_pending})"
+
+
+def _release_slot(loop: asyncio.AbstractEventLoop, slots: asyncio.Semaphore, _):
+    try:
+        loop.call_soon_threadsafe(slots.release)
+    except RuntimeError:
+        # The event loop was closed meanwhile: nobody is left to wait for the slot
+        pass
+
+
+_DEFAULT_RENDERER: Optional[AsyncRenderer] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_renderer() -> AsyncRenderer:
+    """The process-wide thread-pool renderer, created on first use."""
+    global _DEFAULT_RENDERER
+    with _DEFAULT_LOCK:
+        if _DEFAULT_RENDERER is None:
+            _DEFAULT_RENDERER = AsyncRenderer()
+        return _DEFAULT_RENDERER
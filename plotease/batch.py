@@ -0,0 +1,262 @@
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Optional, List, Dict, Any, Tuple
+import pandas as pd
+from .diagnostic import DiagnosticPlotter
+from .quick_plotter import QuickPlotter
+from .model_comp import ModelComparator
+from .profile import DataProfile
+from .rendering import new_figure, save_figure, figure_bytes, figure_format, themed, release_figure
+from .tracing import stage
+from .cache import ResultCache
+
+# Plot kinds understood by render_batch
+BATCH_KINDS = ('autoplot', 'quick_plot', 'compare_models')
+
+# Named datasets shipped to each worker once (see render_batch(datasets=...)),
+# and one statistics profile per named dataset, reused by every job in the worker.
+# Files are cached with their profiles in `_read_file`'s small LRU instead.
+_SHARED_DATA: Dict[str, pd.DataFrame] = {}
+_SHARED_PROFILES: Dict[str, DataProfile] = {}
+
+
+def _init_worker(datasets: Dict[str, pd.DataFrame]):
+    _SHARED_DATA.clear()
+    _SHARED_PROFILES.clear()
+    _SHARED_DATA.update(datasets)
+
+
+@lru_cache(maxsize=4)
+def _read_file(path: str) -> Tuple[pd.DataFrame, DataProfile]:
+    """Loads a data file with its statistics profile; both are evicted together."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        frame = pd.read_csv(path)
+    elif ext in ('.parquet', '.pq'):
+        frame = pd.read_parquet(path)
+    else:
+        raise ValueError(f"Cannot load '{path}': expected a .csv or .parquet file")
+    return frame, DataProfile(frame)
+
+
+def _resolve_data(data: Any):
+    """Returns (DataFrame, shared profile or None) for a job's `data` entry."""
+    if isinstance(data, pd.DataFrame):
+        return data, None
+    if isinstance(data, str):
+        if data not in _SHARED_DATA:
+            return _read_file(data)
+        if data not in _SHARED_PROFILES:
+            _SHARED_PROFILES[data] = DataProfile(_SHARED_DATA[data])
+        return _SHARED_DATA[data], _SHARED_PROFILES[data]
+    raise TypeError("Job data must be a DataFrame, a shared dataset name or a file path")
+
+
+def render_job(job: Dict[str, Any], output_dir: str = '.', fmt: str = 'png', dpi: float = 100,
+               cache: Optional[ResultCache] = None, profile: Optional[DataProfile] = None) -> str:
+    """
+    Renders one job to a file, on a standalone Agg Figure (no pyplot figure).
+
+    Args:
+        job: Job specification, see `render_batch`.
+        output_dir: Directory the file is written to.
+        fmt: Default file format, overridden by the job's 'format'.
+        dpi: Resolution for raster output.
+        cache: Optional ResultCache: a figure already rendered from the same
+               data, options, theme and format is copied instead of drawn.
+        profile: Optional DataProfile of the job's DataFrame, to reuse its statistics.
+
+    Returns:
+        Path of the written file.
+
+    Raises:
+        ValueError: If the job kind or format is unknown.
+    """
+    options = dict(job)
+    kind = options.pop('kind', 'autoplot')
+    name = options.pop('name')
+    theme = options.pop('theme', 'default')
+    fmt = figure_format(name, options.pop('format', fmt))
+    path = os.path.join(output_dir, f"{name}.{fmt}")
+    if kind not in BATCH_KINDS:
+        raise ValueError(f"Unknown job kind '{kind}'. Available: {list(BATCH_KINDS)}")
+
+    data = None
+    if kind != 'compare_models':
+        data, shared = _resolve_data(options.pop('data'))
+        profile = shared or profile
+    if cache is not None:
+        fingerprint = settings = None
+        if data is not None:
+            profile = profile if profile is not None else DataProfile(data)
+            fingerprint, settings = profile.fingerprint(), profile.settings
+        key = cache.key('render', kind, theme, fmt, dpi, options, settings, fingerprint)
+        cached = cache.get_file(key, fmt)
+        if cached is not None:
+            shutil.copyfile(cached, path)
+            return path
+
+    prepared = _prepare_job(kind, options, theme, dpi, data, profile)
+    with themed(theme):
+        fig = _draw_job(*prepared, dpi)
+        try:
+            save_figure(fig, path)
+        finally:
+            release_figure(fig)
+    if cache is not None:
+        cache.put_file(key, path, fmt)
+    return path
+
+
+def render_bytes(job: Dict[str, Any], fmt: str = 'png', dpi: float = 100,
+                 profile: Optional[DataProfile] = None) -> bytes:
+    """
+    Renders one job to image bytes, on a standalone Agg Figure.
+
+    The statistics and plot data of every job kind are computed before the
+    theme is applied, so threads rendering concurrently only serialize on
+    drawing (see `rendering.RENDER_LOCK`).
+
+    Args:
+        job: Job specification, see `render_batch` ('name' is not needed).
+        fmt: 'png', 'svg' or 'pdf', overridden by the job's 'format'.
+        dpi: Resolution for raster output.
+        profile: Optional DataProfile of the job's DataFrame, to reuse its statistics.
+
+    Returns:
+        The encoded image.
+
+    Raises:
+        ValueError: If the job kind or format is unknown.
+    """
+    options = dict(job)
+    kind = options.pop('kind', 'autoplot')
+    theme = options.pop('theme', 'default')
+    fmt = figure_format('', options.pop('format', fmt))
+    options.pop('name', None)
+    if kind not in BATCH_KINDS:
+        raise ValueError(f"Unknown job kind '{kind}'. Available: {list(BATCH_KINDS)}")
+
+    data = None
+    if kind != 'compare_models':
+        data, shared = _resolve_data(options.pop('data'))
+        profile = shared or profile
+    prepared = _prepare_job(kind, options, theme, dpi, data, profile)
+    with themed(theme):
+        fig = _draw_job(*prepared, dpi)
+        try:
+            return figure_bytes(fig, fmt)
+        finally:
+            release_figure(fig)
+
+
+def _prepare_job(kind: str, options: Dict[str, Any], theme: str, dpi: float,
+                 data: Optional[pd.DataFrame], profile: Optional[DataProfile]) -> tuple:
+    """
+    Creates a job's plotter and computes what it draws, before the theme is taken.
+
+    Returns:
+        (plotter, figure size, keyword arguments of the plotter's `draw`).
+    """
+    if kind == 'compare_models':
+        return ModelComparator(options.pop('results')), (15, 6), options
+    if kind == 'autoplot':
+        plotter = DiagnosticPlotter(data, theme, profile=profile).precompute(options.get('target'))
+        return plotter, plotter.figure_size(options.get('max_plots', 6)), options
+    plotter = QuickPlotter(data, theme, profile=profile)
+    figsize = options.pop('figsize', (10, 6))
+    draw_options = {key: options.pop(key) for key in ('color', 'title') if key in options}
+    draw_options['plot'] = plotter.prepare(figsize=figsize, dpi=dpi, **options)
+    return plotter, figsize, draw_options
+
+
+def _draw_job(plotter, figsize: tuple, options: Dict[str, Any], dpi: float):
+    """Draws a prepared job on a new standalone figure (inside the caller's theme)."""
+    fig = new_figure(figsize, dpi)
+    plotter.draw(fig, **options)
+    if not isinstance(plotter, ModelComparator):
+        # The comparison charts lay themselves out around their legend
+        with stage('tight_layout', 'layout'):
+            fig.tight_layout()
+    return fig
+
+
+def render_batch(jobs: List[Dict[str, Any]], output_dir: str = '.',
+                 fmt: str = 'png', dpi: float = 100,
+                 datasets: Optional[Dict[str, pd.DataFrame]] = None,
+                 max_workers: Optional[int] = None,
+                 chunksize: Optional[int] = None,
+                 cache: Optional[ResultCache] = None) -> List[str]:
+    """
+    Renders many plots to files in parallel, headless.
+
+    Each job is drawn on its own Agg-backed Figure, so pyplot's global figure
+    state is never used and nothing is shown. Jobs are spread over a pool of
+    worker processes.
+
+    Every job is a dictionary with:
+        - 'kind': 'autoplot' (default), 'quick_plot' or 'compare_models';
+        - 'data': a DataFrame, the name of an entry in `datasets`, or a .csv /
+          .parquet path (not needed for 'compare_models', which takes 'results');
+        - 'name': output file name without extension (default: '<kind>_<index>');
+        - 'theme' and 'format' (optional), plus the keyword arguments of
+          `DiagnosticPlotter.draw`, `QuickPlotter.draw` or `ModelComparator.draw`.
+
+    Example:
+        >>> jobs = [{'data': 'cars', 'target': 'mpg'},
+        ...         {'kind': 'quick_plot', 'data': 'cars', 'x': 'hp', 'y': 'mpg'}]
+        >>> render_batch(jobs, 'reports', fmt='svg', datasets={'cars': df})
+
+    Args:
+        jobs: Job specifications.
+        output_dir: Directory the files are written to (created if missing).
+        fmt: Default file format: 'png', 'svg' or 'pdf'.
+        dpi: Resolution for raster output.
+        datasets: DataFrames shared by many jobs. They are sent to each worker
+                  once instead of with every job, and their statistics profile is
+                  reused across the jobs a worker runs.
+        max_workers: Number of worker processes (default: CPU count). With 1,
+                     jobs run in the calling process.
+        chunksize: Jobs handed to a worker at a time (default: a few batches per worker).
+        cache: Optional ResultCache shared by the workers: jobs whose figure is
+               cached are copied instead of rendered (see `render_job`). The
+               workers' hits and misses are added to its counters.
+
+    Returns:
+        Paths of the written files, in job order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [job if 'name' in job else {**job, 'name': f"{job.get('kind', 'autoplot')}_{i:05d}"}
+            for i, job in enumerate(jobs)]
+    render = partial(render_job, output_dir=output_dir, fmt=fmt, dpi=dpi, cache=cache)
+    datasets = datasets or {}
+
+    if max_workers == 1:
+        _init_worker(datasets)
+        try:
+            return [render(job) for job in jobs]
+        finally:
+            _init_worker({})
+
+    workers = max_workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(datasets,)) as executor:
+        if cache is None:
+            return list(executor.map(render, jobs, chunksize=chunksize))
+        counted = partial(_render_counted, output_dir=output_dir, fmt=fmt, dpi=dpi, cache=cache)
+        results = list(executor.map(counted, jobs, chunksize=chunksize))
+    # Each worker counted on its own copy of the cache
+    cache.hits += sum(hits for _, hits, _ in results)
+    cache.misses += sum(misses for _, _, misses in results)
+    return [path for path, _, _ in results]
+
+
+def _render_counted(job: Dict[str, Any], cache: ResultCache, **options) -> tuple:
+    """`render_job` in a worker: returns (path, cache hits, cache misses) of the call."""
+    hits, misses = cache.hits, cache.misses
+    path = render_job(job, cache=cache, **options)
+    return path, cache.hits - hits, cache.misses - misses
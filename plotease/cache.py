@@ -0,0 +1,496 @@
+import hashlib
+import json
+import os
+import time
+import pickle
+import shutil
+import uuid
+import pandas as pd
+import numpy as np
+from typing import Optional, List, Dict, Any, Callable, Sequence, Tuple
+
+# Bumped whenever the on-disk layout changes: older entries are never read
+_FORMAT_VERSION = 1
+
+# Name of the per-entry metadata file; its mtime is the entry's last use
+_META_FILE = 'meta.pkl'
+
+
+class ColumnCache:
+    """
+    On-disk cache of prepared DataFrames, stored as memory-mapped column files.
+
+    Every entry is a directory holding one `.npy` file per column (categorical
+    columns store their codes), opened with `np.load(mmap_mode='r')`. Loading
+    an entry therefore costs milliseconds whatever its size: pages are read
+    lazily, and processes opening the same entry share them through the OS
+    page cache. String columns are stored as codes plus distinct values and
+    rebuilt with one `take`; other columns without a NumPy representation
+    (object, nullable and timezone-aware dtypes) are pickled and read in full.
+
+    Entries are keyed by a fingerprint of their source (see
+    `source_fingerprint`), so a changed file is read again instead of served
+    stale. When `max_bytes` is set, the least recently used entries are
+    deleted after each store until the cache fits.
+
+    Loaded frames are read-only views of the files: pandas copies a column
+    before modifying it. The cache directory should only be writable by
+    trusted users, since metadata is unpickled.
+
+    Example:
+        >>> cache = ColumnCache('~/.cache/plotease', max_bytes=20 * 2**30)
+        >>> data = cache.read(DataSource('sales.parquet'), prepare=utils.optimize_memory)
+
+    Attributes:
+        directory (str): Cache root.
+        max_bytes (int): Size limit (None: unbounded).
+    """
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None):
+        """
+        Args:
+            directory: Cache root, created if missing.
+            max_bytes: Total size above which least recently used entries are evicted.
+        """
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.directory, f"v{_FORMAT_VERSION}-{key}")
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self._entry(key), _META_FILE))
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Opens a cached frame, memory-mapped.
+
+        Returns:
+            The DataFrame, or None when `key` is not cached.
+        """
+        entry = self._entry(key)
+        meta_path = os.path.join(entry, _META_FILE)
+        try:
+            with open(meta_path, 'rb') as f:
+                meta = pickle.load(f)
+            columns = {i: _load_column(entry, i, spec) for i, spec in enumerate(meta['columns'])}
+            index = _load_column(entry, 'index', meta['index'])
+        except FileNotFoundError:
+            # Missing, or evicted by another process while being opened
+            return None
+        os.utime(meta_path)
+        frame = pd.DataFrame(columns, index=index, copy=False)
+        frame.columns = meta['labels']
+        return frame
+
+    def put(self, key: str, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Stores a frame under `key`, then evicts old entries if over `max_bytes`.
+
+        The entry is written to a temporary directory and renamed into place,
+        so concurrent readers never see a partial entry.
+
+        Returns:
+            The stored frame, opened memory-mapped like a later `get`.
+        """
+        entry = self._entry(key)
+        staging = os.path.join(self.directory, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        try:
+            meta = {'labels': data.columns,
+                    'columns': [_store_column(staging, i, data.iloc[:, i]) for i in range(data.shape[1])],
+                    'index': _store_column(staging, 'index', data.index)}
+            with open(os.path.join(staging, _META_FILE), 'wb') as f:
+                pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+            if os.path.exists(entry):
+                shutil.rmtree(entry, ignore_errors=True)
+            os.rename(staging, entry)
+        except OSError:
+            # Another process stored the same entry first: keep theirs
+            shutil.rmtree(staging, ignore_errors=True)
+            if key not in self:
+                raise
+        self.evict(keep=key)
+        return self.get(key)
+
+    def read(self, source, columns: Optional[Sequence[str]] = None, filters=None,
+             prepare: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None) -> pd.DataFrame:
+        """
+        Reads a DataSource through the cache.
+
+        Args:
+            source: A `sources.DataSource`.
+            columns, filters: As in `DataSource.read`.
+            prepare: Optional typing step applied before storing (e.g.
+                     `utils.optimize_memory`); part of the cache key.
+
+        Returns:
+            The prepared DataFrame, memory-mapped from the cache.
+        """
+        key = source_fingerprint(source, columns, filters, prepare)
+        data = self.get(key)
+        if data is None:
+            data = source.read(columns, filters)
+            if prepare is not None:
+                data = prepare(data)
+            data = self.put(key, data)
+        return data
+
+    def entries(self) -> pd.DataFrame:
+        """
+        The cached entries, least recently used first.
+
+        Returns:
+            DataFrame indexed by key with 'bytes' and 'last_used' (a Timestamp).
+        """
+        rows = {}
+        prefix = f"v{_FORMAT_VERSION}-"
+        for name in os.listdir(self.directory):
+            if not name.startswith(prefix):
+                continue
+            try:
+                rows[name[len(prefix):]] = (_directory_size(os.path.join(self.directory, name)),
+                                            os.path.getmtime(os.path.join(self.directory, name, _META_FILE)))
+            except FileNotFoundError:
+                continue
+        frame = pd.DataFrame.from_dict(rows, orient='index', columns=['bytes', 'last_used'])
+        frame['last_used'] = pd.to_datetime(frame['last_used'], unit='s')
+        return frame.sort_values('last_used', kind='stable')
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the cached entries on disk."""
+        return int(self.entries()['bytes'].sum())
+
+    def evict(self, max_bytes: Optional[int] = None, keep: Optional[str] = None) -> List[str]:
+        """
+        Deletes least recently used entries until the cache fits in `max_bytes`.
+
+        Args:
+            max_bytes: Size limit (default: the cache's `max_bytes`; None keeps all).
+            keep: Key that is never evicted (e.g. the entry just stored).
+
+        Returns:
+            The evicted keys.
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        if limit is None:
+            return []
+        return _evict_lru(self.entries()['bytes'], limit, keep,
+                          lambda key: shutil.rmtree(self._entry(key), ignore_errors=True))
+
+    def clear(self):
+        """Deletes every entry."""
+        for key in self.entries().index:
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+
+    def __len__(self) -> int:
+        return len(self.entries())
+
+    def __repr__(self) -> str:
+        return f"ColumnCache('{self.directory}', entries={len(self)}, max_bytes={self.max_bytes})"
+
+
+class ResultCache:
+    """
+    Content-addressed disk cache of finished results: summary tables and
+    rendered figure files.
+
+    Keys are digests of everything a result depends on (see `key`): the data
+    fingerprint, the method and its arguments, the theme and the PlotEase
+    version, so a hit is always safe to hand back. Tables are stored as
+    Parquet when pyarrow can write them, as pickles otherwise; figures are
+    stored as the PNG / SVG / PDF file itself.
+
+    Entries older than `ttl` seconds are dropped, and beyond `max_bytes` the
+    least recently used go first. `hits` and `misses` count the lookups made
+    through this object, including those of `render_batch`'s worker processes.
+
+    Example:
+        >>> results = ResultCache('~/.cache/plotease-results', max_bytes=2**30, ttl=7 * 86400)
+        >>> pe = PlotEase(df, result_cache=results)
+        >>> pe.tabular_summary()   # computed, then stored
+        >>> pe.tabular_summary()   # read back
+        >>> results.stats()
+
+    Attributes:
+        directory (str): Cache root.
+        max_bytes (int): Size limit (None: unbounded).
+        ttl (float): Maximum age of an entry in seconds (None: no expiry).
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that found nothing.
+    """
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Args:
+            directory: Cache root, created if missing.
+            max_bytes: Total size above which least recently used entries are evicted.
+            ttl: Seconds after which an entry expires.
+        """
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """
+        Digest of a result's inputs (JSON-encoded, dictionaries with sorted
+        keys), combined with the PlotEase version.
+
+        Returns:
+            Hex digest string.
+        """
+        from . import __version__
+        text = json.dumps([__version__, *parts], sort_keys=True, default=repr)
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def _path(self, key: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{key}.{extension}")
+
+    def _lookup(self, key: str, extensions: Sequence[str]) -> Optional[str]:
+        """Path of a live entry (its last use is recorded), or None; counts the hit or miss."""
+        now = time.time()
+        for extension in extensions:
+            path = self._path(key, extension)
+            try:
+                written = os.stat(path).st_mtime
+                if self.ttl is not None and now - written > self.ttl:
+                    os.remove(path)
+                    continue
+                # atime = last use (for LRU eviction), mtime = written (for the TTL)
+                os.utime(path, (now, written))
+            except FileNotFoundError:
+                continue
+            self.hits += 1
+            return path
+        self.misses += 1
+        return None
+
+    def _store(self, key: str, extension: str, write: Callable[[str], None]) -> str:
+        """Writes an entry through a temporary file renamed into place, then evicts."""
+        path = self._path(key, extension)
+        staging = os.path.join(self.directory, f".tmp-{uuid.uuid4().hex}.{extension}")
+        try:
+            write(staging)
+            os.replace(staging, path)
+        finally:
+            if os.path.exists(staging):
+                os.remove(staging)
+        self.evict(keep=os.path.basename(path))
+        return path
+
+    def get_frame(self, key: str) -> Optional[pd.DataFrame]:
+        """A cached table, or None."""
+        path = self._lookup(key, ('parquet', 'pkl'))
+        if path is None:
+            return None
+        return pd.read_parquet(path) if path.endswith('.parquet') else pd.read_pickle(path)
+
+    def put_frame(self, key: str, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Stores a table (Parquet, or a pickle when pyarrow is missing or cannot
+        represent its columns).
+
+        Returns:
+            The table, for chaining.
+        """
+        try:
+            self._store(key, 'parquet', frame.to_parquet)
+        except (ImportError, TypeError, ValueError):
+            self._store(key, 'pkl', frame.to_pickle)
+        return frame
+
+    def get_file(self, key: str, fmt: str) -> Optional[str]:
+        """Path of a cached file in format `fmt` (e.g. 'png'), or None."""
+        return self._lookup(key, (fmt,))
+
+    def put_file(self, key: str, path: str, fmt: str) -> str:
+        """
+        Stores a copy of the file at `path`.
+
+        Returns:
+            The path of the cached copy.
+        """
+        return self._store(key, fmt, lambda staging: shutil.copyfile(path, staging))
+
+    def entries(self) -> pd.DataFrame:
+        """
+        The cached entries, least recently used first.
+
+        Returns:
+            DataFrame indexed by file name with 'bytes', 'written' and 'last_used'.
+        """
+        rows = {}
+        for name in os.listdir(self.directory):
+            if name.startswith('.'):
+                continue
+            try:
+                info = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            rows[name] = (info.st_size, info.st_mtime, info.st_atime)
+        frame = pd.DataFrame.from_dict(rows, orient='index', columns=['bytes', 'written', 'last_used'])
+        for column in ('written', 'last_used'):
+            frame[column] = pd.to_datetime(frame[column], unit='s')
+        return frame.sort_values('last_used', kind='stable')
+
+    def evict(self, max_bytes: Optional[int] = None, keep: Optional[str] = None) -> List[str]:
+        """
+        Deletes expired entries, then least recently used ones until the cache
+        fits in `max_bytes`.
+
+        Args:
+            max_bytes: Size limit (default: the cache's `max_bytes`).
+            keep: File name that is never evicted (e.g. the entry just stored).
+
+        Returns:
+            The evicted file names.
+        """
+        entries = self.entries()
+        def remove(name: str):
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+        evicted = []
+        if self.ttl is not None:
+            expired = entries.index[entries['written'] < pd.Timestamp(time.time() - self.ttl, unit='s')]
+            for name in expired:
+                if name != keep:
+                    remove(name)
+                    evicted.append(name)
+            entries = entries.drop(evicted)
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        if limit is not None:
+            evicted += _evict_lru(entries['bytes'], limit, keep, remove)
+        return evicted
+
+    def clear(self):
+        """Deletes every entry (the counters are kept)."""
+        for name in self.entries().index:
+            os.remove(os.path.join(self.directory, name))
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit and miss counts, hit rate, number of entries and their total size."""
+        entries = self.entries()
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(entries), 'bytes': int(entries['bytes'].sum())}
+
+    def __len__(self) -> int:
+        return len(self.entries())
+
+    def __repr__(self) -> str:
+        return f"ResultCache('{self.directory}', hits={self.hits}, misses={self.misses})"
+
+
+def source_fingerprint(source, columns: Optional[Sequence[str]] = None, filters=None,
+                       prepare: Optional[Callable] = None) -> str:
+    """
+    Cache key of a DataSource read: its files' names, sizes and modification
+    times, plus the columns, filters and preparation step.
+
+    Returns:
+        Hex digest string.
+    """
+    path = os.path.abspath(source.path)
+    if os.path.isdir(path):
+        files = sorted(os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+    else:
+        files = [path]
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((path, source.format, None if columns is None else list(columns), filters,
+                        None if prepare is None else f"{prepare.__module__}.{prepare.__qualname__}")).encode())
+    for name in files:
+        info = os.stat(name)
+        digest.update(repr((os.path.relpath(name, path), info.st_size, info.st_mtime_ns)).encode())
+    return digest.hexdigest()
+
+
+def _store_column(directory: str, name: Any, values) -> Tuple[str, Any]:
+    """Writes one column (or the index); returns how to load it back."""
+    dtype = values.dtype
+    if isinstance(values, pd.RangeIndex):
+        return ('range', (values.start, values.stop, values.step, values.name))
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM':
+        np.save(os.path.join(directory, f"{name}.npy"), values.to_numpy())
+        return ('array', getattr(values, 'name', None))
+    if isinstance(dtype, pd.CategoricalDtype):
+        np.save(os.path.join(directory, f"{name}.npy"), np.asarray(values.cat.codes if isinstance(values, pd.Series)
+                                                                   else values.codes))
+        return ('categorical', (dtype, values.name))
+    if isinstance(dtype, pd.StringDtype):
+        codes, uniques = values.array.factorize()
+        np.save(os.path.join(directory, f"{name}.npy"), codes.astype(_code_dtype(len(uniques))))
+        return ('factorized', (uniques, values.name))
+    with open(os.path.join(directory, f"{name}.pkl"), 'wb') as f:
+        pickle.dump(values, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return ('pickle', None)
+
+
+def _load_column(directory: str, name: Any, spec: Tuple[str, Any]):
+    kind, details = spec
+    if kind == 'range':
+        start, stop, step, label = details
+        return pd.RangeIndex(start, stop, step, name=label)
+    if kind == 'pickle':
+        with open(os.path.join(directory, f"{name}.pkl"), 'rb') as f:
+            values = pickle.load(f)
+        return values.array if isinstance(values, pd.Series) else values
+    # A plain ndarray view of the map: pandas does not expect np.memmap
+    array = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r').view(np.ndarray)
+    if kind == 'categorical':
+        dtype, label = details
+        values = pd.Categorical.from_codes(array, dtype=dtype)
+        return pd.CategoricalIndex(values, name=label) if name == 'index' else values
+    if kind == 'factorized':
+        uniques, label = details
+        values = uniques.take(array, allow_fill=True)
+        return pd.Index(values, name=label) if name == 'index' else values
+    return pd.Index(array, name=details, copy=False) if name == 'index' else array
+
+
+def _evict_lru(sizes: pd.Series, limit: int, keep: Optional[str],
+               remove: Callable[[str], None]) -> List[str]:
+    """
+    Removes entries, least recently used first, until their total size fits.
+
+    Args:
+        sizes: Entry sizes in bytes, least recently used first.
+        limit: Size to get under.
+        keep: Entry that is never removed.
+        remove: Deletes one entry.
+
+    Returns:
+        The removed entries.
+    """
+    total = int(sizes.sum())
+    evicted = []
+    for key, size in sizes.items():
+        if total <= limit:
+            break
+        if key == keep:
+            continue
+        remove(key)
+        total -= size
+        evicted.append(key)
+    return evicted
+
+
+def _code_dtype(n_values: int) -> np.dtype:
+    """Smallest signed integer type holding codes -1 .. n_values - 1."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_values <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _directory_size(directory: str) -> int:
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
@@ -1,10 +1,31 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns 
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional, List 
 from abc import ABC, abstractmethod
-from .visualization import VisualizationBase 
+from .visualization import VisualizationBase
+from .profile import DataProfile
+from .histogram import draw_histogram
+from .reduction import strata_codes, sample_positions
+from .rendering import new_figure, show_figure
+from .tracing import stage, traced
+
+# Rows drawn by autoplot(preview=True) when sample_rows is not given
+PREVIEW_ROWS = 100_000
+
+# z-score of the 95% intervals drawn on preview plots
+_Z95 = 1.96
+
+_refine_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _background_executor() -> ThreadPoolExecutor:
+    """Single worker thread shared by all background refinements."""
+    global _refine_executor
+    if _refine_executor is None:
+        _refine_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='plotease-refine')
+    return _refine_executor
+
 
 class DiagnosticPlotter(VisualizationBase):
     """
@@ -12,90 +33,261 @@ class DiagnosticPlotter(VisualizationBase):
     Demonstrates: Inheritance from VisualizationBase
     """
     
-    def __init__(self, data: pd.DataFrame, theme: str = 'default'):
-        super().__init__(data, theme)
-        self._apply_theme()
+    def __init__(self, data: pd.DataFrame, theme: str = 'default', profile: Optional[DataProfile] = None):
+        super().__init__(data, theme, profile)
+        # (sample rows, total rows) when this plotter draws a preview sample
+        self._sampled = None
+        # Background computation started by the last autoplot(refine=True)
+        self.refinement: Optional[Future] = None
     
+    def _draw_count_errors(self, ax, counts: np.ndarray, edges: np.ndarray):
+        """On previews, adds 95% (Poisson) intervals to histogram bars."""
+        if self._sampled:
+            centers = (edges[:-1] + edges[1:]) / 2
+            ax.errorbar(centers, counts, yerr=_Z95 * np.sqrt(counts), fmt='none',
+                        ecolor='black', elinewidth=0.8, alpha=0.6)
+    
+    @traced('panel')
     def create_distributions(self, ax, numeric_cols: List[str]):
         for col in numeric_cols[:3]:
-            self._data[col].hist(alpha=0.5, label=col, bins=30, ax=ax, edgecolor='black') 
+            counts, edges = self._profile.histogram(col, bins=30)
+            draw_histogram(ax, counts, edges, alpha=0.5, label=col, edgecolor='black')
+            self._draw_count_errors(ax, counts, edges)
         ax.set_title('Distribution of Numeric Variables', fontsize=14, fontweight='bold')
         ax.set_xlabel('Value')
         ax.set_ylabel('Frequency')
         ax.legend()
         ax.grid(alpha=0.3)
     
+    @traced('panel')
     def create_correlations(self, ax, numeric_cols: List[str]):
-        corr = self._data[numeric_cols].corr()
-        sns.heatmap(corr, annot=True, fmt='.2f', cmap='coolwarm', 
-                    center=0, ax=ax, cbar_kws={'shrink': 0.8})
-        ax.set_title('Correlation Matrix', fontsize=14, fontweight='bold')
+        with stage('import seaborn', 'import'):
+            import seaborn as sns
+        corr = self._profile.correlation_matrix(numeric_cols)
+        with stage('seaborn.heatmap', 'render'):
+            sns.heatmap(corr, annot=True, fmt='.2f', cmap='coolwarm', 
+                        center=0, ax=ax, cbar_kws={'shrink': 0.8})
+        title = 'Correlation Matrix'
+        if self._sampled:
+            # Widest 95% interval of a sample correlation (at r = 0, Fisher z)
+            half_width = np.tanh(_Z95 / np.sqrt(max(self._sampled[0] - 3, 1)))
+            title += f' (95% CI ±{half_width:.2f})'
+        ax.set_title(title, fontsize=14, fontweight='bold')
     
+    @traced('panel')
     def create_missing_data(self, ax):
-        missing = self._data.isnull().sum()
+        missing = self._profile.null_counts()
         missing = missing[missing > 0].sort_values(ascending=False)
         
         if len(missing) > 0:
-            missing.plot(kind='barh', ax=ax, color='coral')
+            if self._sampled:
+                # Scale sample counts up to the full data, with 95% binomial intervals
+                n, total = self._sampled
+                share = missing / n
+                missing = share * total
+                errors = _Z95 * total * np.sqrt(share * (1 - share) / n)
+                missing.plot(kind='barh', ax=ax, color='coral', xerr=errors)
+                ax.set_xlabel('Count (estimated)')
+            else:
+                missing.plot(kind='barh', ax=ax, color='coral')
+                ax.set_xlabel('Count')
             ax.set_title('Missing Values by Column', fontsize=14, fontweight='bold')
-            ax.set_xlabel('Count')
             ax.set_ylabel('Column')
         else:
             ax.text(0.5, 0.5, 'No Missing Values', ha='center', va='center', fontsize=16)
             ax.set_title('Missing Values Check', fontsize=14, fontweight='bold')
             ax.axis('off')
     
+    @traced('panel')
     def create_outliers(self, ax, numeric_cols: List[str]):
-        self._data[numeric_cols[:4]].boxplot(ax=ax)
+        # Box statistics come from the profile's per-column quantile summary
+        # (exact or sketch), so the columns are never fully sorted here
+        ax.bxp([self._profile.boxplot_stats(col) for col in numeric_cols[:4]])
+        ax.grid(alpha=0.3)
         ax.set_title('Outlier Detection (Boxplots)', fontsize=14, fontweight='bold')
         ax.set_ylabel('Value')
         if len(numeric_cols[:4]) > 0:
-            plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+            ax.tick_params(axis='x', labelrotation=45)
     
-    def autoplot(self, target: Optional[str] = None, max_plots: int = 6):
-        numeric_cols = self._data.select_dtypes(include=[np.number]).columns.tolist()
-        categorical_cols = self._data.select_dtypes(include=['object', 'category']).columns.tolist()
+    def autoplot(self, target: Optional[str] = None, max_plots: int = 6,
+                 preview: bool = False, sample_rows: Optional[int] = None,
+                 refine: bool = False, random_state: Optional[int] = 0, show: bool = True):
+        """
+        Draws the diagnostic grid on its own Figure.
+
+        The figure is not pyplot's current figure (see `rendering.new_figure`).
+        Every statistic is computed before the theme is applied (see
+        `precompute`), so concurrent threads only take turns to draw.
+
+        With `preview=True` (or an explicit `sample_rows`) the grid is drawn from
+        a reproducible random sample instead of the whole frame, stratified on
+        `target` when one is given (see `preview_plotter`). Preview panels show
+        95% intervals, and the title says how many rows were sampled.
+
+        Args:
+            target: Optional target column, given its own panel.
+            max_plots: Maximum number of panels.
+            preview: Draw from a sample of PREVIEW_ROWS rows.
+            sample_rows: Sample size; implies preview.
+            refine: With a preview, also start computing the full-data
+                    statistics in the background (see `refine`); the Future
+                    is kept in `refinement`.
+            random_state: Seed of the preview sample.
+            show: Display the figure (see `rendering.show_figure`); with False
+                  it is returned instead.
+
+        Returns:
+            The matplotlib Figure with `show=False`, None once shown.
+        """
+        plotter = self
+        if preview or sample_rows:
+            plotter = self.preview_plotter(target, sample_rows or PREVIEW_ROWS, random_state)
+        plotter.precompute(target)
+        with self.theme_context():
+            fig = new_figure(self.figure_size(max_plots))
+            plotter.draw(fig, target=target, max_plots=max_plots)
+            with stage('tight_layout', 'layout'):
+                fig.tight_layout()
+            if show:
+                show_figure(fig)
+        if refine and plotter is not self:
+            self.refinement = self.refine(target)
+        return None if show else fig
+
+    def preview_plotter(self, target: Optional[str] = None, sample_rows: int = PREVIEW_ROWS,
+                        random_state: Optional[int] = 0) -> 'DiagnosticPlotter':
+        """
+        A plotter over a random sample of the data, for fast previews.
+
+        Rows are drawn uniformly without replacement. When `target` is given,
+        every target class (or one of 10 value bins for a numeric target) is
+        guaranteed at least one row. Data at most `sample_rows` long is not
+        sampled.
+
+        Returns:
+            A DiagnosticPlotter on the sample, or this plotter.
+        """
+        n_rows = len(self._data)
+        if n_rows <= sample_rows:
+            return self
+        strata = None
+        if target is not None and target in self._data.columns:
+            strata = strata_codes(self._data[target])
+        positions = sample_positions(n_rows, sample_rows, strata, random_state)
+        plotter = DiagnosticPlotter(self._data.iloc[positions], self._theme)
+        plotter._sampled = (len(positions), n_rows)
+        return plotter
+
+    def precompute(self, target: Optional[str] = None) -> 'DiagnosticPlotter':
+        """
+        Fills the profile with every statistic the diagnostic grid draws from
+        (histograms, correlations, missing counts, target summary).
+
+        Holds the profile's lock throughout, so a concurrent `append` or
+        `set_data` waits instead of mixing old and new data.
+
+        Returns:
+            The plotter itself.
+        """
+        with self._profile.lock:
+            numeric_cols = self._profile.numeric_columns()
+            for col in numeric_cols[:3]:
+                self._profile.histogram(col, bins=30)
+            if len(numeric_cols) > 1:
+                self._profile.correlation_matrix(numeric_cols)
+            self._profile.null_counts()
+            if target is not None and target in self._data.columns:
+                if self._profile.dtype_class(target) == 'numeric':
+                    self._profile.histogram(target, bins=30)
+                else:
+                    self._profile.value_counts(target)
+        return self
+
+    def refine(self, target: Optional[str] = None) -> Future:
+        """
+        Computes the full-data statistics of the grid in a background thread.
+
+        Nothing is drawn off the main thread. Once the returned Future is done,
+        `autoplot()` draws the full-data grid from the cached statistics
+        without touching the raw data again.
+
+        Returns:
+            A Future resolving to this plotter.
+        """
+        return _background_executor().submit(self.precompute, target)
+
+    def figure_size(self, max_plots: int = 6) -> tuple:
+        """Figure size (inches) of the autoplot grid for `max_plots` panels."""
+        n_rows = min(3, (max_plots + 1) // 2)
+        return (15, 5 * n_rows)
+
+    def draw(self, fig, target: Optional[str] = None, max_plots: int = 6):
+        """
+        Draws the autoplot panels onto an existing Figure.
+
+        Only the figure's own methods are used, so `fig` may be a pyplot figure
+        or a standalone one from `rendering.new_figure` (headless rendering).
+
+        Args:
+            fig: Matplotlib Figure to draw on.
+            target: Optional target column, given its own panel.
+            max_plots: Maximum number of panels.
+
+        Returns:
+            The figure.
+        """
+        numeric_cols = self._profile.numeric_columns()
+        categorical_cols = self._profile.categorical_columns()
         
         plots_created = 0
         n_rows = min(3, (max_plots + 1) // 2)
-        fig = plt.figure(figsize=(15, 5 * n_rows))
         
         if numeric_cols and plots_created < max_plots:
             plots_created += 1
-            ax = plt.subplot(n_rows, 2, plots_created)
+            ax = fig.add_subplot(n_rows, 2, plots_created)
             self.create_distributions(ax, numeric_cols)
 
         if len(numeric_cols) > 1 and plots_created < max_plots:
             plots_created += 1
-            ax = plt.subplot(n_rows, 2, plots_created)
+            ax = fig.add_subplot(n_rows, 2, plots_created)
             self.create_correlations(ax, numeric_cols)
 
         if plots_created < max_plots:
             plots_created += 1
-            ax = plt.subplot(n_rows, 2, plots_created)
+            ax = fig.add_subplot(n_rows, 2, plots_created)
             self.create_missing_data(ax)
 
         if target and target in self._data.columns and plots_created < max_plots:
             plots_created += 1
-            ax = plt.subplot(n_rows, 2, plots_created)
+            ax = fig.add_subplot(n_rows, 2, plots_created)
+            self.create_target(ax, target)
 
-            if pd.api.types.is_numeric_dtype(self._data[target].dtype):
-                self._data[target].hist(bins=30, ax=ax, color='steelblue', edgecolor='black')
-                ax.set_xlabel(target)
-                ax.set_ylabel('Frequency')
-            else:
-                self._data[target].value_counts().head(10).plot(
-                    kind='bar', ax=ax, color='steelblue'
-                )
-                ax.set_xlabel(target)
-                ax.set_ylabel('Count')
-                plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+        if self._sampled:
+            n, total = self._sampled
+            fig.suptitle(f'Preview from a sample of {n:,} / {total:,} rows (bars: 95% intervals)',
+                         fontsize=12)
+        return fig
+
+    @traced('panel')
+    def create_target(self, ax, target: str):
+        if self._profile.dtype_class(target) == 'numeric':
+            counts, edges = self._profile.histogram(target, bins=30)
+            draw_histogram(ax, counts, edges, color='steelblue', edgecolor='black')
+            self._draw_count_errors(ax, counts, edges)
+            ax.grid(True)
+            ax.set_xlabel(target)
+            ax.set_ylabel('Frequency')
+        else:
+            counts = self._profile.top_values(target, 10)
+            counts.plot(kind='bar', ax=ax, color='steelblue',
+                        yerr=_Z95 * np.sqrt(counts) if self._sampled else None)
+            ax.set_xlabel(target)
+            ax.set_ylabel('Count')
+            ax.tick_params(axis='x', labelrotation=45)
 
-            ax.set_title(f'Target Distribution: {target}', fontsize=14, fontweight='bold')
+        ax.set_title(f'Target Distribution: {target}', fontsize=14, fontweight='bold')
 
     def render(self):
         """Implements required abstract method from VisualizationBase."""
         print("Rendering diagnostic plots...")
-        self.autoplot()
-        plt.tight_layout()
-        plt.show()
+        return self.autoplot()
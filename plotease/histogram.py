@@ -0,0 +1,95 @@
+import numpy as np
+from typing import Optional, Tuple
+
+# Values binned per step of histogram_counts
+_BLOCK = 1 << 16
+
+# Axes.hist options with no Axes.bar equivalent: draw_histogram passes them to hist
+HIST_KEYWORDS = ('histtype', 'cumulative', 'orientation', 'rwidth', 'stacked', 'align')
+
+
+def histogram_edges(low: float, high: float, bins: int) -> np.ndarray:
+    """
+    Equal-width bin edges over [low, high], exactly as `np.histogram` builds them.
+
+    Args:
+        low, high: Data range (NaN means "no data").
+        bins: Number of bins.
+
+    Returns:
+        Array of `bins + 1` edges.
+    """
+    if not (np.isfinite(low) and np.isfinite(high)):
+        low, high = 0.0, 1.0
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    return np.linspace(low, high, bins + 1)
+
+
+def histogram_counts(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    Counts values per bin with a vectorized index computation and `np.bincount`.
+
+    Bins are half-open except the last, which is closed, matching `np.histogram`
+    (and therefore matplotlib and pandas) bit for bit. Values outside the edges
+    and NaN are ignored.
+
+    Args:
+        values: 1D float array.
+        edges: Equal-width, increasing bin edges.
+
+    Returns:
+        Integer counts, one per bin.
+    """
+    bins = len(edges) - 1
+    low, high = edges[0], edges[-1]
+    factor = bins / (high - low)
+    counts = np.zeros(bins, dtype=np.intp)
+
+    # Cache-sized blocks keep the temporaries small (same strategy as np.histogram)
+    for start in range(0, len(values), _BLOCK):
+        block = values[start:start + _BLOCK]
+        block = block[(block >= low) & (block <= high)]
+        index = ((block - low) * factor).astype(np.intp)
+        index[index == bins] -= 1
+        # Correct floating-point rounding right at the bin edges
+        index -= block < edges[index]
+        index += (block >= edges[index + 1]) & (index != bins - 1)
+        counts += np.bincount(index, minlength=bins)
+    return counts
+
+
+def draw_histogram(ax, counts: np.ndarray, edges: np.ndarray, density: bool = False, **kwargs):
+    """
+    Draws pre-computed histogram counts as bars, without touching the raw data.
+
+    Options only `Axes.hist` understands (see HIST_KEYWORDS, e.g.
+    histtype='step' or cumulative=True) are drawn by it instead, from the
+    same counts: one weighted value per bin.
+
+    Args:
+        ax: Matplotlib Axes to draw on.
+        counts: Counts per bin.
+        edges: Bin edges (len(counts) + 1).
+        density: If True, scale the bars so their total area is 1.
+        **kwargs: Bar styling (color, alpha, edgecolor, label, ...).
+
+    Returns:
+        The BarContainer created by `ax.bar`, or the patches of `ax.hist`.
+    """
+    if any(key in kwargs for key in HIST_KEYWORDS):
+        return ax.hist(edges[:-1], bins=edges, weights=counts, density=density, **kwargs)[2]
+    widths = np.diff(edges)
+    heights = counts
+    if density:
+        total = counts.sum()
+        heights = counts / (total * widths) if total else counts.astype(float)
+    return ax.bar(edges[:-1], heights, width=widths, align='edge', **kwargs)
+
+
+def histogram_range(minimum: float, maximum: float,
+                    value_range: Optional[Tuple[float, float]] = None) -> Tuple[float, float]:
+    """Resolves the binning range: an explicit range wins over the data range."""
+    if value_range is not None:
+        return float(value_range[0]), float(value_range[1])
+    return float(minimum), float(maximum)
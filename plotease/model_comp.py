@@ -1,7 +1,11 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from typing import Optional, List, Dict 
+from typing import Optional, List, Dict, TYPE_CHECKING
+from .rendering import new_figure, show_figure
+from .tracing import stage, traced
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
 
 class ModelComparator:
     """
@@ -18,7 +22,8 @@ class ModelComparator:
             # Convert results to a DataFrame (models as index, metrics as columns)
             self._df = pd.DataFrame(models_results).T
     
-    def create_bar_chart(self, ax: plt.Axes, df: pd.DataFrame):
+    @traced('panel')
+    def create_bar_chart(self, ax: 'plt.Axes', df: pd.DataFrame):
         """Creates and formats a grouped bar chart for model performance."""
         if df.empty:
             ax.text(0.5, 0.5, 'No Data to Plot', ha='center', va='center', fontsize=16)
@@ -37,7 +42,8 @@ class ModelComparator:
         for container in ax.containers:
             ax.bar_label(container, fmt='%.3f', padding=3, fontsize=9)
     
-    def create_radar_chart(self, ax: plt.Axes, df: pd.DataFrame):
+    @traced('panel')
+    def create_radar_chart(self, ax: 'plt.Axes', df: pd.DataFrame):
         """
         Creates and formats a radar chart for model performance.
         
@@ -68,38 +74,77 @@ class ModelComparator:
         ax.grid(True)
 
 
-    def compare_models(self, metrics: Optional[List[str]] = None):
+    def compare_models(self, metrics: Optional[List[str]] = None, show: bool = True):
         """
         Generates and displays two visualizations comparing the performance of the models.
+
+        The charts are drawn on their own Figure (see `rendering.new_figure`);
+        `show=False` returns it instead of displaying it.
+        """
+        try:
+            df = self._select_metrics(metrics)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return None
+        
+        # Create a figure with two subplots side-by-side
+        fig = self.draw(new_figure((15, 6)), metrics)
+        if show:
+            show_figure(fig)
+        
+        print("\nModel Performance Summary:")
+        print("="*60)
+        print(df.to_string())
+        print("="*60)
+        return None if show else fig
+
+    def _select_metrics(self, metrics: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Returns the results table restricted to `metrics` (all metrics if omitted).
+
+        Raises:
+            ValueError: If no results were loaded or a metric is unknown.
         """
         if self._df.empty:
-            print("Error: No model results were loaded into the comparator.")
-            return
+            raise ValueError("No model results were loaded into the comparator.")
         
-        df = self._df.copy()
+        # Selections are new frames and plotting never writes to them: no copy needed
+        df = self._df
         if metrics:
             missing_metrics = [m for m in metrics if m not in df.columns]
             if missing_metrics:
-                print(f"Error: The following metrics were not found: {missing_metrics}")
-                return
+                raise ValueError(f"The following metrics were not found: {missing_metrics}")
             df = df[metrics]
-        
-        # Create a figure with two subplots side-by-side
+        return df
+
+    def draw(self, fig, metrics: Optional[List[str]] = None):
+        """
+        Draws the bar and radar comparison charts onto an existing Figure.
+
+        Only the figure's own methods are used, so `fig` may be a pyplot figure
+        or a standalone one from `rendering.new_figure` (headless rendering).
+
+        Args:
+            fig: Matplotlib Figure to draw on.
+            metrics: Metrics to compare (all if omitted).
+
+        Returns:
+            The figure.
+
+        Raises:
+            ValueError: If no results were loaded or a metric is unknown.
+        """
+        df = self._select_metrics(metrics)
         # The main figure needs to be handled carefully to allow polar projection
-        fig = plt.figure(figsize=(15, 6))
         ax_bar = fig.add_subplot(1, 2, 1)
         ax_radar = fig.add_subplot(1, 2, 2, projection='polar')
 
         self.create_bar_chart(ax_bar, df)
         self.create_radar_chart(ax_radar, df)
         
-        plt.tight_layout(rect=[0, 0, 0.85, 1])
-        plt.show() 
-        
-        print("\nModel Performance Summary:")
-        print("="*60)
-        print(df.to_string())
-        print("="*60)
+        with stage('tight_layout', 'layout'):
+            fig.tight_layout(rect=[0, 0, 0.85, 1])
+        return fig
 
 
     def get_best_model(self, metric: str) -> str:
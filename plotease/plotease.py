@@ -5,25 +5,134 @@ from .diagnostic import DiagnosticPlotter
 from .summary import SummaryGenerator
 from .quick_plotter import QuickPlotter
 from .model_comp import ModelComparator # Assuming this file exists
-from typing import Optional, List, Dict
+from .profile import DataProfile
+from .sources import DataSource, Filters
+from .cache import ColumnCache, ResultCache
+from .batch import render_job
+from .rendering import figure_format
+import asyncio
+import os
+from . import utils
+from typing import Optional, List, Dict, Any, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .aio import AsyncRenderer
 
 class PlotEase(VisualizationBase):
     """
     Main entry point for the PlotEase library.
     Demonstrates Composition by aggregating specialized components.
     """
-    def __init__(self, data: pd.DataFrame, theme: str = 'default'):
+    def __init__(self, data: pd.DataFrame, theme: str = 'default', quantile_method: str = 'exact',
+                 optimize_memory: bool = False, heavy_hitters: Optional[int] = None,
+                 result_cache: Optional[ResultCache] = None):
         # 1. Inheritance: Initialize parent class (VisualizationBase)
+        # The parent creates self._profile, the column statistics cache that is
+        # shared with every component below so each statistic is computed once.
         super().__init__(data, theme) 
+        # 'exact' or 'sketch': backend for boxplots and other quantiles
+        self._profile.quantile_method = quantile_method
+        # Capacity of the categorical heavy-hitters sketch (None: exact counts)
+        self._profile.heavy_hitters = heavy_hitters
+        # Optional disk cache of summaries and saved figures, keyed on the data fingerprint
+        self._result_cache = result_cache
+
+        # Optionally work on a compact copy (downcast numbers, categorical text),
+        # see utils.optimize_memory; the savings are kept for memory_report()
+        self._memory_report = None
+        if optimize_memory:
+            compact = utils.optimize_memory(data)
+            self._memory_report = utils.memory_report(data, compact)
+            self._data = compact
+            self._profile.set_data(compact)
         
-        # 2. Composition: Initialize component objects
-        # The fixes above ensure these classes can now be instantiated correctly.
-        self._diagnostic = DiagnosticPlotter(data, theme)
-        self._summary = SummaryGenerator(data, theme)
-        self._plotter = QuickPlotter(data, theme)
+        # 2. Composition: components are created on first use (see _component),
+        # sharing the data validated above and the profile
+        self._components: Dict[type, VisualizationBase] = {}
         self._comparator = None # Initialized on first use
         
-        # NOTE: self._apply_theme() is inherited from the parent
+        # NOTE: the theme is applied per figure via self.theme_context()
+
+    # --- Alternative constructors: reading files ---
+
+    @classmethod
+    def from_source(cls, source: DataSource, columns: Optional[Sequence[str]] = None,
+                    filters: Optional[Filters] = None, cache: Optional[ColumnCache] = None,
+                    **options) -> 'PlotEase':
+        """
+        Reads only `columns` of the rows passing `filters` from a DataSource.
+
+        List the columns the calls will touch (e.g. the x and y of a quick
+        plot, or the target and numeric columns of an autoplot): the others are
+        never read. When no filter is applied, the Parquet footers seed the
+        statistics cache: null counts (except for float columns, whose NaNs
+        Parquet does not count), and the min/max of numeric columns, which
+        give histogram ranges without a scan.
+
+        Args:
+            source: The file(s) to read.
+            columns: Columns to load (default: all).
+            filters: Row filters, see `DataSource.read`.
+            cache: Optional ColumnCache: later runs on the unchanged files open
+                   the loaded columns memory-mapped instead of reading them.
+            **options: Keyword arguments of PlotEase (theme, quantile_method, ...).
+
+        Returns:
+            A PlotEase over the loaded rows.
+        """
+        data = source.read(columns, filters) if cache is None else cache.read(source, columns, filters)
+        pe = cls(data, **options)
+        statistics = source.statistics() if not filters else None
+        if statistics is not None:
+            preloaded = {}
+            for col, row in statistics.iterrows():
+                if col not in pe._data.columns:
+                    continue
+                entry = preloaded[col] = {}
+                # Parquet does not count float NaN as null, so float columns are counted on demand
+                if pd.notna(row['null_count']) and not pd.api.types.is_float_dtype(pe._data[col].dtype):
+                    entry['null_count'] = int(row['null_count'])
+                if pe._profile.dtype_class(col) == 'numeric' and row['min'] is not None and row['max'] is not None:
+                    entry['value_range'] = (float(row['min']), float(row['max']))
+            pe._profile.preload(preloaded)
+        return pe
+
+    @classmethod
+    def from_parquet(cls, path: str, columns: Optional[Sequence[str]] = None,
+                     filters: Optional[Filters] = None, **options) -> 'PlotEase':
+        """Loads a Parquet file or directory (needs pyarrow), see `from_source`."""
+        return cls.from_source(DataSource(path, 'parquet'), columns, filters, **options)
+
+    @classmethod
+    def from_arrow(cls, path: str, columns: Optional[Sequence[str]] = None,
+                   filters: Optional[Filters] = None, **options) -> 'PlotEase':
+        """Loads an Arrow IPC / Feather file or directory (needs pyarrow), see `from_source`."""
+        return cls.from_source(DataSource(path, 'arrow'), columns, filters, **options)
+
+    @classmethod
+    def from_csv(cls, path: str, columns: Optional[Sequence[str]] = None,
+                 filters: Optional[Filters] = None, **options) -> 'PlotEase':
+        """Loads a CSV file (or directory, with pyarrow), see `from_source`."""
+        return cls.from_source(DataSource(path, 'csv'), columns, filters, **options)
+
+    def _component(self, cls: type) -> Any:
+        """Returns the facade's `cls` component, creating it on first use."""
+        component = self._components.get(cls)
+        if component is None:
+            component = self._components[cls] = cls(self._data, self._theme, profile=self._profile)
+        return component
+
+    @property
+    def _diagnostic(self) -> DiagnosticPlotter:
+        return self._component(DiagnosticPlotter)
+
+    @property
+    def _summary(self) -> SummaryGenerator:
+        return self._component(SummaryGenerator)
+
+    @property
+    def _plotter(self) -> QuickPlotter:
+        return self._component(QuickPlotter)
     
     # --- Polymorphism: Overriding the abstract render() method ---
     def render(self):
@@ -34,28 +143,166 @@ class PlotEase(VisualizationBase):
         print("Rendering default diagnostic plots...")
         self._diagnostic.render()
 
+    def memory_report(self) -> Optional[pd.DataFrame]:
+        """
+        Memory saved by `optimize_memory=True` at construction, per column
+        (see `utils.memory_report`), or None if the data was not optimized.
+        """
+        return self._memory_report
+
+    def set_data(self, data: pd.DataFrame):
+        """
+        Replaces the data on the facade and every component created so far,
+        invalidating the shared statistics cache once.
+        """
+        super().set_data(data)
+        for component in self._components.values():
+            component.set_data(data)
+
+    def set_theme(self, theme: str):
+        """Sets the theme on the facade and every component created so far."""
+        super().set_theme(theme)
+        for component in self._components.values():
+            component.set_theme(theme)
+
+    def append(self, batch: pd.DataFrame):
+        """
+        Appends rows to the data, e.g. the latest hourly batch.
+
+        The shared statistics cache is updated from the new rows alone (see
+        `DataProfile.append`), so the next summary and autoplot cost time
+        proportional to the batch rather than to the whole history. A batch
+        with a RangeIndex is numbered on from the last row.
+
+        Args:
+            batch: DataFrame with the same columns, in the same order.
+
+        Raises:
+            TypeError: If `batch` is not a pandas DataFrame.
+            ValueError: If the batch's columns do not match.
+        """
+        self.set_data(self._profile.append(batch))
+
     # --- Delegation Methods (Composition in Action) ---
-    def autoplot(self, target: Optional[str] = None, max_plots: int = 6):
-        """Delegates to DiagnosticPlotter's autoplot method."""
-        self._diagnostic.autoplot(target=target, max_plots=max_plots)
+    def autoplot(self, target: Optional[str] = None, max_plots: int = 6, **kwargs):
+        """Delegates to DiagnosticPlotter's autoplot method (preview options included; returns the Figure with show=False)."""
+        return self._diagnostic.autoplot(target=target, max_plots=max_plots, **kwargs)
+
+    @property
+    def refinement(self):
+        """Future of the background statistics started by `autoplot(refine=True)`, or None."""
+        return self._diagnostic.refinement
 
     def tabular_summary(self, style: str = 'full'):
-        """Delegates to SummaryGenerator's tabular_summary method."""
-        return self._summary.tabular_summary(style=style)
+        """
+        Delegates to SummaryGenerator's tabular_summary method, through the
+        result cache when one was given.
+        """
+        cache = self._result_cache
+        if cache is None:
+            return self._summary.tabular_summary(style=style)
+        key = cache.key('tabular_summary', style, self._profile.settings, self._profile.fingerprint())
+        table = cache.get_frame(key)
+        if table is None:
+            table = cache.put_frame(key, self._summary.tabular_summary(style=style))
+        return table
+
+    async def autoplot_async(self, target: Optional[str] = None, max_plots: int = 6,
+                             fmt: str = 'png', dpi: float = 100,
+                             renderer: Optional['AsyncRenderer'] = None) -> bytes:
+        """
+        Renders the autoplot grid to image bytes without blocking the event loop.
+
+        Statistics and Agg rendering run on the renderer's bounded pool (see
+        `aio.AsyncRenderer`), and concurrent identical requests on this
+        dataset share one render.
+
+        Example:
+            >>> png = await pe.autoplot_async(target='price')
+            >>> return web.Response(body=png, content_type='image/png')
+
+        Args:
+            target: Optional target column, given its own panel.
+            max_plots: Maximum number of panels.
+            fmt: 'png', 'svg' or 'pdf'.
+            dpi: Resolution for raster output.
+            renderer: Pool to render on (default: a shared thread pool).
+
+        Returns:
+            The encoded image.
+        """
+        return await self._render_async({'kind': 'autoplot', 'target': target, 'max_plots': max_plots},
+                                        fmt, dpi, renderer)
+
+    async def quick_plot_async(self, x: str, y: Optional[str] = None, fmt: str = 'png', dpi: float = 100,
+                               renderer: Optional['AsyncRenderer'] = None, **kwargs) -> bytes:
+        """
+        Renders a quick plot to image bytes without blocking the event loop
+        (see `autoplot_async`).
+
+        Args:
+            x, y: Columns to plot.
+            fmt: 'png', 'svg' or 'pdf'.
+            dpi: Resolution for raster output.
+            renderer: Pool to render on (default: a shared thread pool).
+            **kwargs: Options of `quick_plot` (kind, color, title, figsize, ...).
+
+        Returns:
+            The encoded image.
+        """
+        return await self._render_async({**kwargs, 'kind': 'quick_plot', 'x': x, 'y': y}, fmt, dpi, renderer)
+
+    async def _render_async(self, job: Dict[str, Any], fmt: str, dpi: float,
+                            renderer: Optional['AsyncRenderer']) -> bytes:
+        from .aio import default_renderer
+        renderer = renderer or default_renderer()
+        job = {**job, 'theme': self._theme, 'data': self._data}
+        # Same data content, theme and options: the same image. The fingerprint
+        # hashes the data on first use, so that runs off the event loop
+        fingerprint = await asyncio.get_running_loop().run_in_executor(None, self._profile.fingerprint)
+        key = (fingerprint, self._theme, fmt, dpi,
+               repr(sorted((k, v) for k, v in job.items() if k != 'data')))
+        return await renderer.render(job, fmt, dpi, profile=self._profile, key=key)
+
+    def save_plot(self, path: str, kind: str = 'autoplot', dpi: float = 100, **options) -> str:
+        """
+        Renders a plot of the data straight to a file, headless.
+
+        With a result cache, a figure already rendered from the same data,
+        options, theme and format is copied instead of drawn again.
+
+        Args:
+            path: Output file; its extension ('png', 'svg' or 'pdf') sets the format.
+            kind: 'autoplot', 'quick_plot' or 'compare_models'.
+            dpi: Resolution for raster output.
+            **options: Keyword arguments of the plot (see `batch.render_batch`),
+                       e.g. target=..., or x=... and y=..., or results=....
+
+        Returns:
+            The path written.
+        """
+        output_dir, file_name = os.path.split(path)
+        name, _ = os.path.splitext(file_name)
+        job = {**options, 'kind': kind, 'name': name, 'theme': self._theme}
+        if kind != 'compare_models':
+            job['data'] = self._data
+        return render_job(job, output_dir or '.', figure_format(path), dpi,
+                          cache=self._result_cache, profile=self._profile)
 
     def quick_plot(self, x: str, y: Optional[str] = None, **kwargs):
-        """Delegates to QuickPlotter's quick_plot method."""
-        self._plotter.quick_plot(x, y, **kwargs)
+        """Delegates to QuickPlotter's quick_plot method (returns the Figure with show=False)."""
+        return self._plotter.quick_plot(x, y, **kwargs)
 
     def set_style(self, style_dict: Dict[str, any]):
         """Delegates style setting to the quick plotter."""
         self._plotter.set_style(style_dict)
 
-    def compare_models(self, models_results: Dict[str, Dict[str, float]]):
-        """Initializes and runs the ModelComparator."""
+    def compare_models(self, models_results: Dict[str, Dict[str, float]], show: bool = True):
+        """Initializes and runs the ModelComparator (returns the Figure with show=False)."""
         # Lazy initialization of the comparator
         self._comparator = ModelComparator(models_results)
-        self._comparator.compare_models()
+        with self.theme_context():
+            return self._comparator.compare_models(show=show)
 
     # --- Dunder Methods ---
     def __repr__(self) -> str:
@@ -70,7 +317,11 @@ class PlotEase(VisualizationBase):
         """Compares two PlotEase objects based on data and theme."""
         if not isinstance(other, PlotEase):
             return False
-        return self._data.equals(other._data) and self._theme == other._theme
+        return self._theme == other._theme and self._same_data(other)
+
+    def __hash__(self) -> int:
+        """Hash consistent with __eq__ (theme and data fingerprint)."""
+        return super().__hash__()
         
     def __lt__(self, other) -> bool:
         """Compares PlotEase objects based on data size."""
@@ -0,0 +1,699 @@
+import functools
+import hashlib
+import threading
+import pandas as pd
+import numpy as np
+from typing import Optional, List, Dict, Tuple, Callable, Iterable, Any
+from . import stats
+from .sketches import quantile_summary
+from .histogram import histogram_edges, histogram_counts, histogram_range
+from .correlation import CorrelationEngine, correlation_from_sums, correlation_frame
+from .tracing import stage
+
+
+def _synchronized(method):
+    """Runs a DataProfile method under the profile's lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class DataProfile:
+    """
+    Lazily populated, per-column statistics cache.
+
+    A single DataProfile is owned by the PlotEase facade and shared by all of its
+    composed components, so statistics such as null counts, moments, quantiles and
+    cardinality are computed at most once per column, no matter how many
+    components (autoplot, tabular_summary, detect_plot_type) ask for them.
+
+    Entries are invalidated when the underlying data changes: either explicitly via
+    `set_data()` / `invalidate()`, or implicitly when the profile notices that the
+    DataFrame it was built for has been replaced, reshaped or relabelled, or that
+    a column has been reassigned or written in place. In-place writes are seen
+    through pandas Copy-on-Write: the profile keeps a shallow copy of the frame,
+    so pandas copies a column block before writing to it and the column's buffer
+    changes. Only the columns that changed are recomputed. (The block is copied
+    once per change noticed; without Copy-on-Write, before pandas 3, in-place
+    writes are not seen and need `invalidate()`.)
+
+    The profile is thread-safe: reads, computations and updates of the cache
+    run under one reentrant lock (see `lock`), so a background `refine()` or
+    a thread-pool render cannot interleave with `append()` or `set_data()`.
+
+    Attributes:
+        _data (pd.DataFrame): The DataFrame being profiled.
+        _columns (dict): Per-column cache entries, keyed by column name.
+        _frame (dict): Frame-level cache entries (column lists, null counts).
+    """
+
+    def __init__(self, data: pd.DataFrame, quantile_method: str = 'exact',
+                 heavy_hitters: Optional[int] = None):
+        """
+        Initializes an empty profile for the given DataFrame.
+
+        Args:
+            data: The pandas DataFrame to profile.
+            quantile_method: Quantile backend, 'exact' or 'sketch' (see `sketches.quantile_summary`).
+            heavy_hitters: If set, categorical counts keep only this many
+                           candidate values per column in a heavy-hitters sketch
+                           (see `stats.sketch_categorical_counts`), bounding
+                           memory for ID-like columns. None counts exactly.
+        """
+        self._lock = threading.RLock()
+        self._data = data
+        self._quantile_method = quantile_method
+        self._heavy_hitters = heavy_hitters
+        self._watch(data)
+        self._columns: Dict[Any, Dict[str, Any]] = {}
+        self._frame: Dict[str, Any] = {}
+
+    @staticmethod
+    def _make_token(data: pd.DataFrame) -> tuple:
+        """Cheap, O(1) identity token used to notice that the data has been replaced or reshaped."""
+        return (id(data), data.shape, id(data.columns), id(data.index))
+
+    def _watch(self, data: pd.DataFrame):
+        """Records the identity of `data` and of each of its column buffers."""
+        self._token = self._make_token(data)
+        self._versions = {col: _column_version(series) for col, series in data.items()}
+        # The shallow copy makes Copy-on-Write copy any column written in place,
+        # and keeps the old buffers alive so their addresses cannot be reused
+        self._snapshot = data.copy(deep=False) if _copy_on_write() else None
+
+    @_synchronized
+    def _check(self):
+        """Drops the cached entries of whatever changed in the profiled DataFrame."""
+        if self._make_token(self._data) != self._token:
+            self._columns.clear()
+            self._frame.clear()
+            self._watch(self._data)
+            return
+        changed = [col for col, series in self._data.items()
+                   if _column_version(series) != self._versions.get(col)]
+        if changed:
+            self.invalidate(changed)
+            self._watch(self._data)
+
+    def _check_column(self, col):
+        """`_check` for a single column's entries: O(1) unless something changed."""
+        if (self._make_token(self._data) != self._token
+                or _column_version(self._data[col]) != self._versions.get(col)):
+            self._check()
+
+    # --- Cache management ---
+
+    @property
+    def lock(self) -> threading.RLock:
+        """
+        The profile's reentrant lock. Every method takes it on its own; hold
+        it to compute several statistics from one version of the data.
+        """
+        return self._lock
+
+    @property
+    def data(self) -> pd.DataFrame:
+        """The DataFrame currently being profiled."""
+        return self._data
+
+    @_synchronized
+    def set_data(self, data: pd.DataFrame):
+        """
+        Replaces the profiled DataFrame and discards all cached statistics.
+
+        Args:
+            data: The new pandas DataFrame.
+        """
+        self._data = data
+        self._watch(data)
+        self._columns.clear()
+        self._frame.clear()
+
+    @_synchronized
+    def invalidate(self, columns: Optional[Iterable[Any]] = None):
+        """
+        Discards cached statistics.
+
+        Only needed after mutating the DataFrame in place (e.g. `df.loc[...] = ...`)
+        without pandas Copy-on-Write, which the profile cannot detect on its own.
+
+        Args:
+            columns: Columns to invalidate. If None, the whole cache is cleared.
+        """
+        if columns is None:
+            self._columns.clear()
+        else:
+            for col in columns:
+                self._columns.pop(col, None)
+        self._frame.clear()
+
+    @property
+    def quantile_method(self) -> str:
+        """Name of the quantile backend ('exact' or 'sketch')."""
+        return self._quantile_method
+
+    @quantile_method.setter
+    @_synchronized
+    def quantile_method(self, method: str):
+        if method != self._quantile_method:
+            self._quantile_method = method
+            for entry in self._columns.values():
+                for key in ('quantile_summary', 'quantiles', 'boxplot_stats'):
+                    entry.pop(key, None)
+
+    @_synchronized
+    def preload(self, statistics: Dict[Any, Dict[str, Any]]):
+        """
+        Stores statistics known without scanning the data, e.g. the null
+        counts and min/max of Parquet footers (see `sources.DataSource.statistics`).
+
+        Args:
+            statistics: Mapping of column to cache entries such as
+                        {'null_count': 0, 'value_range': (0.0, 1.0)}.
+                        Unknown columns are ignored; computed entries are kept.
+        """
+        self._check()
+        for col, entries in statistics.items():
+            if col in self._data.columns:
+                entry = self._columns.setdefault(col, {})
+                for key, value in entries.items():
+                    entry.setdefault(key, value)
+
+    @property
+    def heavy_hitters(self) -> Optional[int]:
+        """Capacity of the categorical heavy-hitters sketch (None: exact counts)."""
+        return self._heavy_hitters
+
+    @heavy_hitters.setter
+    @_synchronized
+    def heavy_hitters(self, capacity: Optional[int]):
+        if capacity != self._heavy_hitters:
+            self._heavy_hitters = capacity
+            for entry in self._columns.values():
+                entry.pop('categorical_counts', None)
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        """Options that change the computed statistics, for result-cache keys."""
+        return {'quantile_method': self._quantile_method, 'heavy_hitters': self._heavy_hitters}
+
+    @_synchronized
+    def _column_entry(self, col) -> Dict[str, Any]:
+        if col not in self._data.columns:
+            raise KeyError(f"Column '{col}' not found. Available columns: {list(self._data.columns)}")
+        self._check_column(col)
+        return self._columns.setdefault(col, {})
+
+    @_synchronized
+    def _cached(self, col, key: str, compute: Callable[[pd.Series], Any]) -> Any:
+        """Returns the cached value for (col, key), computing it on first use."""
+        entry = self._column_entry(col)
+        if key not in entry:
+            with stage(key, 'stats', column=col):
+                entry[key] = compute(self._data[col])
+        return entry[key]
+
+    @_synchronized
+    def _cached_frame(self, key: str, compute: Callable[[], Any]) -> Any:
+        self._check()
+        if key not in self._frame:
+            with stage(key, 'stats'):
+                self._frame[key] = compute()
+        return self._frame[key]
+
+    # --- Fingerprint ---
+
+    def column_hash(self, col) -> bytes:
+        """128-bit digest of a column's values (row hashes from `hash_pandas_object`)."""
+        return self._cached(col, 'hash', _series_digest)
+
+    def fingerprint(self) -> str:
+        """
+        Content fingerprint of the whole DataFrame: labels, dtypes, index and values.
+
+        Built from the per-column digests, so after `invalidate(columns)` only
+        those columns are hashed again. Two frames with the same fingerprint
+        compare equal with `DataFrame.equals` (up to a 2**-128 collision chance).
+
+        Returns:
+            Hex digest string.
+        """
+        def compute() -> str:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(repr((list(self._data.columns), [str(t) for t in self._data.dtypes])).encode())
+            digest.update(_series_digest(self._data.index))
+            for col in self._data.columns:
+                digest.update(self.column_hash(col))
+            return digest.hexdigest()
+        return self._cached_frame('fingerprint', compute)
+
+    # --- Column classification ---
+
+    def dtype_class(self, col) -> str:
+        """
+        Classifies a column as 'numeric', 'boolean', 'datetime' or 'categorical'.
+        """
+        return self._cached(col, 'dtype_class', lambda s: dtype_class(s.dtype))
+
+    def numeric_columns(self) -> List[Any]:
+        """Numeric (non-boolean) columns, in frame order."""
+        return self._cached_frame('numeric_columns', lambda: [
+            c for c in self._data.columns if self.dtype_class(c) == 'numeric'
+        ])
+
+    def categorical_columns(self) -> List[Any]:
+        """Object, string and category columns, in frame order."""
+        return self._cached_frame('categorical_columns', lambda: [
+            c for c in self._data.columns if self.dtype_class(c) == 'categorical'
+        ])
+
+    def non_numeric_columns(self) -> List[Any]:
+        """Columns that are neither numeric nor datetime (includes booleans)."""
+        return self._cached_frame('non_numeric_columns', lambda: [
+            c for c in self._data.columns if self.dtype_class(c) in ('categorical', 'boolean')
+        ])
+
+    # --- Statistics ---
+
+    def null_count(self, col) -> int:
+        """Number of missing values in a column."""
+        return self._cached(col, 'null_count', lambda s: int(s.isnull().sum()))
+
+    def null_counts(self) -> pd.Series:
+        """Missing-value counts for every column, as a Series indexed by column."""
+        return self._cached_frame('null_counts', lambda: pd.Series(
+            {c: self.null_count(c) for c in self._data.columns}, dtype='int64'
+        ))
+
+    def moments(self, col) -> Dict[str, float]:
+        """
+        Count, missing, mean, std, min, max, skew and kurtosis of a numeric column.
+
+        Returns:
+            Dictionary of statistics, matching pandas' sample (ddof=1) conventions.
+        """
+        return self.numeric_moments([col])[col]
+
+    @_synchronized
+    def numeric_moments(self, columns: Optional[List[Any]] = None) -> Dict[Any, Dict[str, float]]:
+        """
+        Moments for several numeric columns at once.
+
+        Columns that are not cached yet are computed together in one pass of the
+        fused kernel (see `stats.numeric_moments`); their null counts are cached
+        as a by-product.
+
+        Args:
+            columns: Numeric columns. Defaults to all numeric columns.
+
+        Returns:
+            Dictionary mapping each column to its statistics.
+        """
+        if columns is None:
+            columns = self.numeric_columns()
+        pending = [c for c in columns if 'moments' not in self._column_entry(c)]
+        if pending:
+            with stage('moments', 'stats', columns=len(pending)):
+                accumulators = stats.block_moments(self._data, pending)
+                self._store_moments(pending, accumulators)
+        return {c: self._columns[c]['moments'] for c in columns}
+
+    def _store_moments(self, columns: List[Any], accumulators: 'stats.Moments'):
+        """Caches the raw accumulators (kept for `append`) and the statistics of each column."""
+        for i, (col, values) in enumerate(stats.moments_to_dict(accumulators, columns).items()):
+            entry = self._columns[col]
+            entry['moment_sums'] = accumulators.select([i])
+            entry['moments'] = values
+            entry['null_count'] = int(values['missing'])
+
+    @_synchronized
+    def quantile_summary(self, col):
+        """
+        The column's quantile summary from the configured backend.
+
+        Sketches are cached, one per column shared by every quantile consumer
+        (`append` folds new rows into them). The exact selector holds a copy of
+        the column, so it is built on demand and dropped: `quantiles` and
+        `boxplot_stats` cache only the values they read from it.
+        """
+        if self._quantile_method == 'exact':
+            self._column_entry(col)
+            with stage('quantile_summary', 'stats', column=col):
+                return quantile_summary(self._data[col], method='exact')
+        return self._cached(col, 'quantile_summary',
+                            lambda s: quantile_summary(s, method=self._quantile_method))
+
+    @_synchronized
+    def quantiles(self, col, qs: Iterable[float] = (0.25, 0.5, 0.75)) -> Dict[float, float]:
+        """
+        Quantiles of a numeric column. Already-computed quantiles are reused.
+
+        Args:
+            col: Column name.
+            qs: Quantile levels in [0, 1].
+
+        Returns:
+            Dictionary mapping each requested level to its value.
+        """
+        qs = list(qs)
+        entry = self._column_entry(col)
+        known = entry.setdefault('quantiles', {})
+        missing = [q for q in qs if q not in known]
+        if missing:
+            summary = self.quantile_summary(col)
+            with stage('quantiles', 'stats', column=col):
+                values = summary.quantiles(missing)
+            known.update({q: float(v) for q, v in zip(missing, values)})
+        return {q: known[q] for q in qs}
+
+    @_synchronized
+    def boxplot_stats(self, col, whis: float = 1.5) -> Dict[str, Any]:
+        """
+        Box-and-whisker statistics for `Axes.bxp`, drawn from the column's
+        quantile summary. Whiskers and fliers need one linear scan, no sort.
+
+        Args:
+            col: Numeric column name.
+            whis: Whisker reach as a multiple of the IQR.
+
+        Returns:
+            Dictionary with 'label', 'q1', 'med', 'q3', 'whislo', 'whishi' and 'fliers'.
+        """
+        def compute(series: pd.Series) -> Dict[str, Any]:
+            q = self.quantiles(col, (0.25, 0.5, 0.75))
+            q1, med, q3 = q[0.25], q[0.5], q[0.75]
+            lower, upper = q1 - whis * (q3 - q1), q3 + whis * (q3 - q1)
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            values = values[~np.isnan(values)]
+            inside = (values >= lower) & (values <= upper)
+            return {
+                'label': col,
+                'q1': q1, 'med': med, 'q3': q3,
+                'whislo': values[inside].min() if inside.any() else q1,
+                'whishi': values[inside].max() if inside.any() else q3,
+                'fliers': values[~inside],
+            }
+        known = self._column_entry(col).setdefault('boxplot_stats', {})
+        if whis not in known:
+            with stage('boxplot_stats', 'stats', column=col):
+                known[whis] = compute(self._data[col])
+        return known[whis]
+
+    def value_range(self, col) -> Tuple[float, float]:
+        """
+        (min, max) of a numeric column, ignoring NaN.
+
+        Preloaded footer statistics (see `preload`) answer without a scan;
+        otherwise the range comes from the cached moments.
+        """
+        return self._cached(col, 'value_range', lambda s: tuple(self.moments(col)[k] for k in ('min', 'max')))
+
+    @_synchronized
+    def histogram(self, col, bins: int = 30,
+                  value_range: Optional[Tuple[float, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Histogram counts and bin edges of a numeric column, cached per
+        (column, bins, range).
+
+        The default range comes from `value_range`, and the counts from one
+        vectorized `np.bincount`. Repeat renders, theme switches and the
+        different plots that show the same column reuse the result without
+        touching the raw data.
+
+        Args:
+            col: Numeric column name.
+            bins: Number of equal-width bins.
+            value_range: Optional (low, high) range; defaults to the data range.
+
+        Returns:
+            Tuple (counts, edges), identical to `np.histogram`.
+        """
+        known = self._column_entry(col).setdefault('histograms', {})
+        if value_range is not None:
+            value_range = tuple(value_range)
+        key = (bins, value_range)
+        if key not in known:
+            low, high = self.value_range(col)
+            with stage('histogram', 'stats', column=col):
+                edges = histogram_edges(*histogram_range(low, high, value_range), bins)
+                values = self._data[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                known[key] = (histogram_counts(values, edges), edges)
+        return known[key]
+
+    def ranks(self, col) -> np.ndarray:
+        """Average ranks of a numeric column (NaN stays NaN), as used by Spearman and Kendall."""
+        return self._cached(col, 'ranks', lambda s: s.rank().to_numpy(dtype=np.float64, na_value=np.nan))
+
+    @_synchronized
+    def correlation_matrix(self, columns: Optional[List[Any]] = None,
+                           method: str = 'pearson') -> pd.DataFrame:
+        """
+        Correlation matrix of numeric columns, cached per (columns, method).
+
+        Computed by `correlation.CorrelationEngine`; Spearman and Kendall reuse
+        the cached column ranks, so a new column subset does not re-rank whole
+        columns (Spearman pairs missing values in different rows are re-ranked
+        over their common rows, as in `DataFrame.corr`). Pearson
+        matrices keep their pairwise sums, so `append` can update them.
+
+        Args:
+            columns: Numeric columns. Defaults to all numeric columns.
+            method: 'pearson', 'spearman' or 'kendall'.
+
+        Returns:
+            The correlation matrix as a DataFrame.
+        """
+        if columns is None:
+            columns = self.numeric_columns()
+        self._check()
+        known = self._frame.setdefault('correlations', {})
+        key = (tuple(columns), method)
+        if key not in known:
+            with stage('correlation_matrix', 'stats', method=method, columns=len(columns)):
+                known[key] = self._compute_correlations(columns, method)
+        return known[key]
+
+    def _compute_correlations(self, columns: List[Any], method: str) -> pd.DataFrame:
+        engine = CorrelationEngine(self._data[list(columns)], method=method, profile=self)
+        if method != 'pearson':
+            return engine.matrix()
+        sums = engine.sums()
+        self._frame.setdefault('cross_products', {})[(tuple(columns), method)] = (engine.shift, sums)
+        return correlation_frame(correlation_from_sums(sums), engine.columns)
+
+    def categorical_counts(self, col) -> Dict[str, Any]:
+        """
+        Cardinality, mode, top frequency and value counts of a column, all derived
+        from a single factorize (see `stats.categorical_counts`), or from the
+        heavy-hitters sketch when `heavy_hitters` is set.
+        """
+        def compute(series: pd.Series) -> Dict[str, Any]:
+            if self._heavy_hitters is None:
+                counts = stats.categorical_counts(series)
+            else:
+                counts = stats.sketch_categorical_counts(series, capacity=self._heavy_hitters)
+            self._columns[col].setdefault('null_count', counts['missing'])
+            return counts
+        return self._cached(col, 'categorical_counts', compute)
+
+    def categorical_summary(self, columns: Optional[List[Any]] = None) -> Dict[Any, Dict[str, Any]]:
+        """
+        `categorical_counts` of several columns at once.
+
+        Args:
+            columns: Columns to count (default: every non-numeric column).
+
+        Returns:
+            Mapping of column name to its counts, in column order.
+        """
+        if columns is None:
+            columns = self.non_numeric_columns()
+        return {col: self.categorical_counts(col) for col in columns}
+
+    def value_counts(self, col) -> pd.Series:
+        """Non-null value frequencies of a column, most frequent first."""
+        return self.categorical_counts(col)['value_counts']
+
+    def top_values(self, col, k: int = 10) -> pd.Series:
+        """The `k` most frequent non-null values of a column with their counts."""
+        return self.value_counts(col).head(k)
+
+    def nunique(self, col) -> int:
+        """Number of distinct non-null values in a column."""
+        return self.categorical_counts(col)['unique']
+
+    # --- Appending rows ---
+
+    @_synchronized
+    def append(self, batch: pd.DataFrame) -> pd.DataFrame:
+        """
+        Appends rows to the profiled DataFrame and updates the cached statistics
+        from the new rows alone.
+
+        Mergeable entries are folded together with the batch's own aggregates:
+        counts, moments and min/max (pairwise moment merge), null counts,
+        categorical value counts, histograms whose bins still cover the data,
+        KLL quantile sketches and the cross-products of Pearson correlation
+        matrices. Entries that need the whole column again (exact quantiles,
+        boxplot whiskers, ranks, Spearman/Kendall matrices, hashes) are dropped
+        and recomputed on next use. So are all entries of a column whose dtype
+        changes with the batch.
+
+        When both the profiled frame and the batch have a RangeIndex (e.g.
+        batches that each start at 0), the batch's rows are numbered on from
+        the last row, as in a frame loaded in one piece. Other indexes keep
+        their labels, duplicates included.
+
+        Args:
+            batch: Rows to append, with the same columns in the same order.
+
+        Returns:
+            The combined DataFrame, which the profile now describes.
+
+        Raises:
+            TypeError: If `batch` is not a pandas DataFrame.
+            ValueError: If the batch's columns differ from the profiled ones.
+        """
+        if not isinstance(batch, pd.DataFrame):
+            raise TypeError("Appended data must be a pandas DataFrame")
+        if list(batch.columns) != list(self._data.columns):
+            raise ValueError(f"Appended columns {list(batch.columns)} do not match {list(self._data.columns)}")
+        self._check()
+        if len(batch) == 0:
+            return self._data
+
+        index = self._data.index
+        if isinstance(index, pd.RangeIndex) and isinstance(batch.index, pd.RangeIndex):
+            batch = batch.set_axis(pd.RangeIndex(index.stop, index.stop + len(batch) * index.step, index.step))
+        data = pd.concat([self._data, batch])
+        changed = [c for c, old, new in zip(data.columns, self._data.dtypes, data.dtypes) if old != new]
+        for col in changed:
+            self._columns.pop(col, None)
+
+        merged = [c for c, entry in self._columns.items() if 'moment_sums' in entry]
+        if merged:
+            before = stats.Moments.stack([self._columns[c]['moment_sums'] for c in merged])
+            self._store_moments(merged, before.merge(stats.block_moments(batch, merged)))
+        for col, entry in self._columns.items():
+            self._append_column(entry, batch[col])
+
+        correlations = self._frame.get('correlations', {})
+        cross_products = self._frame.get('cross_products', {})
+        self._frame = {key: self._frame[key] for key in ('numeric_columns', 'categorical_columns', 'non_numeric_columns')
+                       if key in self._frame and not changed}
+        for key, (shift, sums) in cross_products.items():
+            columns, method = key
+            if key in correlations and not set(columns) & set(changed):
+                engine = CorrelationEngine(batch[list(columns)], method=method, shift=shift)
+                sums = sums + engine.sums()
+                self._frame.setdefault('cross_products', {})[key] = (shift, sums)
+                self._frame.setdefault('correlations', {})[key] = correlation_frame(
+                    correlation_from_sums(sums), correlations[key].columns)
+
+        self._data = data
+        self._watch(data)
+        return data
+
+    def _append_column(self, entry: Dict[str, Any], batch: pd.Series):
+        """Folds a column's new values into its cache entry (moments are merged beforehand)."""
+        for key in ('hash', 'ranks', 'quantiles', 'boxplot_stats'):
+            entry.pop(key, None)
+        if 'moments' not in entry and 'null_count' in entry:
+            entry['null_count'] += int(batch.isnull().sum())
+
+        summary = entry.get('quantile_summary')
+        if summary is not None:
+            if hasattr(summary, 'sketch'):
+                summary.sketch.update(batch.to_numpy(dtype=np.float64, na_value=np.nan))
+            else:
+                del entry['quantile_summary']
+
+        if 'categorical_counts' in entry:
+            entry['categorical_counts'] = stats.merge_categorical_counts(
+                entry['categorical_counts'], stats.categorical_counts(batch))
+
+        if 'value_range' in entry:
+            values = batch.to_numpy(dtype=np.float64, na_value=np.nan)
+            low, high = entry['value_range']
+            entry['value_range'] = (float(np.fmin(low, np.fmin.reduce(values))),
+                                    float(np.fmax(high, np.fmax.reduce(values))))
+
+        histograms = entry.get('histograms')
+        if histograms:
+            values = batch.to_numpy(dtype=np.float64, na_value=np.nan)
+            low, high = entry['value_range']
+            for (bins, value_range), (counts, edges) in list(histograms.items()):
+                # Data-range bins only stay valid while the batch falls inside them
+                if value_range is None and not np.array_equal(
+                        edges, histogram_edges(low, high, bins)):
+                    del histograms[(bins, value_range)]
+                else:
+                    histograms[(bins, value_range)] = (counts + histogram_counts(values, edges), edges)
+
+    def __repr__(self) -> str:
+        return f"DataProfile(rows={len(self._data)}, cols={len(self._data.columns)}, cached={len(self._columns)})"
+
+
+# Extension array wrapping a plain NumPy column (named PandasArray before pandas 2.1)
+_NUMPY_ARRAY = getattr(pd.arrays, 'NumpyExtensionArray', None) or pd.arrays.PandasArray
+
+
+def _copy_on_write() -> bool:
+    """True when shallow copies are isolated by pandas Copy-on-Write (always from pandas 3)."""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return getattr(pd.options.mode, 'copy_on_write', False) is True
+
+
+def _column_version(series: pd.Series) -> int:
+    """Identity of a column's buffer, which changes when the column is replaced or copied."""
+    array = series.array
+    if isinstance(array, _NUMPY_ARRAY):
+        # A new wrapper each time: identify the NumPy buffer it wraps
+        return np.asarray(array).__array_interface__['data'][0]
+    return id(array)
+
+
+def _series_digest(values) -> bytes:
+    """
+    128-bit blake2b digest of a Series' or Index's values.
+
+    Plain NumPy columns are hashed straight from their buffer (with -0.0 and
+    NaN payloads normalized, so the digest agrees with `DataFrame.equals`);
+    everything else goes through the row hashes of `hash_pandas_object`.
+    Those hash mixed objects through their text, so object columns also hash
+    the type of every value: 1 and '1' must not collide.
+    """
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM':
+        array = np.ascontiguousarray(values.to_numpy())
+        if dtype.kind in 'fc':
+            array = array + 0.0
+            array[np.isnan(array)] = np.nan
+        return hashlib.blake2b(memoryview(array).cast('B'), digest_size=16).digest()
+    try:
+        hashes = pd.util.hash_pandas_object(values, index=False)
+    except TypeError:
+        # Unhashable objects (lists, dicts): hash their text form instead
+        hashes = pd.util.hash_pandas_object(pd.Series(values).astype(str), index=False)
+    digest = hashlib.blake2b(hashes.to_numpy().tobytes(), digest_size=16)
+    if dtype == object:
+        codes, types = pd.factorize(np.frompyfunc(type, 1, 1)(np.asarray(values, dtype=object)))
+        digest.update(codes.astype(np.int64).tobytes())
+        digest.update(repr([f"{t.__module__}.{t.__qualname__}" for t in types]).encode())
+    return digest.digest()
+
+
+def dtype_class(dtype) -> str:
+    """
+    Classifies a dtype as 'numeric', 'boolean', 'datetime' or 'categorical'.
+    """
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'boolean'
+    if pd.api.types.is_numeric_dtype(dtype):
+        return 'numeric'
+    if pd.api.types.is_datetime64_any_dtype(dtype) or pd.api.types.is_timedelta64_dtype(dtype):
+        return 'datetime'
+    return 'categorical'
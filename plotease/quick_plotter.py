@@ -1,26 +1,29 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from typing import Optional, Dict
-from .visualization import VisualizationBase 
+from typing import Optional, Dict, Any
+from .visualization import VisualizationBase
+from .profile import DataProfile
+from .reduction import choose_reduction, stratified_sample, raster_counts
+from .histogram import draw_histogram
+from .rendering import new_figure, show_figure
+from .tracing import stage, traced
 
 class QuickPlotter(VisualizationBase):
     """Quick plotting with minimal syntax"""
     
-    def __init__(self, data: pd.DataFrame, theme: str = 'default'):
-        super().__init__(data, theme)
+    def __init__(self, data: pd.DataFrame, theme: str = 'default', profile: Optional[DataProfile] = None):
+        super().__init__(data, theme, profile)
         self._style_config = {}
-        self._apply_theme()
     
     def detect_plot_type(self, x: str, y: Optional[str]) -> str:
         """Automatically detect appropriate plot type"""
         if y is None:
-            if self._data[x].dtype in [np.number]:
+            if self._profile.dtype_class(x) == 'numeric':
                 return 'hist'
             else:
                 return 'bar'
         else:
-            if self._data[x].dtype in [np.number] and self._data[y].dtype in [np.number]:
+            if self._profile.dtype_class(x) == 'numeric' and self._profile.dtype_class(y) == 'numeric':
                 return 'scatter'
             else:
                 return 'bar'
@@ -30,35 +33,202 @@ class QuickPlotter(VisualizationBase):
                    color: str = 'steelblue',
                    title: Optional[str] = None,
                    figsize: tuple = (10, 6),
+                   reduction: Optional[str] = 'auto',
+                   max_points: int = 100_000,
+                   show: bool = True,
                    **kwargs):
-        """Create plots with minimal syntax"""
-        plt.figure(figsize=figsize)
-        
-        if kind == 'auto':
-            kind = self.detect_plot_type(x, y)
+        """
+        Create plots with minimal syntax
+
+        Large scatter plots are reduced before drawing (see `reduction.choose_reduction`):
+        reduction='auto' leaves up to `max_points` points untouched, then switches to a
+        stratified sample and, for very large data, to hexbin density. Pass 'sample',
+        'hexbin' or 'raster' to force a method, or None to always draw every point.
+        When reduction is applied the title says so.
+
+        The plot is drawn on its own Figure (see `rendering.new_figure`), not on
+        pyplot's current figure. Its data is computed first (see `prepare`), so
+        concurrent threads only take turns to create the artists.
+
+        Args:
+            show: Display the figure (see `rendering.show_figure`); with False
+                  it is returned instead, e.g. to be saved or embedded.
+
+        Returns:
+            The matplotlib Figure with `show=False`; None once shown (so that
+            notebooks do not display it a second time as the cell's value).
+        """
+        # The data work happens before the theme (and its render lock) is taken
+        plot = self.prepare(x, y, kind=kind, reduction=reduction, max_points=max_points,
+                            figsize=figsize, **kwargs)
+        with self.theme_context():
+            fig = new_figure(figsize)
+            self.draw(fig, color=color, title=title, plot=plot)
+            with stage('tight_layout', 'layout'):
+                fig.tight_layout()
+            if show:
+                show_figure(fig)
+                return None
+        return fig
+
+    @traced('stats', 'quick_plot_data')
+    def prepare(self, x: str, y: Optional[str] = None,
+                kind: str = 'auto',
+                reduction: Optional[str] = 'auto',
+                max_points: int = 100_000,
+                figsize: tuple = (10, 6),
+                dpi: float = 100,
+                **kwargs) -> Dict[str, Any]:
+        """
+        Computes what a quick plot draws: histogram counts of a numeric
+        column (the values of other columns, binned when drawn), or the
+        scatter points left after reduction.
+
+        Needs no theme, so concurrent threads run it in parallel; `draw` then
+        only creates artists.
+
+        Args:
+            x, y, kind, reduction, max_points: As in `quick_plot`.
+            figsize, dpi: Size of the figure drawn on (for raster reduction).
+            **kwargs: Histogram options ('bins', 'range', 'weights'); the
+                      rest are passed to the plotting call.
+
+        Returns:
+            The plot's data, for `draw(plot=...)`.
+        """
+        # One version of the data, even if another thread appends meanwhile
+        with self._profile.lock:
+            if kind == 'auto':
+                kind = self.detect_plot_type(x, y)
+            plot = {'x': x, 'y': y, 'kind': kind, 'note': None}
+
+            if kind == 'scatter' and y:
+                plot.update(self._reduce_scatter(x, y, reduction, max_points, figsize, dpi))
+            elif kind == 'hist' and self._profile.dtype_class(x) != 'numeric':
+                # Dates, booleans and text are binned by Axes.hist, which keeps their axis units
+                values = self._data[x]
+                plot['values'] = values if kwargs.get('weights') is not None else values.dropna()
+                plot['bins'] = kwargs.pop('bins', 30)
+            elif kind == 'hist':
+                # Counts come from the profile's histogram cache, not the raw column
+                plot['counts'], plot['edges'] = self._profile.histogram(
+                    x, bins=kwargs.pop('bins', 30), value_range=kwargs.pop('range', None))
+                if kwargs.get('weights') is not None:
+                    # Weighted counts are specific to this plot: binned from the column
+                    values = self._data[x].to_numpy(dtype=np.float64, na_value=np.nan)
+                    weights = np.asarray(kwargs.pop('weights'), dtype=np.float64)
+                    keep = ~np.isnan(values)
+                    plot['counts'] = np.histogram(values[keep], bins=plot['edges'], weights=weights[keep])[0]
+        plot['kwargs'] = kwargs
+        return plot
+
+    @traced('panel', 'quick_plot')
+    def draw(self, fig, x: Optional[str] = None, y: Optional[str] = None,
+             kind: str = 'auto',
+             color: str = 'steelblue',
+             title: Optional[str] = None,
+             reduction: Optional[str] = 'auto',
+             max_points: int = 100_000,
+             plot: Optional[Dict[str, Any]] = None,
+             **kwargs):
+        """
+        Draws a quick plot onto an existing Figure, without pyplot state.
+
+        Takes the same options as `quick_plot`; `fig` may be a pyplot figure or a
+        standalone one from `rendering.new_figure` (headless rendering).
+
+        Args:
+            plot: Data from `prepare`, which then replaces x, y, kind,
+                  reduction, max_points and kwargs.
+
+        Returns:
+            The Axes that was drawn on.
+        """
+        if plot is None:
+            plot = self.prepare(x, y, kind=kind, reduction=reduction, max_points=max_points,
+                                figsize=tuple(fig.get_size_inches()), dpi=fig.dpi, **kwargs)
+        x, y, kind, kwargs = plot['x'], plot['y'], plot['kind'], plot['kwargs']
+        ax = fig.add_subplot(1, 1, 1)
         
         # Create plot based on type
         if kind == 'scatter' and y:
-            plt.scatter(self._data[x], self._data[y], alpha=0.6, color=color, **kwargs)
-            plt.xlabel(x, fontsize=12)
-            plt.ylabel(y, fontsize=12)
+            self._draw_scatter(fig, ax, plot, color, **kwargs)
+            ax.set_xlabel(x, fontsize=12)
+            ax.set_ylabel(y, fontsize=12)
             
+        elif kind == 'hist' and 'values' in plot:
+            ax.hist(plot['values'], bins=plot['bins'], color=color, edgecolor='black', alpha=0.7, **kwargs)
+            ax.set_xlabel(x, fontsize=12)
+            ax.set_ylabel('Frequency', fontsize=12)
+
         elif kind == 'hist':
-            plt.hist(self._data[x], bins=30, color=color, edgecolor='black', alpha=0.7, **kwargs)
-            plt.xlabel(x, fontsize=12)
-            plt.ylabel('Frequency', fontsize=12)
+            draw_histogram(ax, plot['counts'], plot['edges'], color=color, edgecolor='black', alpha=0.7, **kwargs)
+            ax.set_xlabel(x, fontsize=12)
+            ax.set_ylabel('Frequency', fontsize=12)
         
         # Add title
-        if title:
-            plt.title(title, fontsize=16, fontweight='bold', pad=20)
-        else:
-            plt.title(f'{kind.capitalize()} Plot: {x}' + (f' vs {y}' if y else ''), 
-                     fontsize=16, fontweight='bold', pad=20)
+        if not title:
+            title = f'{kind.capitalize()} Plot: {x}' + (f' vs {y}' if y else '')
+        if plot['note']:
+            title = f"{title}\n({plot['note']})"
+        ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
         
-        plt.grid(alpha=0.3)
-        plt.tight_layout()
-        plt.show()
+        ax.grid(alpha=0.3)
+        return ax
     
+    def _reduce_scatter(self, x: str, y: str, reduction: Optional[str], max_points: int,
+                        figsize: tuple, dpi: float) -> Dict[str, Any]:
+        """
+        Reduces a scatter plot that has too many points.
+
+        Returns:
+            The reduction 'method' (None: draw every point), the 'points' to
+            draw, or the raster 'counts' and 'extent', and a 'note' describing
+            the reduction. Axes that are not both numeric are drawn as they
+            are, with their own units (dates, categories).
+        """
+        if not (self._profile.dtype_class(x) == 'numeric' and self._profile.dtype_class(y) == 'numeric'):
+            return {'method': None, 'points': (self._data[x], self._data[y])}
+        xs = self._data[x].to_numpy(dtype=np.float64, na_value=np.nan)
+        ys = self._data[y].to_numpy(dtype=np.float64, na_value=np.nan)
+        finite = np.isfinite(xs) & np.isfinite(ys)
+        if not finite.all():
+            xs, ys = xs[finite], ys[finite]
+        n_points = len(xs)
+
+        method = choose_reduction(n_points, reduction, max_points)
+        if method is None:
+            return {'method': None, 'points': (xs, ys)}
+
+        if method == 'sample':
+            keep = stratified_sample(xs, ys, max_points)
+            return {'method': method, 'points': (xs[keep], ys[keep]),
+                    'note': f'stratified sample of {len(keep):,} / {n_points:,} points'}
+
+        if method == 'hexbin':
+            return {'method': method, 'points': (xs, ys),
+                    'note': f'hexbin density of {n_points:,} points'}
+
+        # 'raster': one cell per screen pixel of the axes, drawn as an image
+        width, height = (int(d * dpi * 0.8) for d in figsize)
+        counts, extent = raster_counts(xs, ys, (height, width))
+        return {'method': method, 'counts': counts, 'extent': extent,
+                'note': f'raster density of {n_points:,} points'}
+
+    def _draw_scatter(self, fig, ax, plot: Dict[str, Any], color: str, **kwargs):
+        """Draws the (reduced) scatter plot computed by `_reduce_scatter`."""
+        method = plot['method']
+        if method in (None, 'sample'):
+            ax.scatter(*plot['points'], alpha=0.6, color=color, **kwargs)
+            return
+
+        if method == 'hexbin':
+            image = ax.hexbin(*plot['points'], gridsize=100, mincnt=1, cmap='viridis', bins='log')
+        else:
+            image = ax.imshow(plot['counts'], extent=plot['extent'], origin='lower', aspect='auto',
+                              cmap='viridis', interpolation='nearest')
+        fig.colorbar(image, ax=ax, label='Count')
+
     def render(self):
         """Implementation of abstract method"""
         print("Use quick_plot() method to render specific plots")
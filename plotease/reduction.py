@@ -0,0 +1,178 @@
+import pandas as pd
+import numpy as np
+from typing import Optional, Tuple
+
+# Reduction methods understood by QuickPlotter.quick_plot(kind='scatter')
+REDUCTION_METHODS = ('sample', 'hexbin', 'raster')
+
+# Rows processed per step when computing strata over the full data
+_SAMPLE_BLOCK = 1 << 16
+
+
+def choose_reduction(n_points: int, reduction: Optional[str] = 'auto',
+                     max_points: int = 100_000) -> Optional[str]:
+    """
+    Picks the reduction stage for a scatter plot of `n_points` points.
+
+    With reduction='auto', nothing is reduced up to `max_points`. Up to 20x that,
+    a stratified sample is drawn, which keeps the look of a scatter plot and its
+    outliers. Beyond that the points are drawn as hexbin density.
+
+    Args:
+        n_points: Number of plottable points.
+        reduction: 'auto', None, or one of REDUCTION_METHODS to force a method.
+        max_points: Point-count threshold above which reduction kicks in.
+
+    Returns:
+        The method name, or None when the points should be drawn as-is.
+
+    Raises:
+        ValueError: If `reduction` is not recognized.
+    """
+    if reduction is None or reduction == 'none':
+        return None
+    if reduction == 'auto':
+        if n_points <= max_points:
+            return None
+        return 'sample' if n_points <= 20 * max_points else 'hexbin'
+    if reduction not in REDUCTION_METHODS:
+        raise ValueError(f"reduction must be 'auto', None or one of {REDUCTION_METHODS}")
+    return reduction
+
+
+def stratified_sample(x: np.ndarray, y: np.ndarray, n: int, grid: int = 64,
+                      random_state: Optional[int] = 0) -> np.ndarray:
+    """
+    Draws about `n` points, stratified over a grid x grid partition of the plane.
+
+    Every occupied cell keeps a share of its points proportional to its count
+    (rounded down), and at least one point. Sparse regions and outliers
+    therefore stay visible, while dense regions are thinned. Fully vectorized:
+    one lexsort, no Python loop over cells.
+
+    Args:
+        x, y: Coordinates (finite values only).
+        n: Target sample size.
+        grid: Number of cells along each axis.
+        random_state: Seed for reproducible samples.
+
+    Returns:
+        Sorted integer indices of the selected points.
+    """
+    total = len(x)
+    if total <= n:
+        return np.arange(total)
+    rng = np.random.default_rng(random_state)
+
+    cell = _cell_index(x, grid) * grid + _cell_index(y, grid)
+    counts = np.bincount(cell, minlength=grid * grid)
+    quota = np.maximum(np.floor(counts * (n / total)), counts > 0).astype(np.int64)
+
+    # Random order within each cell, then keep the first `quota` of every cell
+    order = np.lexsort((rng.random(total), cell))
+    sorted_cells = cell[order]
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank = np.arange(total) - starts[sorted_cells]
+    return np.sort(order[rank < quota[sorted_cells]])
+
+
+def raster_counts(x: np.ndarray, y: np.ndarray,
+                  shape: Tuple[int, int]) -> Tuple[np.ndarray, Tuple[float, float, float, float]]:
+    """
+    Aggregates points into a (height, width) pixel grid of counts.
+
+    Returns:
+        The count image (row 0 at the bottom, zeros masked as NaN) and its
+        (xmin, xmax, ymin, ymax) extent for `Axes.imshow`.
+    """
+    height, width = shape
+    extent = (float(x.min()), float(x.max()), float(y.min()), float(y.max()))
+    counts, _, _ = np.histogram2d(y, x, bins=(height, width), range=[extent[2:], extent[:2]])
+    counts[counts == 0] = np.nan
+    return counts, extent
+
+
+def _cell_index(values: np.ndarray, grid: int) -> np.ndarray:
+    low, high = values.min(), values.max()
+    if high == low:
+        return np.zeros(len(values), dtype=np.int64)
+    index = ((values - low) / (high - low) * grid).astype(np.int64)
+    return np.minimum(index, grid - 1)
+
+
+def strata_codes(values: pd.Series, bins: int = 10) -> np.ndarray:
+    """
+    Integer stratum of every row, for stratified sampling (-1 = missing).
+
+    Numeric columns are cut into `bins` (at most 127) equal-width bins, so
+    sparse tails get strata of their own; other columns use one stratum per
+    category.
+
+    Args:
+        values: Column to stratify on.
+        bins: Number of bins for numeric columns.
+
+    Returns:
+        Array of integer codes, one per row (int8 for numeric columns).
+    """
+    if not (pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype)):
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            return values.cat.codes.to_numpy()
+        return pd.factorize(values)[0]
+
+    x = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    low, high = np.fmin.reduce(x), np.fmax.reduce(x)
+    codes = np.zeros(len(x), dtype=np.int8)
+    scale = bins / (high - low) if np.isfinite(high - low) and high > low else 0.0
+    # Cache-sized blocks: no full-length float temporaries
+    for start in range(0, len(x), _SAMPLE_BLOCK):
+        block = x[start:start + _SAMPLE_BLOCK] - low
+        block *= scale
+        np.minimum(block, bins - 1, out=block)
+        block[np.isnan(block)] = -1
+        codes[start:start + _SAMPLE_BLOCK] = block
+    return codes
+
+
+def sample_positions(n_rows: int, n: int, strata: Optional[np.ndarray] = None,
+                     random_state: Optional[int] = 0) -> np.ndarray:
+    """
+    Row positions of a reproducible random sample of about `n` rows.
+
+    Positions are drawn uniformly without replacement (Floyd's algorithm, so
+    the cost depends on `n`, not on `n_rows`). With `strata`, every stratum
+    that the uniform draw missed is topped up with one random row of its own,
+    so rare classes and sparse tails always appear in the sample. The top-up
+    adds at most `n // 10` rows: beyond that many missed strata (e.g. an ID
+    column), a random subset of them is topped up.
+
+    Args:
+        n_rows: Number of rows to sample from.
+        n: Target sample size.
+        strata: Optional stratum code per row (see `strata_codes`).
+        random_state: Seed for reproducible samples.
+
+    Returns:
+        Sorted integer positions.
+    """
+    if n_rows <= n:
+        return np.arange(n_rows)
+    rng = np.random.default_rng(random_state)
+    positions = rng.choice(n_rows, size=n, replace=False)
+    if strata is not None and len(strata):
+        # Counts are shifted by one so that missing (-1) lands in slot 0
+        slots = int(strata.max()) + 2
+        sizes = np.zeros(slots, dtype=np.int64)
+        for start in range(0, n_rows, _SAMPLE_BLOCK):
+            sizes += np.bincount(strata[start:start + _SAMPLE_BLOCK].astype(np.intp) + 1, minlength=slots)
+        covered = np.bincount(strata[positions].astype(np.intp) + 1, minlength=slots)
+        missed = np.flatnonzero((sizes[1:] > 0) & (covered[1:] == 0))
+        if len(missed) > max(1, n // 10):
+            missed = np.sort(rng.choice(missed, size=max(1, n // 10), replace=False))
+        if len(missed):
+            # One pass for all strata: rows grouped by stratum, one random row per group
+            order = np.argsort(strata, kind='stable')
+            starts = np.concatenate([[0], np.cumsum(sizes)])[missed + 1]
+            offsets = (rng.random(len(missed)) * sizes[missed + 1]).astype(np.int64)
+            positions = np.concatenate([positions, order[starts + offsets]])
+    return np.sort(positions)
@@ -0,0 +1,205 @@
+import io
+import os
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Tuple, Mapping, TYPE_CHECKING
+from .tracing import stage
+
+# matplotlib is imported by the functions below, on first use, so that
+# summary-only code never pays for it
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+# File formats the batch renderer writes
+SAVE_FORMATS = ('png', 'svg', 'pdf')
+
+# Matplotlib style behind each PlotEase theme (unknown themes use 'default')
+THEME_STYLES = {
+    'default': 'seaborn-v0_8-darkgrid',
+    'minimal': 'seaborn-v0_8-whitegrid',
+    'dark': 'dark_background',
+    'colorful': 'seaborn-v0_8-bright'
+}
+
+# rcParams that are process settings rather than style, left alone by themes
+# (matplotlib's own style blacklist, when available)
+_NOT_STYLE = {
+    'interactive', 'backend', 'webagg.port', 'webagg.address', 'webagg.port_retries',
+    'webagg.open_in_browser', 'backend_fallback', 'toolbar', 'timezone',
+    'figure.max_open_warning', 'figure.raise_window', 'savefig.directory',
+    'tk.window_focus', 'docstring.hardcopy', 'date.epoch',
+}
+
+# Held while a theme is active: rcParams are process-global, so figures with
+# different themes are drawn one at a time. Re-entrant for nested contexts.
+RENDER_LOCK = threading.RLock()
+
+
+@lru_cache(maxsize=None)
+def theme_rc(theme: str) -> Mapping[str, object]:
+    """
+    The rcParams of a theme, resolved once per process.
+
+    Args:
+        theme: PlotEase theme name ('default', 'minimal', 'dark', 'colorful').
+
+    Returns:
+        Read-only mapping of already-validated rcParams.
+    """
+    import matplotlib as mpl
+    import matplotlib.style
+    style_name = THEME_STYLES.get(theme, 'default')
+    if style_name == 'default':
+        not_style = getattr(matplotlib.style, '_STYLE_BLACKLIST', _NOT_STYLE)
+        rc = {k: v for k, v in mpl.rcParamsDefault.items() if k not in not_style}
+    else:
+        rc = dict(matplotlib.style.library[style_name])
+    return MappingProxyType(rc)
+
+
+@contextmanager
+def themed(theme: str):
+    """
+    Applies a theme to the figures created and drawn inside the block.
+
+    rcParams are restored on exit, so nothing leaks into the caller's plots,
+    and `RENDER_LOCK` keeps concurrent threads from mixing themes. Threads
+    therefore draw one at a time: compute statistics before entering (see
+    `DiagnosticPlotter.precompute` and `QuickPlotter.prepare`), so that only
+    artist creation is serialized.
+
+    Example:
+        >>> with themed('dark'):
+        ...     fig = new_figure()
+        ...     fig.add_subplot().plot([1, 2, 3])
+    """
+    import matplotlib as mpl
+    with RENDER_LOCK, mpl.rc_context(theme_rc(theme)):
+        yield
+
+
+def new_figure(figsize: Tuple[float, float] = (10, 6), dpi: float = 100) -> 'Figure':
+    """
+    Creates a Figure on its own Agg canvas.
+
+    The figure is never registered with pyplot: it does not become the
+    "current" figure, is not shown, and is freed as soon as it goes out of
+    scope. Threads can therefore build figures independently. Every PlotEase
+    plot is drawn into one; `show_figure` displays it.
+
+    Args:
+        figsize: Width and height in inches.
+        dpi: Resolution in dots per inch.
+
+    Returns:
+        A matplotlib Figure.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def show_figure(fig: 'Figure'):
+    """
+    Displays a standalone figure with pyplot's backend (window or notebook output).
+
+    pyplot adopts the figure only to show it. Outside interactive mode,
+    `plt.show()` blocks until the window is closed, and the figure is then
+    released from pyplot again, so repeated plots do not accumulate in its
+    registry.
+    """
+    import matplotlib.pyplot as plt
+    with RENDER_LOCK:
+        _adopt_figure(fig)
+        with stage('show', 'output'):
+            plt.show()
+        if not plt.isinteractive():
+            plt.close(fig)
+
+
+def _adopt_figure(fig: 'Figure'):
+    """Registers a standalone figure with pyplot, under a new backend manager."""
+    import matplotlib.pyplot as plt
+    try:
+        plt.figure(fig)
+    except ValueError:
+        # Before matplotlib 3.10 pyplot only re-activates figures it created:
+        # do what newer versions do, with the backend's own manager factory
+        from matplotlib import _pylab_helpers
+        backend = plt._get_backend_mod() if hasattr(plt, '_get_backend_mod') else plt._backend_mod
+        numbers = plt.get_fignums()
+        manager = backend.new_figure_manager_given_figure(max(numbers) + 1 if numbers else 1, fig)
+        _pylab_helpers.Gcf.set_active(manager)
+
+
+def release_figure(fig: 'Figure'):
+    """
+    Frees a figure's memory now instead of at the next garbage collection.
+
+    Figures are full of reference cycles (artists point back at their axes
+    and figure), so dropping the last reference is not enough: long-lived
+    workers would hold many rendered figures until the cyclic collector runs.
+    This closes the figure in pyplot if it was shown, and clears its artists.
+    """
+    if fig.canvas.manager is not None:
+        import matplotlib.pyplot as plt
+        plt.close(fig)
+    fig.clear()
+
+
+def figure_format(path: str, fmt: Optional[str] = None) -> str:
+    """
+    Resolves the output format from `fmt` or the file extension.
+
+    Raises:
+        ValueError: If the format is not one of SAVE_FORMATS.
+    """
+    if fmt is None:
+        fmt = os.path.splitext(path)[1].lstrip('.') or 'png'
+    fmt = fmt.lower()
+    if fmt not in SAVE_FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}'. Available: {list(SAVE_FORMATS)}")
+    return fmt
+
+
+def figure_bytes(fig: 'Figure', fmt: str = 'png', dpi: Optional[float] = None) -> bytes:
+    """
+    Encodes a figure in memory, e.g. for an HTTP response.
+
+    Args:
+        fig: Figure to encode.
+        fmt: 'png', 'svg' or 'pdf'.
+        dpi: Resolution for raster output; the figure's own dpi if omitted.
+
+    Returns:
+        The encoded image.
+    """
+    fmt = figure_format('', fmt)
+    buffer = io.BytesIO()
+    with stage('savefig', 'save', format=fmt):
+        fig.savefig(buffer, format=fmt, dpi=dpi if dpi is not None else 'figure')
+    return buffer.getvalue()
+
+
+def save_figure(fig: 'Figure', path: str, fmt: Optional[str] = None, dpi: Optional[float] = None) -> str:
+    """
+    Writes a figure to disk.
+
+    Args:
+        fig: Figure to save.
+        path: Output file path.
+        fmt: 'png', 'svg' or 'pdf'; taken from the extension if omitted.
+        dpi: Resolution for raster output; the figure's own dpi if omitted.
+
+    Returns:
+        The path written.
+    """
+    fmt = figure_format(path, fmt)
+    # Saving is where the figure is actually drawn and encoded
+    with stage('savefig', 'save', format=fmt):
+        fig.savefig(path, format=fmt, dpi=dpi if dpi is not None else 'figure')
+    return path
@@ -0,0 +1,379 @@
+import pandas as pd
+import numpy as np
+from typing import Optional, List, Tuple, Iterable, Any
+
+# Values sorted at a time when a large batch is added to a KLL sketch
+_UPDATE_BLOCK = 1 << 16
+
+
+class KLLSketch:
+    """
+    Mergeable approximate quantile sketch (KLL: Karnin, Lang & Liberty, 2016).
+
+    Items are kept in a hierarchy of compactors. An item stored at level h stands
+    for 2**h original values. When a level overflows, it is sorted and every
+    other item (random offset) is promoted to the next level. Memory stays
+    O(k log(n/k)), and the rank error is about O(1/k) of n with high
+    probability: roughly 1% for the default k=200.
+
+    Attributes:
+        k (int): Accuracy parameter (capacity of the top compactor).
+        n (int): Number of values summarized so far.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        """
+        Initializes an empty sketch.
+
+        Args:
+            k: Accuracy parameter. Larger values use more memory and give smaller errors.
+            seed: Seed for the compaction coin flips, for reproducible results.
+        """
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.n = 0
+        self._levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+        self._min = np.nan
+        self._max = np.nan
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _halve(self, items: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Compacts sorted items: returns (promoted, kept-at-this-level)."""
+        keep = items[:len(items) % 2]
+        pairs = items[len(keep):]
+        return pairs[self._rng.integers(2)::2], keep
+
+    def update(self, values: Iterable[float]) -> 'KLLSketch':
+        """
+        Adds a batch of values (NaN is ignored).
+
+        Batches are sorted in blocks and pre-compacted to at most k items before
+        they enter the hierarchy.
+
+        Returns:
+            The sketch itself, for chaining.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.n += len(values)
+        self._min = np.fmin(self._min, values.min())
+        self._max = np.fmax(self._max, values.max())
+
+        # Large batches are cut into cache-sized blocks; each block is sorted
+        # and pre-compacted on its own, so the cost is O(n log block), not a full sort
+        for start in range(0, len(values), _UPDATE_BLOCK):
+            block = values[start:start + _UPDATE_BLOCK]
+            level = 0
+            if len(block) > self.k:
+                block = np.sort(block)
+                while len(block) > self.k:
+                    promoted, keep = self._halve(block)
+                    self._add(level, keep)
+                    block = promoted
+                    level += 1
+            self._add(level, block)
+            self._compress()
+        return self
+
+    def _add(self, level: int, items: np.ndarray):
+        while len(self._levels) <= level:
+            self._levels.append(np.empty(0))
+        if len(items):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+
+    def _compress(self):
+        level = 0
+        while level < len(self._levels):
+            if len(self._levels[level]) > self._capacity(level):
+                promoted, keep = self._halve(np.sort(self._levels[level]))
+                self._levels[level] = keep
+                self._add(level + 1, promoted)
+                # Adding a level shrinks the capacity of every level below it
+                level = 0
+                continue
+            level += 1
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """
+        Folds another sketch into this one.
+
+        Returns:
+            The sketch itself, for chaining.
+        """
+        for level, items in enumerate(other._levels):
+            self._add(level, items)
+        self.n += other.n
+        self._min = np.fmin(self._min, other._min)
+        self._max = np.fmax(self._max, other._max)
+        self._compress()
+        return self
+
+    def quantiles(self, qs: Iterable[float]) -> np.ndarray:
+        """
+        Approximate quantiles.
+
+        Args:
+            qs: Quantile levels in [0, 1].
+
+        Returns:
+            Array of values, one per level (NaN if the sketch is empty).
+        """
+        qs = np.asarray(list(qs), dtype=np.float64)
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(lv), 2.0 ** h) for h, lv in enumerate(self._levels)])
+        order = np.argsort(items, kind='stable')
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+        # Each item sits at the middle of the rank range it stands for; with unit
+        # weights this reproduces the exact 'linear' interpolation method
+        positions = (cumulative - weights[order] / 2 - 0.5) / max(cumulative[-1] - 1, 1)
+        result = np.interp(qs, positions, items)
+        result[qs <= 0] = self._min
+        result[qs >= 1] = self._max
+        return result
+
+    def quantile(self, q: float) -> float:
+        """Approximate value at quantile level `q`."""
+        return float(self.quantiles([q])[0])
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __repr__(self) -> str:
+        retained = sum(len(lv) for lv in self._levels)
+        return f"KLLSketch(k={self.k}, n={self.n}, retained={retained})"
+
+
+class HeavyHitters:
+    """
+    Mergeable frequent-items summary (Misra-Gries).
+
+    Keeps at most `capacity` candidate values with frequency estimates that
+    undercount the truth by at most `error` <= n / (capacity + 1). Until the
+    number of distinct values exceeds the capacity the counts are exact
+    (`error == 0`).
+
+    Attributes:
+        capacity (int): Maximum number of tracked values.
+        n (int): Number of non-null values summarized.
+        error (int): Upper bound on how much any reported count is too low.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.n = 0
+        self.error = 0
+        self._counts = pd.Series(dtype='int64')
+
+    def update(self, counts: pd.Series) -> 'HeavyHitters':
+        """
+        Adds pre-aggregated frequencies (e.g. one chunk's `value_counts()`).
+
+        Returns:
+            The summary itself, for chaining.
+        """
+        if len(counts) == 0:
+            return self
+        self.n += int(counts.sum())
+        if len(self._counts) == 0:
+            merged = counts.astype('int64')
+        else:
+            merged = self._counts.add(counts, fill_value=0).astype('int64')
+        self._counts = self._prune(merged)
+        return self
+
+    def update_values(self, values: pd.Series) -> 'HeavyHitters':
+        """Adds raw values; they are aggregated with one factorize first."""
+        return self.update(values.value_counts(dropna=True))
+
+    def _prune(self, counts: pd.Series) -> pd.Series:
+        if len(counts) <= self.capacity:
+            return counts
+        # Subtract the (capacity+1)-th largest count from all and drop the rest
+        threshold = int(np.partition(counts.to_numpy(), -(self.capacity + 1))[-(self.capacity + 1)])
+        self.error += threshold
+        counts = counts - threshold
+        return counts[counts > 0]
+
+    def merge(self, other: 'HeavyHitters') -> 'HeavyHitters':
+        """
+        Folds another summary into this one.
+
+        Returns:
+            The summary itself, for chaining.
+        """
+        n = self.n + other.n
+        self.update(other._counts)
+        self.n = n
+        self.error += other.error
+        return self
+
+    def top(self, k: int = 1) -> pd.Series:
+        """
+        The `k` most frequent values and their estimated counts, most frequent
+        first; ties are broken by value (smallest first) like `DataFrame.mode()`.
+        """
+        counts = self._counts
+        if len(counts) == 0:
+            return counts
+        try:
+            counts = counts.sort_index()
+        except TypeError:
+            pass
+        return counts.sort_values(ascending=False, kind='stable').head(k)
+
+    @property
+    def counts(self) -> pd.Series:
+        """All tracked values with their estimated counts."""
+        return self._counts
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __repr__(self) -> str:
+        return f"HeavyHitters(capacity={self.capacity}, n={self.n}, tracked={len(self._counts)}, error={self.error})"
+
+
+class DistinctCounter:
+    """
+    Mergeable distinct-count estimator (K minimum values).
+
+    Hashes every value to 64 bits and keeps the `k` smallest distinct hashes.
+    While fewer than `k` distinct values have been seen, the count is exact (up
+    to hash collisions). After that it is estimated from the k-th smallest
+    hash, with a relative standard error of about 1/sqrt(k).
+    """
+
+    def __init__(self, k: int = 4096):
+        self.k = k
+        self._hashes = np.empty(0, dtype=np.uint64)
+
+    def update(self, values: Any) -> 'DistinctCounter':
+        """
+        Adds values (ideally already de-duplicated, e.g. factorize uniques).
+
+        Returns:
+            The counter itself, for chaining.
+        """
+        values = pd.Series(values).dropna()
+        if len(values):
+            # Same hashes as hash_pandas_object, without its de-duplicating factorize
+            hashes = pd.util.hash_array(values.to_numpy(), categorize=False)
+            if not self.exact:
+                # Only hashes below the current k-th smallest can change the sketch
+                hashes = hashes[hashes < self._hashes[-1]]
+            self._hashes = np.union1d(self._hashes, hashes)[:self.k]
+        return self
+
+    def merge(self, other: 'DistinctCounter') -> 'DistinctCounter':
+        """Folds another counter into this one."""
+        self._hashes = np.union1d(self._hashes, other._hashes)[:self.k]
+        return self
+
+    @property
+    def exact(self) -> bool:
+        """True while the count is exact rather than estimated."""
+        return len(self._hashes) < self.k
+
+    def estimate(self) -> int:
+        """Exact or estimated number of distinct values."""
+        if self.exact:
+            return len(self._hashes)
+        kth = float(self._hashes[self.k - 1]) + 1.0
+        return int(round((self.k - 1) * 2.0 ** 64 / kth))
+
+    def __repr__(self) -> str:
+        return f"DistinctCounter(k={self.k}, estimate={self.estimate()})"
+
+
+# QUANTILE BACKENDS
+
+class ExactQuantiles:
+    """
+    Exact quantiles of a column ('linear' interpolation, like pandas).
+
+    All levels requested in one call are found with a single selection pass
+    (`np.quantile` partitions for every level at once), so asking for q1 and q3
+    together costs one pass instead of two full sorts. It keeps a NaN-free
+    copy of the column, so `DataProfile` does not cache it, only its results.
+    """
+
+    method = 'exact'
+
+    def __init__(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        self._values = values[~np.isnan(values)]
+
+    def quantiles(self, qs: Iterable[float]) -> np.ndarray:
+        qs = np.asarray(list(qs), dtype=np.float64)
+        if len(self._values) == 0:
+            return np.full(len(qs), np.nan)
+        return np.quantile(self._values, qs)
+
+
+class SketchQuantiles:
+    """
+    Approximate quantiles from a KLL sketch built in one pass over the column.
+
+    Any number of levels can be read afterwards without touching the data again.
+    The rank error is bounded by about 1/k of the column length.
+    """
+
+    method = 'sketch'
+
+    def __init__(self, values: np.ndarray, k: int = 400, seed: Optional[int] = 0):
+        self.sketch = KLLSketch(k, seed=seed).update(values)
+
+    def quantiles(self, qs: Iterable[float]) -> np.ndarray:
+        return self.sketch.quantiles(qs)
+
+
+_QUANTILE_BACKENDS = {
+    'exact': ExactQuantiles,
+    'sketch': SketchQuantiles,
+}
+
+
+def register_quantile_backend(name: str, factory):
+    """
+    Registers a custom quantile backend.
+
+    Args:
+        name: Name used as `method=` elsewhere in PlotEase.
+        factory: Callable taking a 1D float array (NaN = missing) and returning an
+                 object with a `quantiles(qs) -> np.ndarray` method.
+    """
+    _QUANTILE_BACKENDS[name] = factory
+
+
+def quantile_summary(values: Any, method: str = 'exact', **kwargs):
+    """
+    Builds a quantile summary of a column with the chosen backend.
+
+    Args:
+        values: Series or array of numbers (NaN values are ignored).
+        method: 'exact', 'sketch' or a name registered with `register_quantile_backend`.
+        **kwargs: Backend options (e.g. `k` for the sketch).
+
+    Returns:
+        An object with a `quantiles(qs)` method.
+
+    Raises:
+        ValueError: If the method is unknown.
+    """
+    if method not in _QUANTILE_BACKENDS:
+        raise ValueError(f"Unknown quantile method '{method}'. Available: {list(_QUANTILE_BACKENDS)}")
+    if isinstance(values, (pd.Series, pd.Index)):
+        values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return _QUANTILE_BACKENDS[method](values, **kwargs)
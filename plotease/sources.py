@@ -0,0 +1,234 @@
+import os
+import pandas as pd
+import numpy as np
+from typing import Optional, List, Dict, Any, Sequence, Union
+
+# File formats understood by DataSource
+SOURCE_FORMATS = ('parquet', 'arrow', 'csv')
+
+# Filter operators, as in `pd.read_parquet(filters=...)`
+FILTER_OPERATORS = ('==', '=', '!=', '<', '<=', '>', '>=', 'in', 'not in')
+
+# Rows read per step when filtering a CSV file without pyarrow
+_CSV_CHUNK_ROWS = 1 << 20
+
+# Filters: [(column, op, value), ...] (all must hold), or a list of such lists (any must hold)
+Filters = Union[List[tuple], List[List[tuple]]]
+
+
+def _require_pyarrow(what: str):
+    try:
+        import pyarrow.dataset as ds
+    except ImportError as e:
+        raise ImportError(f"{what} requires pyarrow (pip install pyarrow)") from e
+    return ds
+
+
+class DataSource:
+    """
+    A Parquet, Arrow (IPC/Feather) or CSV file or directory, read on demand.
+
+    Only the requested columns are read, and row filters are applied while
+    reading: with pyarrow datasets, Parquet row groups whose footer statistics
+    exclude the filter are skipped without being decoded. CSV files are read
+    with pandas when pyarrow is missing, in chunks filtered as they arrive.
+
+    Example:
+        >>> source = DataSource('sales/', format='parquet')
+        >>> source.read(['region', 'revenue'], filters=[('year', '>=', 2023)])
+
+    Attributes:
+        path (str): File or directory.
+        format (str): 'parquet', 'arrow' or 'csv'.
+    """
+
+    def __init__(self, path: str, format: Optional[str] = None):
+        """
+        Args:
+            path: File or directory of files.
+            format: One of SOURCE_FORMATS (default: from the file extension).
+
+        Raises:
+            ValueError: If the format is unknown or cannot be inferred.
+        """
+        if format is None:
+            format = _infer_format(path)
+        if format not in SOURCE_FORMATS:
+            raise ValueError(f"Unknown format '{format}'. Available: {list(SOURCE_FORMATS)}")
+        self.path = path
+        self.format = format
+        self._dataset = None
+        self._columns = None
+
+    def _arrow_dataset(self):
+        """The pyarrow dataset over the path, opened on first use."""
+        if self._dataset is None:
+            ds = _require_pyarrow(f"Reading {self.format} files")
+            self._dataset = ds.dataset(self.path, format='ipc' if self.format == 'arrow' else self.format)
+        return self._dataset
+
+    def _uses_arrow(self) -> bool:
+        """Whether reads go through pyarrow (always, except single CSV files without it)."""
+        if self.format != 'csv' or os.path.isdir(self.path):
+            return True
+        try:
+            import pyarrow.dataset  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names, read from the schema or the CSV header only."""
+        if self._columns is None:
+            if self._uses_arrow():
+                self._columns = list(self._arrow_dataset().schema.names)
+            else:
+                self._columns = list(pd.read_csv(self.path, nrows=0).columns)
+        return self._columns
+
+    def read(self, columns: Optional[Sequence[str]] = None, filters: Optional[Filters] = None) -> pd.DataFrame:
+        """
+        Reads the given columns of the rows that pass `filters`.
+
+        Args:
+            columns: Columns to read (default: all), in this order.
+            filters: Row filters on any columns, e.g. [('year', '>=', 2023),
+                     ('region', 'in', ['EU', 'US'])]; a list of such lists
+                     keeps the rows matching any of them.
+
+        Returns:
+            A pandas DataFrame.
+
+        Raises:
+            KeyError: If a column does not exist.
+            ValueError: If a filter is malformed.
+        """
+        columns = list(self.columns) if columns is None else list(columns)
+        missing = [c for c in columns + _filter_columns(filters) if c not in self.columns]
+        if missing:
+            raise KeyError(f"Columns {missing} not found in '{self.path}'")
+
+        if self._uses_arrow():
+            table = self._arrow_dataset().to_table(columns=columns, filter=_arrow_expression(filters))
+            return table.to_pandas()
+
+        if not filters:
+            return pd.read_csv(self.path, usecols=columns)[columns]
+        needed = list(dict.fromkeys(columns + _filter_columns(filters)))
+        chunks = [chunk.loc[_filter_mask(chunk, filters), columns]
+                  for chunk in pd.read_csv(self.path, usecols=needed, chunksize=_CSV_CHUNK_ROWS)]
+        return pd.concat(chunks, ignore_index=True)
+
+    def statistics(self) -> Optional[pd.DataFrame]:
+        """
+        Per-column statistics from the Parquet footers, without reading any data.
+
+        Row-group statistics are combined over every row group of every file.
+        A value is missing when some row group does not record it.
+
+        Returns:
+            DataFrame indexed by column with 'rows', 'null_count', 'min' and
+            'max', or None for formats without footer statistics.
+        """
+        if self.format != 'parquet':
+            return None
+        totals: Dict[str, Dict[str, Any]] = {}
+        for fragment in self._arrow_dataset().get_fragments():
+            metadata = fragment.metadata
+            for g in range(metadata.num_row_groups):
+                group = metadata.row_group(g)
+                for i in range(group.num_columns):
+                    chunk = group.column(i)
+                    entry = totals.setdefault(chunk.path_in_schema,
+                                              {'rows': 0, 'null_count': 0, 'min': None, 'max': None, 'complete': True})
+                    entry['rows'] += group.num_rows
+                    stats = chunk.statistics
+                    if stats is None or not stats.has_null_count or not stats.has_min_max:
+                        entry['complete'] = False
+                        continue
+                    entry['null_count'] += stats.null_count
+                    if stats.num_values:
+                        entry['min'] = stats.min if entry['min'] is None else min(entry['min'], stats.min)
+                        entry['max'] = stats.max if entry['max'] is None else max(entry['max'], stats.max)
+        rows = {col: ({'rows': e['rows'], 'null_count': e['null_count'], 'min': e['min'], 'max': e['max']}
+                      if e['complete'] else {'rows': e['rows'], 'null_count': np.nan, 'min': None, 'max': None})
+                for col, e in totals.items()}
+        return pd.DataFrame.from_dict(rows, orient='index', columns=['rows', 'null_count', 'min', 'max'])
+
+    def __repr__(self) -> str:
+        return f"DataSource('{self.path}', format='{self.format}')"
+
+
+def _infer_format(path: str) -> str:
+    if os.path.isdir(path):
+        names = [n for n in os.listdir(path) if not n.startswith(('.', '_'))]
+        if not names:
+            raise ValueError(f"Cannot infer the format of empty directory '{path}'")
+        path = names[0]
+    ext = os.path.splitext(path)[1].lower()
+    formats = {'.parquet': 'parquet', '.pq': 'parquet', '.arrow': 'arrow', '.feather': 'arrow',
+               '.ipc': 'arrow', '.csv': 'csv'}
+    if ext not in formats:
+        raise ValueError(f"Cannot infer the format of '{path}': pass format= one of {list(SOURCE_FORMATS)}")
+    return formats[ext]
+
+
+def _filter_groups(filters: Optional[Filters]) -> List[List[tuple]]:
+    """Filters in disjunctive normal form: a list of conjunctions."""
+    if not filters:
+        return []
+    groups = filters if isinstance(filters[0], list) else [filters]
+    for group in groups:
+        for condition in group:
+            if not (isinstance(condition, tuple) and len(condition) == 3 and condition[1] in FILTER_OPERATORS):
+                raise ValueError(f"Invalid filter {condition!r}: expected (column, op, value) "
+                                 f"with op one of {list(FILTER_OPERATORS)}")
+    return groups
+
+
+def _filter_columns(filters: Optional[Filters]) -> List[str]:
+    return list(dict.fromkeys(col for group in _filter_groups(filters) for col, _, _ in group))
+
+
+def _filter_mask(frame: pd.DataFrame, filters: Filters) -> np.ndarray:
+    """Rows of `frame` passing the filters (missing values never pass)."""
+    result = np.zeros(len(frame), dtype=bool)
+    for group in _filter_groups(filters):
+        keep = np.ones(len(frame), dtype=bool)
+        for col, op, value in group:
+            values = frame[col]
+            if op in ('in', 'not in'):
+                test = values.isin(list(value))
+                test = ~test & values.notna() if op == 'not in' else test
+            else:
+                test = {'==': values.eq, '=': values.eq, '!=': values.ne, '<': values.lt,
+                        '<=': values.le, '>': values.gt, '>=': values.ge}[op](value)
+                if op == '!=':
+                    test &= values.notna()
+            keep &= test.to_numpy(dtype=bool, na_value=False)
+        result |= keep
+    return result
+
+
+def _arrow_expression(filters: Optional[Filters]):
+    """The filters as a pyarrow dataset expression (None when there are none)."""
+    groups = _filter_groups(filters)
+    if not groups:
+        return None
+    import pyarrow.dataset as ds
+    expression = None
+    for group in groups:
+        conjunction = None
+        for col, op, value in group:
+            field = ds.field(col)
+            if op == 'in':
+                test = field.isin(list(value))
+            elif op == 'not in':
+                test = ~field.isin(list(value))
+            else:
+                test = {'==': field.__eq__, '=': field.__eq__, '!=': field.__ne__, '<': field.__lt__,
+                        '<=': field.__le__, '>': field.__gt__, '>=': field.__ge__}[op](value)
+            conjunction = test if conjunction is None else conjunction & test
+        expression = conjunction if expression is None else expression | conjunction
+    return expression
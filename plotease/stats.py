@@ -0,0 +1,392 @@
+import pandas as pd
+import numpy as np
+from typing import List, Dict, Any, Tuple
+from .sketches import HeavyHitters, DistinctCounter
+
+# Values processed per step of the fused kernel. Small enough that the per-step
+# temporaries stay in cache, large enough to amortize the Python loop.
+_CHUNK_ELEMENTS = 1 << 18
+
+# Rows counted per step of sketch_categorical_counts
+_SKETCH_CHUNK_ROWS = 1 << 20
+
+
+class Moments:
+    """
+    Vectorized central-moment accumulators for a block of numeric columns.
+
+    Holds, for every column of a block, the non-null count, missing count, mean,
+    the second to fourth central moment sums (M2..M4) and the min/max. These are
+    exactly the quantities needed for count/mean/std/skew/kurtosis, and they can
+    be combined across blocks without revisiting the data.
+
+    Attributes:
+        n, missing, mean, m2, m3, m4, minimum, maximum (np.ndarray): One entry per column.
+    """
+
+    __slots__ = ('n', 'missing', 'mean', 'm2', 'm3', 'm4', 'minimum', 'maximum')
+
+    def __init__(self, n, missing, mean, m2, m3, m4, minimum, maximum):
+        self.n = n
+        self.missing = missing
+        self.mean = mean
+        self.m2 = m2
+        self.m3 = m3
+        self.m4 = m4
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @classmethod
+    def from_block(cls, values: np.ndarray) -> 'Moments':
+        """
+        Computes moments for a 2D (rows x columns) block in a single pass.
+
+        The block is streamed in cache-sized row chunks. Each chunk contributes
+        power sums (sum of d, d^2, d^3, d^4 with d = x - shift) plus min/max and
+        null counts.
+        Shifting by a value close to the mean keeps the power sums well
+        conditioned. The sums are converted to central moments at the end.
+
+        Args:
+            values: 2D array of numbers; NaN marks a missing value.
+
+        Returns:
+            A Moments instance with one entry per column.
+        """
+        n_rows, n_cols = values.shape
+        # Work column-major: one contiguous row of `cols` per input column
+        cols = values.T
+        shift = _shift_estimate(cols)
+
+        n = np.zeros(n_cols)
+        s1 = np.zeros(n_cols)
+        s2 = np.zeros(n_cols)
+        s3 = np.zeros(n_cols)
+        s4 = np.zeros(n_cols)
+        minimum = np.full(n_cols, np.nan)
+        maximum = np.full(n_cols, np.nan)
+
+        step = max(1024, _CHUNK_ELEMENTS // max(n_cols, 1))
+        for start in range(0, n_rows, step):
+            chunk = np.asarray(cols[:, start:start + step], dtype=np.float64)
+            d = chunk - shift[:, None]
+            nan_mask = np.isnan(d)
+            if nan_mask.any():
+                d[nan_mask] = 0.0
+                n += chunk.shape[1] - nan_mask.sum(axis=1)
+            else:
+                n += chunk.shape[1]
+            s1 += d.sum(axis=1)
+            p = d * d
+            s2 += p.sum(axis=1)
+            p *= d
+            s3 += p.sum(axis=1)
+            p *= d
+            s4 += p.sum(axis=1)
+            # fmin/fmax ignore NaN, so missing values never win
+            np.fmin(minimum, np.fmin.reduce(chunk, axis=1), out=minimum)
+            np.fmax(maximum, np.fmax.reduce(chunk, axis=1), out=maximum)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mu = np.where(n > 0, s1 / n, 0.0)
+        m2 = s2 - n * mu ** 2
+        m3 = s3 - 3 * mu * s2 + 2 * n * mu ** 3
+        m4 = s4 - 4 * mu * s3 + 6 * mu ** 2 * s2 - 3 * n * mu ** 4
+        # Power sums can leave tiny negative residue for constant columns
+        m2 = np.where(m2 < 0, 0.0, m2)
+
+        empty = n == 0
+        return cls(
+            n=n,
+            missing=n_rows - n,
+            mean=np.where(empty, np.nan, shift + mu),
+            m2=m2, m3=m3, m4=m4,
+            minimum=minimum,
+            maximum=maximum,
+        )
+
+    @classmethod
+    def empty(cls, n_cols: int) -> 'Moments':
+        """Accumulators for `n_cols` columns that have seen no data yet."""
+        zeros = lambda: np.zeros(n_cols)
+        nans = lambda: np.full(n_cols, np.nan)
+        return cls(zeros(), zeros(), nans(), zeros(), zeros(), zeros(), nans(), nans())
+
+    def merge(self, other: 'Moments') -> 'Moments':
+        """
+        Combines two sets of accumulators over the same columns.
+
+        Uses the pairwise update formulas of Chan et al. / Pebay, so the result
+        is the same (up to rounding) as computing the moments over the
+        concatenated data, and is numerically stable.
+
+        Args:
+            other: Accumulators for the same columns over different rows.
+
+        Returns:
+            A new Moments instance.
+        """
+        na, nb = self.n, other.n
+        n = na + nb
+        mean_a = np.where(na > 0, self.mean, 0.0)
+        mean_b = np.where(nb > 0, other.mean, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = np.where((na > 0) & (nb > 0), mean_b - mean_a, 0.0)
+            mean = np.where(na > 0, mean_a + delta * np.where(n > 0, nb / n, 0.0), mean_b)
+            ab = np.where(n > 0, na * nb / n, 0.0)
+            m2 = self.m2 + other.m2 + delta ** 2 * ab
+            m3 = (self.m3 + other.m3
+                  + np.where(n > 0, delta ** 3 * ab * (na - nb) / n, 0.0)
+                  + np.where(n > 0, 3 * delta * (na * other.m2 - nb * self.m2) / n, 0.0))
+            m4 = (self.m4 + other.m4
+                  + np.where(n > 0, delta ** 4 * ab * (na * na - na * nb + nb * nb) / n ** 2, 0.0)
+                  + np.where(n > 0, 6 * delta ** 2 * (na * na * other.m2 + nb * nb * self.m2) / n ** 2, 0.0)
+                  + np.where(n > 0, 4 * delta * (na * other.m3 - nb * self.m3) / n, 0.0))
+        return Moments(
+            n=n,
+            missing=self.missing + other.missing,
+            mean=np.where(n > 0, mean, np.nan),
+            m2=m2, m3=m3, m4=m4,
+            minimum=np.fmin(self.minimum, other.minimum),
+            maximum=np.fmax(self.maximum, other.maximum),
+        )
+
+    @classmethod
+    def stack(cls, parts: List['Moments']) -> 'Moments':
+        """Concatenates accumulators of different columns into one instance."""
+        return cls(*[np.concatenate([getattr(m, name) for m in parts]) for name in cls.__slots__])
+
+    def select(self, positions) -> 'Moments':
+        """Accumulators of a subset of the columns (by position)."""
+        return Moments(*[getattr(self, name)[positions] for name in self.__slots__])
+
+    def finalize(self) -> Dict[str, np.ndarray]:
+        """
+        Converts the accumulators into summary statistics.
+
+        Returns:
+            Dictionary of arrays: count, missing, mean, std, min, max, skew and
+            kurtosis, using the same sample corrections as pandas.
+        """
+        n = self.n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.where(n > 1, np.sqrt(self.m2 / (n - 1)), np.nan)
+
+            skew = n * np.sqrt(n - 1) / (n - 2) * self.m3 / self.m2 ** 1.5
+            skew = np.where(self.m2 == 0, 0.0, skew)
+            skew = np.where(n < 3, np.nan, skew)
+
+            adj = 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+            kurt = n * (n + 1) * (n - 1) * self.m4 / ((n - 2) * (n - 3) * self.m2 ** 2) - adj
+            kurt = np.where(self.m2 == 0, 0.0, kurt)
+            kurt = np.where(n < 4, np.nan, kurt)
+
+        return {
+            'count': n,
+            'missing': self.missing,
+            'mean': self.mean,
+            'std': std,
+            'min': self.minimum,
+            'max': self.maximum,
+            'skew': skew,
+            'kurtosis': kurt,
+        }
+
+
+def _shift_estimate(cols: np.ndarray, sample_size: int = 1024) -> np.ndarray:
+    """Cheap per-column location estimate (mean of the leading values)."""
+    head = np.asarray(cols[:, :sample_size], dtype=np.float64)
+    valid = ~np.isnan(head)
+    counts = valid.sum(axis=1)
+    sums = np.where(valid, head, 0.0).sum(axis=1)
+    return np.where(counts > 0, sums / np.maximum(counts, 1), 0.0)
+
+
+def block_moments(data: pd.DataFrame, columns: List[Any]) -> Moments:
+    """
+    Runs the fused kernel over numeric columns of a DataFrame.
+
+    Columns are grouped by dtype so each group is handed to the kernel as one
+    homogeneous 2D block (no per-column Python work).
+
+    Args:
+        data: DataFrame containing the columns.
+        columns: Numeric column names.
+
+    Returns:
+        Moments with one entry per column, in `columns` order.
+    """
+    groups: Dict[str, List[int]] = {}
+    for i, col in enumerate(columns):
+        groups.setdefault(str(data[col].dtype), []).append(i)
+
+    result = Moments.empty(len(columns))
+    for positions in groups.values():
+        block = data[[columns[i] for i in positions]]
+        if all(isinstance(t, np.dtype) for t in block.dtypes):
+            values = block.to_numpy()
+        else:
+            # Nullable extension dtypes (Int64, Float64): pd.NA -> NaN
+            values = block.to_numpy(dtype=np.float64, na_value=np.nan)
+        moments = Moments.from_block(values)
+        for name in Moments.__slots__:
+            getattr(result, name)[positions] = getattr(moments, name)
+    return result
+
+
+def numeric_moments(data: pd.DataFrame, columns: List[Any]) -> Dict[Any, Dict[str, float]]:
+    """
+    Computes count, missing, mean, std, min, max, skew and kurtosis for numeric
+    columns with the fused single-pass kernel.
+
+    Args:
+        data: DataFrame containing the columns.
+        columns: Numeric column names.
+
+    Returns:
+        Dictionary mapping each column to its statistics, in `columns` order.
+    """
+    return moments_to_dict(block_moments(data, columns), columns)
+
+
+def moments_to_dict(moments: Moments, columns: List[Any]) -> Dict[Any, Dict[str, float]]:
+    """Finalizes accumulators into one statistics dictionary per column."""
+    stats = moments.finalize()
+    return {col: {key: float(arr[i]) for key, arr in stats.items()} for i, col in enumerate(columns)}
+
+
+def categorical_counts(series: pd.Series) -> Dict[str, Any]:
+    """
+    Computes cardinality, mode and frequencies of a column from one factorize.
+
+    Args:
+        series: Column to analyze.
+
+    Returns:
+        Dictionary with 'unique', 'missing', 'top_value', 'top_freq',
+        'value_counts' (non-null frequencies, most frequent first) and 'counts'
+        (the same frequencies in order of first appearance, used for merging).
+    """
+    return _summarize_counts(*_count_values(series))
+
+
+def _count_values(series: pd.Series) -> Tuple[pd.Index, np.ndarray, int]:
+    """Distinct non-null values, their counts (one `np.bincount`) and the missing count."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # The category codes already are a factorization: nothing to hash
+        codes = series.cat.codes.to_numpy()
+        uniques = series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series)
+    # Codes are shifted by one so that missing (-1) is counted in slot 0
+    slots = np.bincount(codes.astype(np.intp) + 1, minlength=len(uniques) + 1)
+    counts = slots[1:]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        used = counts > 0
+        uniques, counts = uniques[used], counts[used]
+    return pd.Index(uniques), counts, int(slots[0])
+
+
+def sketch_categorical_counts(series: pd.Series, capacity: int = 1000, distinct_k: int = 4096,
+                              chunk_rows: int = _SKETCH_CHUNK_ROWS) -> Dict[str, Any]:
+    """
+    Bounded-memory `categorical_counts` for very high-cardinality columns (IDs).
+
+    The column is counted chunk by chunk, and every chunk is folded into a
+    Misra-Gries heavy-hitters summary of `capacity` values plus a KMV distinct
+    counter. Memory therefore depends on the chunk and sketch sizes, not on
+    the number of distinct values. While the column has at most `capacity`
+    distinct values every count is exact.
+
+    Args:
+        series: Column to analyze.
+        capacity: Number of candidate values tracked.
+        distinct_k: Size of the distinct-value sketch.
+        chunk_rows: Rows counted per step.
+
+    Returns:
+        Dictionary in the `categorical_counts` format, where 'value_counts'
+        holds the tracked values only and counts may be too low by at most
+        'error'; 'unique' is estimated beyond `distinct_k` values. The
+        sketches are kept under 'sketch' so the result can be merged.
+    """
+    hitters, distinct, missing = HeavyHitters(capacity), DistinctCounter(distinct_k), 0
+    for start in range(0, len(series), chunk_rows):
+        uniques, counts, chunk_missing = _count_values(series.iloc[start:start + chunk_rows])
+        # Pruning the chunk on its own first keeps the merge small (Misra-Gries
+        # summaries are mergeable, their errors add up)
+        hitters.merge(HeavyHitters(capacity).update(pd.Series(counts, index=uniques)))
+        distinct.update(uniques)
+        missing += chunk_missing
+    return _summarize_sketch(hitters, distinct, missing)
+
+
+def _summarize_sketch(hitters: HeavyHitters, distinct: DistinctCounter, missing: int) -> Dict[str, Any]:
+    value_counts = hitters.top(hitters.capacity).rename('count')
+    empty = len(value_counts) == 0
+    return {
+        'unique': distinct.estimate(),
+        'missing': missing,
+        'top_value': np.nan if empty else value_counts.index[0],
+        'top_freq': np.nan if empty else int(value_counts.iloc[0]),
+        'value_counts': value_counts,
+        'counts': value_counts,
+        'error': hitters.error,
+        'sketch': (hitters, distinct),
+    }
+
+
+def merge_categorical_counts(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combines the `categorical_counts` of two row ranges of the same column.
+
+    Works on the distinct values only, so the cost depends on the column's
+    cardinality, not on its length. The result is the same as counting the
+    concatenated rows, ties included.
+
+    Args:
+        old: Counts of the earlier rows.
+        new: Counts of the rows that follow.
+
+    Returns:
+        Dictionary in the `categorical_counts` format.
+    """
+    before, after = old['counts'], new['counts']
+    if 'sketch' in old:
+        hitters, distinct = old['sketch']
+        hitters.update(after)
+        distinct.update(after.index)
+        return _summarize_sketch(hitters, distinct, old['missing'] + new['missing'])
+    index = before.index.append(after.index.difference(before.index, sort=False))
+    counts = (before.reindex(index, fill_value=0).to_numpy()
+              + after.reindex(index, fill_value=0).to_numpy())
+    return _summarize_counts(index, counts, old['missing'] + new['missing'])
+
+
+def _summarize_counts(uniques: pd.Index, counts: np.ndarray, missing: int) -> Dict[str, Any]:
+    """Builds the `categorical_counts` dictionary from per-value counts in order of appearance."""
+    if len(uniques) == 0:
+        empty = pd.Series([], dtype='int64', name='count')
+        return {
+            'unique': 0, 'missing': missing, 'top_value': np.nan, 'top_freq': np.nan,
+            'value_counts': empty, 'counts': empty,
+        }
+
+    top_freq = counts.max()
+    # Ties are broken like DataFrame.mode(): smallest value first
+    tied = np.asarray(uniques)[counts == top_freq]
+    try:
+        top_value = min(tied)
+    except TypeError:
+        top_value = tied[0]
+
+    order = np.argsort(-counts, kind='stable')
+    value_counts = pd.Series(counts[order], index=uniques.take(order), name='count')
+    return {
+        'unique': int(len(uniques)),
+        'missing': missing,
+        'top_value': top_value,
+        'top_freq': int(top_freq),
+        'value_counts': value_counts,
+        'counts': pd.Series(counts, index=uniques, name='count'),
+    }
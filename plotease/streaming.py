@@ -0,0 +1,312 @@
+import pandas as pd
+import numpy as np
+from typing import Optional, List, Dict, Iterable, Any
+from . import stats
+from .profile import dtype_class
+from .sketches import KLLSketch, HeavyHitters, DistinctCounter
+from .summary import numeric_table, categorical_table, assemble_summary
+
+
+class StreamingSummary:
+    """
+    Chunk-at-a-time equivalent of `SummaryGenerator.tabular_summary`.
+
+    Consumes an iterator of DataFrame chunks (e.g. `pd.read_csv(..., chunksize=...)`
+    or Parquet row groups) and keeps only mergeable statistics, so memory depends
+    on the number of columns and the sketch sizes, never on the number of rows:
+
+    - numeric columns: counts, central moments and min/max (exact), plus a KLL
+      quantile sketch (approximate);
+    - other columns: missing counts (exact), a Misra-Gries heavy-hitters summary
+      for top_value/top_freq and a KMV distinct counter for 'unique'. These are
+      exact until a column exceeds `heavy_hitters` / `distinct_k` distinct values.
+
+    Two summaries built over different chunks can be combined with `merge()`,
+    e.g. when chunks are processed by several workers.
+
+    Example:
+        >>> summary = StreamingSummary()
+        >>> for chunk in pd.read_csv('big.csv', chunksize=1_000_000):
+        ...     summary.update(chunk)
+        >>> summary.tabular_summary(style='full')
+    """
+
+    def __init__(self, quantile_k: int = 200, heavy_hitters: int = 1000,
+                 distinct_k: int = 4096, quantiles: bool = True, seed: Optional[int] = None):
+        """
+        Initializes an empty streaming summary.
+
+        Args:
+            quantile_k: Accuracy parameter of the per-column KLL quantile sketches.
+            heavy_hitters: Number of candidate values tracked per categorical column.
+            distinct_k: Size of the per-column distinct-value sketches.
+            quantiles: Whether to maintain quantile sketches for numeric columns.
+            seed: Seed for the quantile sketches, for reproducible results.
+        """
+        self._quantile_k = quantile_k
+        self._heavy_hitters = heavy_hitters
+        self._distinct_k = distinct_k
+        self._quantiles = quantiles
+        self._seed = seed
+
+        self._n_rows = 0
+        self._columns: Optional[List[Any]] = None
+        self._numeric: List[Any] = []
+        self._categorical: List[Any] = []
+        self._dtypes: Optional[pd.Series] = None
+        self._moments: Optional[stats.Moments] = None
+        self._sketches: Dict[Any, KLLSketch] = {}
+        self._missing: Dict[Any, int] = {}
+        self._hitters: Dict[Any, HeavyHitters] = {}
+        self._distinct: Dict[Any, DistinctCounter] = {}
+
+    def _init_schema(self, chunk: pd.DataFrame):
+        self._columns = list(chunk.columns)
+        classes = {c: dtype_class(chunk[c].dtype) for c in self._columns}
+        self._numeric = [c for c in self._columns if classes[c] == 'numeric']
+        self._categorical = [c for c in self._columns if classes[c] in ('categorical', 'boolean')]
+        self._dtypes = chunk[self._categorical].dtypes
+        self._init_accumulators()
+
+    def _init_accumulators(self):
+        self._moments = stats.Moments.empty(len(self._numeric))
+        for col in self._numeric:
+            self._sketches[col] = KLLSketch(self._quantile_k, seed=self._seed)
+        for col in self._categorical:
+            self._missing[col] = 0
+            self._hitters[col] = HeavyHitters(self._heavy_hitters)
+            self._distinct[col] = DistinctCounter(self._distinct_k)
+
+    def _check_schema(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Matches a chunk against the columns' types, re-typing columns that
+        have only held missing values so far.
+
+        Chunked readers type each chunk on its own: a column that is empty in
+        the first chunk of a CSV file reads as float64, and as text once values
+        appear. Such a column takes the type of its first values, as it would
+        when reading the whole file; empty chunks never change a type.
+
+        Returns:
+            The chunk, with empty non-numeric chunks of numeric columns as float64.
+        """
+        if list(chunk.columns) != self._columns:
+            raise ValueError(f"Chunk columns {list(chunk.columns)} do not match {self._columns}")
+        empty, to_categorical, to_numeric = {}, {}, []
+        for i, col in enumerate(self._numeric):
+            if dtype_class(chunk[col].dtype) == 'numeric':
+                continue
+            if chunk[col].isna().all():
+                empty[col] = np.float64
+            elif self._moments.n[i] == 0:
+                to_categorical[col] = chunk[col].dtype
+            else:
+                raise TypeError(f"Column '{col}' is numeric in earlier chunks but {chunk[col].dtype} here "
+                                f"(read it with one dtype, e.g. read_csv(dtype={{{col!r}: str}}))")
+        for col in self._categorical:
+            if (self._hitters[col].n == 0 and dtype_class(chunk[col].dtype) == 'numeric'
+                    and chunk[col].notna().any()):
+                to_numeric.append(col)
+        if to_categorical or to_numeric:
+            self._retype(to_categorical, to_numeric)
+        return chunk.astype(empty) if empty else chunk
+
+    def _retype(self, to_categorical: Dict[Any, Any], to_numeric: List[Any]):
+        """
+        Moves columns that have seen no values between the numeric and
+        categorical accumulators.
+
+        Args:
+            to_categorical: Numeric columns to make categorical, with their new dtype.
+            to_numeric: Categorical columns to make numeric.
+        """
+        order = {col: i for i, col in enumerate(self._columns)}
+        missing = {col: int(self._moments.missing[i]) for i, col in enumerate(self._numeric)
+                   if col in to_categorical}
+        missing.update({col: self._missing.pop(col) for col in to_numeric})
+
+        numeric = sorted([c for c in self._numeric if c not in to_categorical] + to_numeric, key=order.get)
+        parts = []
+        for col in numeric:
+            if col in to_numeric:
+                part = stats.Moments.empty(1)
+                part.missing[0] = missing[col]
+                self._sketches[col] = KLLSketch(self._quantile_k, seed=self._seed)
+                self._hitters.pop(col)
+                self._distinct.pop(col)
+            else:
+                part = self._moments.select([self._numeric.index(col)])
+            parts.append(part)
+        self._moments = stats.Moments.stack(parts) if parts else stats.Moments.empty(0)
+
+        for col in to_categorical:
+            self._sketches.pop(col)
+            self._missing[col] = missing[col]
+            self._hitters[col] = HeavyHitters(self._heavy_hitters)
+            self._distinct[col] = DistinctCounter(self._distinct_k)
+        self._numeric = numeric
+        self._categorical = sorted([c for c in self._categorical if c not in to_numeric] + list(to_categorical),
+                                   key=order.get)
+        self._dtypes = pd.Series({col: to_categorical[col] if col in to_categorical else self._dtypes[col]
+                                  for col in self._categorical}, dtype=object)
+
+    def update(self, chunk: pd.DataFrame) -> 'StreamingSummary':
+        """
+        Folds one chunk into the summary.
+
+        Args:
+            chunk: A pandas DataFrame, or any object with a `to_pandas()` method
+                   (e.g. a pyarrow Table or RecordBatch).
+
+        Returns:
+            The summary itself, for chaining.
+
+        Raises:
+            TypeError: If the chunk is not a DataFrame, or a column with values changes type.
+            ValueError: If the chunk's columns differ from earlier chunks.
+        """
+        if not isinstance(chunk, pd.DataFrame) and hasattr(chunk, 'to_pandas'):
+            chunk = chunk.to_pandas()
+        if not isinstance(chunk, pd.DataFrame):
+            raise TypeError("Chunks must be pandas DataFrames")
+        if len(chunk) == 0:
+            return self
+
+        if self._columns is None:
+            self._init_schema(chunk)
+        else:
+            chunk = self._check_schema(chunk)
+
+        self._n_rows += len(chunk)
+        if self._numeric:
+            self._moments = self._moments.merge(stats.block_moments(chunk, self._numeric))
+            if self._quantiles:
+                for col in self._numeric:
+                    self._sketches[col].update(chunk[col].to_numpy(dtype=np.float64, na_value=np.nan))
+
+        for col in self._categorical:
+            counts = stats.categorical_counts(chunk[col])
+            self._missing[col] += counts['missing']
+            self._hitters[col].update(counts['value_counts'])
+            self._distinct[col].update(counts['value_counts'].index)
+        return self
+
+    def merge(self, other: 'StreamingSummary') -> 'StreamingSummary':
+        """
+        Folds a summary built over other chunks of the same dataset into this one.
+
+        Returns:
+            The summary itself, for chaining.
+        """
+        if other._columns is None:
+            return self
+        if self._columns is None:
+            self._columns = list(other._columns)
+            self._numeric = list(other._numeric)
+            self._categorical = list(other._categorical)
+            self._dtypes = other._dtypes
+            self._init_accumulators()
+        elif other._columns != self._columns:
+            raise ValueError("Cannot merge summaries over different columns")
+        if other._numeric != self._numeric:
+            self._match_types(other)
+            other._match_types(self)
+            if other._numeric != self._numeric:
+                conflicts = sorted(map(str, set(self._numeric) ^ set(other._numeric)))
+                raise TypeError(f"Columns {conflicts} are numeric in one summary only")
+
+        self._n_rows += other._n_rows
+        self._moments = self._moments.merge(other._moments)
+        for col in self._numeric:
+            self._sketches[col].merge(other._sketches[col])
+        for col in self._categorical:
+            self._missing[col] += other._missing[col]
+            self._hitters[col].merge(other._hitters[col])
+            self._distinct[col].merge(other._distinct[col])
+        return self
+
+    def _match_types(self, other: 'StreamingSummary'):
+        """Re-types this summary's value-less columns to match how `other` typed them."""
+        numeric = {col: i for i, col in enumerate(self._numeric)}
+        to_categorical = {col: other._dtypes[col] for col in other._categorical
+                          if col in numeric and self._moments.n[numeric[col]] == 0}
+        to_numeric = [col for col in other._numeric if col in self._hitters and self._hitters[col].n == 0]
+        if to_categorical or to_numeric:
+            self._retype(to_categorical, to_numeric)
+
+    @property
+    def n_rows(self) -> int:
+        """Number of rows summarized so far."""
+        return self._n_rows
+
+    def quantiles(self, col, qs: Iterable[float] = (0.25, 0.5, 0.75)) -> Dict[float, float]:
+        """
+        Approximate quantiles of a numeric column.
+
+        Args:
+            col: Column name.
+            qs: Quantile levels in [0, 1].
+
+        Returns:
+            Dictionary mapping each requested level to its value.
+        """
+        if col not in self._sketches:
+            raise KeyError(f"No quantile sketch for column '{col}'")
+        qs = list(qs)
+        return dict(zip(qs, self._sketches[col].quantiles(qs).tolist()))
+
+    def tabular_summary(self, style: str = 'full') -> pd.DataFrame:
+        """
+        Returns the same table as `SummaryGenerator.tabular_summary`, built from
+        the merged statistics.
+
+        Args:
+            style: 'full', 'numeric' or 'categorical'.
+
+        Raises:
+            ValueError: If no rows have been summarized, or the style is unknown.
+        """
+        if self._n_rows == 0:
+            raise ValueError("No chunks have been summarized")
+
+        def get_numeric_summary() -> pd.DataFrame:
+            return numeric_table(stats.moments_to_dict(self._moments, self._numeric), self._n_rows)
+
+        def get_categorical_summary() -> pd.DataFrame:
+            counts = []
+            for col in self._categorical:
+                top = self._hitters[col].top(1)
+                counts.append({
+                    'missing': self._missing[col],
+                    'unique': self._distinct[col].estimate(),
+                    'top_value': top.index[0] if len(top) else np.nan,
+                    'top_freq': int(top.iloc[0]) if len(top) else np.nan,
+                })
+            return categorical_table(self._dtypes, counts, self._n_rows)
+
+        return assemble_summary(style, get_numeric_summary, get_categorical_summary)
+
+    def __len__(self) -> int:
+        return self._n_rows
+
+    def __repr__(self) -> str:
+        cols = 0 if self._columns is None else len(self._columns)
+        return f"StreamingSummary(rows={self._n_rows}, cols={cols})"
+
+
+def summarize_chunks(chunks: Iterable[pd.DataFrame], style: str = 'full', **kwargs) -> pd.DataFrame:
+    """
+    Summarizes a dataset that does not fit in memory, one chunk at a time.
+
+    Args:
+        chunks: Iterable of DataFrame chunks, e.g. `pd.read_csv(path, chunksize=...)`.
+        style: 'full', 'numeric' or 'categorical'.
+        **kwargs: Sketch options forwarded to `StreamingSummary`.
+
+    Returns:
+        The same table as `SummaryGenerator.tabular_summary(style)`.
+    """
+    summary = StreamingSummary(**kwargs)
+    for chunk in chunks:
+        summary.update(chunk)
+    return summary.tabular_summary(style=style)
@@ -1,7 +1,9 @@
 import pandas as pd
 import numpy as np
 from .visualization import VisualizationBase
-from typing import Optional, List, Dict
+from .profile import DataProfile
+from .tracing import traced
+from typing import Optional, List, Dict, Any, Callable
 
 class SummaryGenerator(VisualizationBase):
     """
@@ -9,15 +11,16 @@ class SummaryGenerator(VisualizationBase):
     Inherits from VisualizationBase.
     """
 
-    def __init__(self, data: pd.DataFrame, theme: str = 'default'):
+    def __init__(self, data: pd.DataFrame, theme: str = 'default', profile: Optional[DataProfile] = None):
         """
         Initializes the SummaryGenerator.
         
         Args:
             data: The pandas DataFrame.
             theme: The visual theme string (passed to the base class).
+            profile: Optional shared DataProfile (passed to the base class).
         """
-        super().__init__(data, theme)
+        super().__init__(data, theme, profile)
 
     def render(self, style: str = 'full') -> pd.DataFrame:
         """
@@ -28,70 +31,118 @@ class SummaryGenerator(VisualizationBase):
         # Call the primary method of this class
         return self.tabular_summary(style=style)
     
+    @traced('summary')
     def tabular_summary(self, style: str = 'full') -> pd.DataFrame:
         """
         Generates a comprehensive statistical summary of the data.
         """
         df = self._data
-        
+        profile = self._profile
+
         # Helper function to get summary stats for numeric columns
         def get_numeric_summary(data: pd.DataFrame) -> pd.DataFrame:
-            stats = data.describe(include=[np.number], numeric_only=True).T
-            stats['missing'] = data.isnull().sum()
-            stats['% missing'] = (stats['missing'] / len(data)) * 100
-            stats['skew'] = data.skew(numeric_only=True)
-            stats['kurtosis'] = data.kurtosis(numeric_only=True)
-            return stats[['count', 'missing', '% missing', 'mean', 'std', 'min', 'max', 'skew', 'kurtosis']]
+            return numeric_table(profile.numeric_moments(), len(data))
 
         # Helper function to get summary stats for categorical columns
         def get_categorical_summary(data: pd.DataFrame) -> pd.DataFrame:
-            data_non_numeric = data.select_dtypes(exclude=[np.number, 'datetime'])
-            stats = pd.DataFrame(data_non_numeric.dtypes, columns=['DType'])
-            stats['count'] = data_non_numeric.count()
-            stats['missing'] = data_non_numeric.isnull().sum()
-            stats['% missing'] = (stats['missing'] / len(data)) * 100
-            stats['unique'] = data_non_numeric.nunique()
-            
-            # Handle empty DataFrame case for mode/top_value
-            if not data_non_numeric.empty:
-                stats['top_value'] = data_non_numeric.mode().iloc[0]
-                # Safely get the max frequency (mode count)
-                stats['top_freq'] = data_non_numeric.apply(lambda x: x.value_counts().max() if not x.empty else 0)
-            else:
-                stats['top_value'] = np.nan
-                stats['top_freq'] = 0
-
-            return stats
-        
-        # === Missing Logic: Combine and Return the Summaries ===
+            cols = profile.non_numeric_columns()
+            counts = list(profile.categorical_summary(cols).values())
+            return categorical_table(data[cols].dtypes, counts, len(data))
+
+        return assemble_summary(style, lambda: get_numeric_summary(df), lambda: get_categorical_summary(df))
+
+
+# --- Table builders (shared with the streaming summary) ---
+
+NUMERIC_SUMMARY_COLUMNS = ['count', 'missing', '% missing', 'mean', 'std', 'min', 'max', 'skew', 'kurtosis']
+
+
+def numeric_table(moments: Dict[Any, Dict[str, float]], n_rows: int) -> pd.DataFrame:
+    """
+    Builds the numeric summary table from per-column moment dictionaries.
+
+    Args:
+        moments: Mapping of column name to its statistics (see `stats.numeric_moments`).
+        n_rows: Total number of rows, used for '% missing'.
+
+    Returns:
+        Numeric summary DataFrame indexed by column name.
+    """
+    stats = pd.DataFrame.from_dict(moments, orient='index', columns=NUMERIC_SUMMARY_COLUMNS)
+    stats['missing'] = stats['missing'].astype('int64')
+    stats['% missing'] = (stats['missing'] / n_rows) * 100
+    return stats
+
+
+def categorical_table(dtypes: pd.Series, counts: List[Dict[str, Any]], n_rows: int) -> pd.DataFrame:
+    """
+    Builds the categorical summary table.
+
+    Args:
+        dtypes: Column dtypes, indexed by column name.
+        counts: One dictionary per column with 'missing', 'unique', 'top_value'
+                and 'top_freq' (see `stats.categorical_counts`).
+        n_rows: Total number of rows.
+
+    Returns:
+        Categorical summary DataFrame indexed by column name.
+    """
+    stats = pd.DataFrame(dtypes, columns=['DType'])
+    missing = np.array([c['missing'] for c in counts], dtype='int64')
+    stats['count'] = n_rows - missing
+    stats['missing'] = missing
+    stats['% missing'] = (stats['missing'] / n_rows) * 100
+    stats['unique'] = [c['unique'] for c in counts]
+    
+    # Handle empty DataFrame case for mode/top_value
+    if counts:
+        stats['top_value'] = [c['top_value'] for c in counts]
+        stats['top_freq'] = [c['top_freq'] for c in counts]
+    else:
+        stats['top_value'] = np.nan
+        stats['top_freq'] = 0
+
+    return stats
+
+
+def assemble_summary(style: str,
+                     get_numeric_summary: Callable[[], pd.DataFrame],
+                     get_categorical_summary: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """
+    Returns the numeric, categorical or combined ('full') summary table.
+
+    The table builders are passed as callables so only the requested parts
+    are computed.
+    """
+    # === Missing Logic: Combine and Return the Summaries ===
+    
+    if style == 'numeric':
+        return get_numeric_summary()
+    
+    if style == 'categorical':
+        return get_categorical_summary()
+    
+    if style == 'full':
+        numeric_df = get_numeric_summary()
+        categorical_df = get_categorical_summary()
+
+        # Prepare categorical_df for concatenation by aligning columns
+        # DType is only present in categorical summary, so we add the numeric features as NaN
+        for col in numeric_df.columns:
+            if col not in categorical_df.columns:
+                categorical_df[col] = np.nan
         
-        if style == 'numeric':
-            return get_numeric_summary(df)
+        # Reset index to treat feature names as a column for concatenation
+        numeric_df = numeric_df.reset_index(names=['Feature'])
+        categorical_df = categorical_df.reset_index(names=['Feature'])
+
+        # Concatenate and re-set 'Feature' as the index
+        full_summary = pd.concat([numeric_df, categorical_df], ignore_index=True)
         
-        if style == 'categorical':
-            return get_categorical_summary(df)
+        # Remove duplicate 'DType' column if it was inadvertently created in numeric_df
+        if 'DType' in full_summary.columns and full_summary['DType'].isnull().all():
+             full_summary = full_summary.drop(columns=['DType'])
         
-        if style == 'full':
-            numeric_df = get_numeric_summary(df)
-            categorical_df = get_categorical_summary(df)
-
-            # Prepare categorical_df for concatenation by aligning columns
-            # DType is only present in categorical summary, so we add the numeric features as NaN
-            for col in numeric_df.columns:
-                if col not in categorical_df.columns:
-                    categorical_df[col] = np.nan
-            
-            # Reset index to treat feature names as a column for concatenation
-            numeric_df = numeric_df.reset_index(names=['Feature'])
-            categorical_df = categorical_df.reset_index(names=['Feature'])
-
-            # Concatenate and re-set 'Feature' as the index
-            full_summary = pd.concat([numeric_df, categorical_df], ignore_index=True)
-            
-            # Remove duplicate 'DType' column if it was inadvertently created in numeric_df
-            if 'DType' in full_summary.columns and full_summary['DType'].isnull().all():
-                 full_summary = full_summary.drop(columns=['DType'])
-            
-            return full_summary.set_index('Feature')
-
-        raise ValueError("Style must be 'full', 'numeric', or 'categorical'.")
+        return full_summary.set_index('Feature')
+
+    raise ValueError("Style must be 'full', 'numeric', or 'categorical'.")
@@ -0,0 +1,269 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, List, Dict, Any, Callable
+
+# The trace being recorded in the current context (None: instrumentation off)
+_ACTIVE: ContextVar[Optional['Trace']] = ContextVar('plotease_trace', default=None)
+
+
+class Span:
+    """
+    One timed stage of a trace.
+
+    Attributes:
+        name (str): Stage name, e.g. 'validate', 'moments', 'create_correlations'.
+        category (str): Stage group: 'validate', 'stats', 'panel', 'layout', 'save', ...
+        start (float): Seconds since the trace started.
+        wall (float): Wall-clock seconds.
+        cpu (float): CPU seconds of the recording thread.
+        peak_bytes (int): Peak traced allocations above the level at the start
+            of the stage (None unless the trace records memory).
+        depth (int): Nesting level (0 = outermost).
+        parent (int): Index of the enclosing span in `Trace.spans`, or -1.
+        thread (int): Identifier of the thread that ran the stage.
+        args (dict): Extra details given to `stage()`.
+    """
+
+    __slots__ = ('name', 'category', 'start', 'wall', 'cpu', 'peak_bytes',
+                 'depth', 'parent', 'thread', 'args')
+
+    def __init__(self, name: str, category: str, start: float, depth: int, parent: int,
+                 thread: int, args: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak_bytes = None
+        self.depth = depth
+        self.parent = parent
+        self.thread = thread
+        self.args = args
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"Span('{self.name}', wall={self.wall * 1000:.2f}ms, cpu={self.cpu * 1000:.2f}ms)"
+
+
+class Trace:
+    """
+    Structured record of the stages run while it was active (see `tracing`).
+
+    Spans are kept in start order with their nesting, so a slow report can be
+    broken down into validation, statistics, individual panels, layout and
+    file encoding. Export with `to_json` or `to_chrome_trace` (viewable in
+    chrome://tracing or Perfetto).
+
+    Attributes:
+        spans (List[Span]): Recorded stages, in start order.
+        memory (bool): Whether peak allocations are recorded.
+    """
+
+    def __init__(self, memory: bool = False):
+        self.spans: List[Span] = []
+        self.memory = memory
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> List[list]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def _record(self, name: str, category: str, args: Dict[str, Any]):
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        with self._lock:
+            index = len(self.spans)
+            span = Span(name, category, time.perf_counter() - self._origin, len(stack),
+                        parent[0] if parent else -1, threading.get_ident(), args)
+            self.spans.append(span)
+
+        # Each frame is [span index, base allocation level, highest peak seen]
+        frame = [index, 0, 0]
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if parent:
+                parent[2] = max(parent[2], peak)
+            tracemalloc.reset_peak()
+            frame[1] = frame[2] = current
+        stack.append(frame)
+        cpu, wall = time.thread_time(), time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.wall = time.perf_counter() - wall
+            span.cpu = time.thread_time() - cpu
+            stack.pop()
+            if self.memory:
+                peak = max(frame[2], tracemalloc.get_traced_memory()[1])
+                span.peak_bytes = peak - frame[1]
+                if parent:
+                    parent[2] = max(parent[2], peak)
+                tracemalloc.reset_peak()
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """
+        Time per stage name, summed over its occurrences.
+
+        Returns:
+            Mapping of stage name to 'count', 'wall', 'self' (wall time not
+            spent in nested stages), 'cpu' and 'peak_bytes' (largest peak).
+        """
+        nested = [0.0] * len(self.spans)
+        for span in self.spans:
+            if span.parent >= 0:
+                nested[span.parent] += span.wall
+        result: Dict[str, Dict[str, float]] = {}
+        for span, children in zip(self.spans, nested):
+            entry = result.setdefault(span.name, {'category': span.category, 'count': 0, 'wall': 0.0,
+                                                  'self': 0.0, 'cpu': 0.0, 'peak_bytes': None})
+            entry['count'] += 1
+            entry['wall'] += span.wall
+            entry['self'] += span.wall - children
+            entry['cpu'] += span.cpu
+            if span.peak_bytes is not None:
+                entry['peak_bytes'] = max(entry['peak_bytes'] or 0, span.peak_bytes)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The trace as plain data: every span plus the per-stage totals."""
+        return {'memory': self.memory,
+                'spans': [span.to_dict() for span in self.spans],
+                'totals': self.totals()}
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """
+        Serializes the trace (see `to_dict`) to JSON. Span arguments JSON
+        cannot encode (NumPy scalars, dtypes) are written as strings.
+
+        Args:
+            path: Optional file to write.
+
+        Returns:
+            The JSON text.
+        """
+        text = json.dumps(self.to_dict(), indent=2, default=str)
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        return text
+
+    def to_chrome_trace(self, path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Converts the trace to the Chrome Trace Event format (complete 'X' events).
+
+        Args:
+            path: Optional .json file to write, loadable in chrome://tracing or Perfetto.
+
+        Returns:
+            The trace-event document.
+        """
+        pid = os.getpid()
+        events = [{
+            'name': span.name,
+            'cat': span.category,
+            'ph': 'X',
+            'ts': span.start * 1e6,
+            'dur': span.wall * 1e6,
+            'pid': pid,
+            'tid': span.thread,
+            'args': {'cpu_ms': span.cpu * 1000, 'peak_bytes': span.peak_bytes, **span.args},
+        } for span in self.spans]
+        document = {'traceEvents': events, 'displayTimeUnit': 'ms'}
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(document, f, default=str)
+        return document
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def __repr__(self) -> str:
+        return f"Trace(spans={len(self.spans)}, memory={self.memory})"
+
+
+@contextmanager
+def tracing(memory: bool = False):
+    """
+    Records the stages PlotEase runs inside the block.
+
+    Instrumentation is off by default and costs one context-variable lookup
+    per stage; it is only switched on here. Threads started inside the block
+    are not traced unless they run in a copy of its context.
+
+    Example:
+        >>> with tracing(memory=True) as trace:
+        ...     pe.autoplot(target='price')
+        >>> trace.totals()['create_correlations']
+        >>> trace.to_chrome_trace('autoplot_trace.json')
+
+    Args:
+        memory: Also record peak allocations per stage with `tracemalloc`
+                (which slows Python code down noticeably).
+
+    Yields:
+        The Trace being recorded.
+    """
+    trace = Trace(memory=memory)
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    token = _ACTIVE.set(trace)
+    try:
+        yield trace
+    finally:
+        _ACTIVE.reset(token)
+        if started:
+            tracemalloc.stop()
+
+
+@contextmanager
+def stage(name: str, category: str = 'stage', **args):
+    """
+    Marks a block as a named stage of the active trace (no-op when not tracing).
+
+    Args:
+        name: Stage name.
+        category: Stage group.
+        **args: Extra details stored with the span (e.g. the column).
+    """
+    trace = _ACTIVE.get()
+    if trace is None:
+        yield
+        return
+    with trace._record(name, category, args):
+        yield
+
+
+def traced(category: str, name: Optional[str] = None) -> Callable:
+    """
+    Decorator recording every call of a function as a stage.
+
+    Args:
+        category: Stage group.
+        name: Stage name (default: the function's name).
+    """
+    def decorate(fn: Callable) -> Callable:
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            trace = _ACTIVE.get()
+            if trace is None:
+                return fn(*args, **kwargs)
+            with trace._record(label, category, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Tuple, Optional
+from .sketches import quantile_summary
+from .correlation import CorrelationEngine, DEFAULT_BLOCK_SIZE
 
 # DATA VALIDATION HELPERS
 
@@ -118,18 +120,18 @@ def remove_missing_values(data: pd.DataFrame, threshold: float = 0.5) -> pd.Data
     return data[columns_to_keep]
 
 
-def detect_outliers_iqr(data: pd.Series) -> pd.Series:
+def detect_outliers_iqr(data: pd.Series, method: str = 'exact') -> pd.Series:
     """
     Detect outliers using IQR method
     
     Args:
         data: Series to analyze
+        method: Quantile backend, 'exact' or 'sketch' (approximate, no sort)
     
     Returns:
         Boolean Series indicating outliers
     """
-    Q1 = data.quantile(0.25)
-    Q3 = data.quantile(0.75)
+    Q1, Q3 = quantile_summary(data, method=method).quantiles([0.25, 0.75])
     IQR = Q3 - Q1
     
     lower_bound = Q1 - 1.5 * IQR
@@ -138,72 +140,210 @@ def detect_outliers_iqr(data: pd.Series) -> pd.Series:
     return (data < lower_bound) | (data > upper_bound)
 
 
+# MEMORY HELPERS
+
+# Integer types tried, smallest first, when downcasting
+_SIGNED_INTS = (np.int8, np.int16, np.int32)
+_UNSIGNED_INTS = (np.uint8, np.uint16, np.uint32)
+
+
+def optimize_memory(data: pd.DataFrame, category_threshold: float = 0.5,
+                    downcast: bool = True, arrow_strings: bool = False) -> pd.DataFrame:
+    """
+    Return a memory-compact version of a DataFrame holding the same values
+    
+    - integer columns are downcast to the smallest type that holds their range;
+    - float64 columns become float32 when that is exact for every value;
+    - text columns with few distinct values become 'category', so later
+      value counts, cardinality and grouping work on integer codes instead
+      of Python strings;
+    - with `arrow_strings`, the remaining text columns become Arrow-backed
+      strings.
+    
+    Args:
+        data: DataFrame to compact
+        category_threshold: Largest ratio of distinct values to rows for a
+                            text column to become 'category'
+        downcast: Whether to downcast numeric columns
+        arrow_strings: Convert other text columns to Arrow strings (requires pyarrow)
+    
+    Returns:
+        Compacted DataFrame (unchanged columns are shared, not copied)
+    
+    Raises:
+        ImportError: If `arrow_strings` is set and pyarrow is not installed
+    """
+    if arrow_strings:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError("arrow_strings=True requires pyarrow (pip install pyarrow)") from e
+    
+    result = data.copy(deep=False)
+    for i in range(len(data.columns)):
+        column = data.iloc[:, i]
+        compact = _compact_column(column, category_threshold, downcast, arrow_strings)
+        if compact is not column:
+            result.isetitem(i, compact)
+    return result
+
+
+def _compact_column(column: pd.Series, category_threshold: float,
+                    downcast: bool, arrow_strings: bool) -> pd.Series:
+    """The column in its most compact lossless dtype (the column itself if none is smaller)."""
+    dtype = column.dtype
+    if not isinstance(dtype, np.dtype):
+        if isinstance(dtype, pd.CategoricalDtype) or not pd.api.types.is_string_dtype(dtype):
+            return column
+    elif dtype.kind in 'iu':
+        if not downcast or len(column) == 0:
+            return column
+        low, high = column.min(), column.max()
+        for candidate in (_UNSIGNED_INTS if dtype.kind == 'u' else _SIGNED_INTS):
+            info = np.iinfo(candidate)
+            if np.dtype(candidate).itemsize < dtype.itemsize and info.min <= low and high <= info.max:
+                return column.astype(candidate)
+        return column
+    elif dtype == np.float64:
+        if not downcast:
+            return column
+        values = column.to_numpy()
+        narrow = values.astype(np.float32)
+        if np.array_equal(narrow, values, equal_nan=True):
+            return pd.Series(narrow, index=column.index, name=column.name)
+        return column
+    elif dtype != object:
+        return column
+    
+    # Text (or other object) columns
+    try:
+        codes, uniques = pd.factorize(column)
+    except TypeError:
+        # Unhashable values (lists, dicts) stay as they are
+        return column
+    if len(uniques) <= category_threshold * len(column):
+        return pd.Series(pd.Categorical.from_codes(codes, categories=uniques),
+                         index=column.index, name=column.name)
+    if arrow_strings and pd.api.types.infer_dtype(uniques, skipna=True) == 'string':
+        return column.astype(pd.StringDtype('pyarrow'))
+    return column
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compare the memory footprint of two versions of the same DataFrame
+    
+    Args:
+        before: Original DataFrame
+        after: Compacted DataFrame (e.g. from `optimize_memory`)
+    
+    Returns:
+        DataFrame with, per column, the dtypes and deep memory usage (bytes)
+        before and after and the bytes saved, plus a 'Total' row
+    """
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str),
+        'dtype_after': after.dtypes.astype(str),
+        'bytes_before': before.memory_usage(deep=True, index=False),
+        'bytes_after': after.memory_usage(deep=True, index=False),
+    })
+    report.loc['Total'] = ['', '', report['bytes_before'].sum(), report['bytes_after'].sum()]
+    report['bytes_saved'] = report['bytes_before'] - report['bytes_after']
+    report['% saved'] = (report['bytes_saved'] / report['bytes_before'].where(report['bytes_before'] > 0) * 100).fillna(0.0)
+    return report
+
+
 # STATISTICAL HELPERS
 
-def calculate_statistics(data: pd.Series) -> Dict[str, float]:
+def calculate_statistics(data: pd.Series, method: str = 'exact') -> Dict[str, float]:
     """
     Calculate comprehensive statistics for a series
     
     Args:
         data: Series to analyze
+        method: Quantile backend for median/q1/q3, 'exact' or 'sketch'
     
     Returns:
         Dictionary of statistics
     """
+    q1, median, q3 = quantile_summary(data, method=method).quantiles([0.25, 0.5, 0.75])
     return {
         'count': data.count(),
         'mean': data.mean(),
-        'median': data.median(),
+        'median': median,
         'std': data.std(),
         'min': data.min(),
         'max': data.max(),
-        'q1': data.quantile(0.25),
-        'q3': data.quantile(0.75),
+        'q1': q1,
+        'q3': q3,
         'skewness': data.skew(),
         'kurtosis': data.kurtosis()
     }
 
 
-def calculate_correlation_matrix(data: pd.DataFrame, method: str = 'pearson') -> pd.DataFrame:
+def calculate_correlation_matrix(data: pd.DataFrame, method: str = 'pearson',
+                                 block_size: int = DEFAULT_BLOCK_SIZE,
+                                 dtype=np.float64) -> pd.DataFrame:
     """
     Calculate correlation matrix for numeric columns
     
+    Computed by the blocked correlation engine (see `correlation.CorrelationEngine`),
+    with pairwise-complete handling of missing values like `DataFrame.corr`.
+    
     Args:
         data: DataFrame with numeric columns
         method: Correlation method ('pearson', 'spearman', 'kendall')
+        block_size: Columns per block of the matrix products (bounds memory)
+        dtype: np.float64, or np.float32 for less memory and faster products
     
     Returns:
         Correlation matrix
     """
     numeric_data = data.select_dtypes(include=[np.number])
-    return numeric_data.corr(method=method)
+    return CorrelationEngine(numeric_data, method=method, block_size=block_size, dtype=dtype).matrix()
 
 
-def find_highly_correlated_pairs(data: pd.DataFrame, threshold: float = 0.8) -> List[Tuple[str, str, float]]:
+def find_highly_correlated_pairs(data: pd.DataFrame, threshold: float = 0.8,
+                                 block_size: Optional[int] = None) -> List[Tuple[str, str, float]]:
     """
     Find pairs of highly correlated variables
     
     Args:
         data: DataFrame to analyze
         threshold: Correlation threshold
+        block_size: If given, correlations are computed `block_size` columns at a
+                    time and only the pairs above the threshold are kept, so the
+                    full correlation matrix is never held in memory (for very
+                    wide data)
     
     Returns:
-        List of tuples (var1, var2, correlation)
-    """
-    corr_matrix = calculate_correlation_matrix(data)
-    
-    # Get upper triangle to avoid duplicates
-    upper_triangle = np.triu(np.ones(corr_matrix.shape), k=1).astype(bool)
-    corr_matrix = corr_matrix.where(upper_triangle)
-    
-    high_corr = []
-    for col in corr_matrix.columns:
-        for idx in corr_matrix.index:
-            value = corr_matrix.loc[idx, col]
-            if not pd.isna(value) and abs(value) >= threshold:
-                high_corr.append((idx, col, value))
-    
-    return sorted(high_corr, key=lambda x: abs(x[2]), reverse=True)
+        List of tuples (var1, var2, correlation), strongest first
+    """
+    if block_size is None:
+        corr_matrix = calculate_correlation_matrix(data)
+        columns = corr_matrix.columns
+        values = corr_matrix.to_numpy()
+        rows, cols = np.triu_indices(len(columns), k=1)
+        corr = values[rows, cols]
+        keep = np.abs(corr) >= threshold
+        rows, cols, corr = rows[keep], cols[keep], corr[keep]
+    else:
+        engine = CorrelationEngine(data.select_dtypes(include=[np.number]), block_size=block_size)
+        columns = engine.columns
+        found = []
+        for r, c, block in engine.blocks():
+            i, j = np.nonzero(np.abs(block) >= threshold)
+            i, j = i + r, j + c
+            upper = j > i
+            found.append((i[upper], j[upper], block[i[upper] - r, j[upper] - c]))
+        rows, cols, corr = (np.concatenate(parts) for parts in zip(*found)) if found else ([], [], [])
+        rows, cols, corr = np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp), np.asarray(corr)
+    
+    # Column-major pair order, then strongest first (stable, so ties keep that order)
+    order = np.lexsort((rows, cols))
+    order = order[np.argsort(-np.abs(corr[order]), kind='stable')]
+    return [(columns[i], columns[j], corr_value)
+            for i, j, corr_value in zip(rows[order], cols[order], corr[order])]
 
 
 # FORMATTING HELPERS
@@ -323,20 +463,23 @@ def get_theme_colors(theme: str) -> Dict[str, str]:
 # DATA GENERATION HELPERS (FOR TESTING)
 
 
-def generate_sample_data(n_rows: int = 100, seed: int = 42) -> pd.DataFrame:
+def generate_sample_data(n_rows: int = 100, seed: int = 42, n_columns: int = 6) -> pd.DataFrame:
     """
     Generate sample data for testing
     
     Args:
         n_rows: Number of rows
         seed: Random seed
+        n_columns: Number of columns. Beyond the six base columns, numeric
+                   'feature_<i>' columns are added; every odd one is strongly
+                   correlated with the one before it.
     
     Returns:
         Sample DataFrame
     """
     np.random.seed(seed)
     
-    return pd.DataFrame({
+    data = pd.DataFrame({
         'age': np.random.randint(20, 70, n_rows),
         'salary': np.random.randint(30000, 150000, n_rows),
         'experience': np.random.randint(0, 30, n_rows),
@@ -344,6 +487,14 @@ def generate_sample_data(n_rows: int = 100, seed: int = 42) -> pd.DataFrame:
         'performance': np.random.choice(['Low', 'Medium', 'High'], n_rows),
         'satisfaction': np.random.uniform(1, 10, n_rows)
     })
+    n_features = max(n_columns - len(data.columns), 0)
+    if n_features:
+        # One (columns x rows) block, so each feature is a contiguous array
+        features = np.random.standard_normal((n_features, n_rows))
+        features[1::2] = 0.9 * features[0:n_features - 1:2] + 0.3 * features[1::2]
+        data = pd.concat([data, pd.DataFrame(
+            {f'feature_{i}': features[i] for i in range(n_features)})], axis=1)
+    return data
 
 
 def generate_model_results(n_models: int = 3, seed: int = 42) -> Dict[str, Dict[str, float]]:
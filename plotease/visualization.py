@@ -1,9 +1,11 @@
 # Necessary imports for the base class
 import pandas as pd
-import matplotlib.pyplot as plt
 from abc import ABC, abstractmethod
 from typing import Optional, List, Dict, Union
 import warnings
+from .profile import DataProfile, _copy_on_write
+from .rendering import themed
+from .tracing import traced
 # Note: The original code included numpy and seaborn imports that are not strictly
 # used in the base class, but we'll include the ones essential for its methods.
 
@@ -22,9 +24,10 @@ class VisualizationBase(ABC):
     Attributes:
         _data (pd.DataFrame): The protected attribute holding the data to be visualized.
         _theme (str): The protected attribute holding the name of the active visualization theme.
+        _profile (DataProfile): Shared, lazily populated per-column statistics cache.
     """
 
-    def __init__(self, data: pd.DataFrame, theme: str = 'default'):
+    def __init__(self, data: pd.DataFrame, theme: str = 'default', profile: Optional[DataProfile] = None):
         """
         Initializes the base visualization component with data and a theme.
 
@@ -32,6 +35,8 @@ class VisualizationBase(ABC):
             data: The pandas DataFrame containing the data to be plotted.
             theme: The visual theme to apply. Supported built-in themes include
                    'default', 'minimal', 'dark', and 'colorful'.
+            profile: An existing DataProfile for `data` to share statistics with
+                     other components. A private one is created if omitted.
 
         Raises:
             TypeError: If `data` is not a pandas DataFrame.
@@ -39,9 +44,14 @@ class VisualizationBase(ABC):
         """
         self._data = data  # Protected attribute (encapsulation)
         self._theme = theme  # Protected attribute
-        self._validate_data()
-        self._apply_theme() # Apply the theme immediately upon initialization
-
+        # A profile already built for this very frame means its owner (e.g. the
+        # PlotEase facade) has validated it: components skip the second check
+        if profile is None or profile.data is not data:
+            self._validate_data()
+        self._profile = profile if profile is not None else DataProfile(data)
+        # The theme's rcParams are resolved on first plot (see theme_context)
+
+    @traced('validate', 'validate_data')
     def _validate_data(self) -> bool:
         """
         Protected method to validate that the input data is a non-empty pandas DataFrame.
@@ -53,35 +63,48 @@ class VisualizationBase(ABC):
         return True
 
     # Getter and Setter methods (Encapsulation)
-    def get_data(self) -> pd.DataFrame:
+    def get_data(self, copy: bool = False) -> pd.DataFrame:
         """
         Retrieves the underlying pandas DataFrame used for visualization.
+
+        No data is copied by default: under pandas Copy-on-Write the returned
+        frame shares memory with the internal one and is only copied, lazily
+        and per column, if the caller modifies it, so the component's data can
+        never be changed through it. Without Copy-on-Write (pandas < 3 with
+        the option off) a deep copy is returned instead.
+
+        Args:
+            copy: If True, always return an independent deep copy right away.
         """
-        return self._data.copy()
+        if copy or not _copy_on_write():
+            return self._data.copy()
+        return self._data.copy(deep=False)
+
+    def set_data(self, data: pd.DataFrame):
+        """
+        Replaces the underlying DataFrame and invalidates cached statistics.
+        """
+        self._data = data
+        self._validate_data()
+        if self._profile.data is not data:
+            self._profile.set_data(data)
 
     def set_theme(self, theme: str):
         """
-        Sets a new visualization theme and immediately applies it.
+        Sets a new visualization theme, used by every subsequent plot.
         """
         self._theme = theme
-        self._apply_theme()
 
-
-    def _apply_theme(self):
-        """
-        Protected method to map the internal theme name to a Matplotlib style
-        and apply the style globally.
+    def theme_context(self):
         """
-        themes = {
-            'default': 'seaborn-v0_8-darkgrid',
-            'minimal': 'seaborn-v0_8-whitegrid',
-            'dark': 'dark_background',
-            'colorful': 'seaborn-v0_8-bright'
-        }
+        Context manager applying this component's theme to the figures created
+        inside it, and restoring the previous rcParams afterwards.
 
-        # Get the corresponding Matplotlib style name, defaulting if the theme is unknown
-        style_name = themes.get(self._theme, 'default')
-        plt.style.use(style_name)
+        The theme's style is resolved once per theme and process, on first
+        use, so components that never plot never import matplotlib. Unknown
+        themes fall back to Matplotlib's 'default' style.
+        """
+        return themed(self._theme)
 
     @abstractmethod
     def render(self):
@@ -106,12 +129,29 @@ class VisualizationBase(ABC):
         Implements the equality operator (==) for VisualizationBase objects.
 
         Two objects are considered equal if they are instances of the base class
-        and their underlying dataframes and themes are identical.
+        and their underlying dataframes and themes are identical. Data is
+        compared through the profiles' cached content fingerprints, so only
+        the first comparison of an object hashes its data; later ones are O(1).
         """
         if not isinstance(other, VisualizationBase):
             return False
-        # pd.DataFrame.equals() compares data, index, and column names
-        return self._data.equals(other._data) and self._theme == other._theme
+        return self._theme == other._theme and self._same_data(other)
+
+    def __hash__(self) -> int:
+        """
+        Hashes theme and data fingerprint, consistent with `__eq__`, so
+        components can be used in sets and as dictionary keys. The hash
+        changes with `set_data()` / `set_theme()`.
+        """
+        return hash((self._theme, self._profile.fingerprint()))
+
+    def _same_data(self, other: 'VisualizationBase') -> bool:
+        """Equality of the underlying data (same index, columns, dtypes and values)."""
+        if self._data is other._data:
+            return True
+        if self._data.shape != other._data.shape:
+            return False
+        return self._profile.fingerprint() == other._profile.fingerprint()
 
     def __len__(self) -> int:
         """
@@ -32,6 +32,12 @@ setup(
     
     # Dependencies
     install_requires=read_requirements(),
+    extras_require={
+        # Parquet / Arrow ingestion (DataSource, PlotEase.from_parquet)
+        'arrow': ['pyarrow>=10.0.0'],
+        # Test suite, including the Parquet paths that skip without pyarrow
+        'test': ['pytest', 'pyarrow>=10.0.0'],
+    },
     
     # Package classifiers
     classifiers=[
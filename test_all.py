@@ -2,6 +2,12 @@
 COMPLETE Unit Tests for PlotEase Library - mtcars Dataset
 """
 
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
 import unittest
 import pandas as pd
 import numpy as np
@@ -12,8 +18,17 @@ from plotease import (
     SummaryGenerator, 
     ModelComparator, 
     QuickPlotter,
-    VisualizationBase
+    VisualizationBase,
+    StreamingSummary,
+    summarize_chunks,
+    render_batch,
+    DataSource,
+    ColumnCache,
+    ResultCache
 )
+from plotease import stats, utils
+from plotease.sketches import KLLSketch, quantile_summary
+from plotease.reduction import stratified_sample
 
 
 def load_mtcars():
@@ -384,6 +399,1412 @@ class TestIntegration(unittest.TestCase):
             self.assertIn(col, self.mtcars.columns)
 
 
+# TEST 11: SHARED DATA PROFILE
+
+class TestDataProfile(unittest.TestCase):
+    """Test the column statistics cache shared by PlotEase components"""
+    
+    def setUp(self):
+        self.mtcars = load_mtcars()
+    
+    def test_components_share_profile(self):
+        """Test all components use the facade's profile"""
+        pe = PlotEase(self.mtcars)
+        self.assertIs(pe._diagnostic._profile, pe._profile)
+        self.assertIs(pe._summary._profile, pe._profile)
+        self.assertIs(pe._plotter._profile, pe._profile)
+    
+    def test_moments_match_pandas(self):
+        """Test cached moments agree with pandas"""
+        pe = PlotEase(self.mtcars)
+        summary = pe.tabular_summary(style='numeric')
+        self.assertAlmostEqual(summary.loc['mpg', 'mean'], self.mtcars['mpg'].mean())
+        self.assertAlmostEqual(summary.loc['mpg', 'skew'], self.mtcars['mpg'].skew())
+        self.assertAlmostEqual(summary.loc['mpg', 'kurtosis'], self.mtcars['mpg'].kurtosis())
+    
+    def test_set_data_invalidates(self):
+        """Test replacing the data drops stale statistics"""
+        pe = PlotEase(self.mtcars)
+        self.assertEqual(pe.tabular_summary(style='numeric').loc['mpg', 'count'], 32)
+        pe.set_data(self.mtcars.head(10))
+        self.assertEqual(pe.tabular_summary(style='numeric').loc['mpg', 'count'], 10)
+        self.assertEqual(len(pe._plotter), 10)
+    
+    def test_in_place_edit_invalidates(self):
+        """Test writing to the caller's frame in place drops that column's statistics"""
+        df = pd.DataFrame({'a': [1.0, 2.0, 3.0], 'b': [4.0, 5.0, 6.0], 'c': ['x', 'y', 'z']})
+        pe = PlotEase(df)
+        self.assertEqual(pe.tabular_summary(style='numeric').loc['a', 'mean'], 2.0)
+        b_moments = pe._profile.moments('b')
+        df['a'] = [10.0, 20.0, 30.0]
+        self.assertEqual(pe.tabular_summary(style='numeric').loc['a', 'mean'], 20.0)
+        df.loc[0, 'a'] = 40.0
+        summary = pe.tabular_summary(style='numeric')
+        self.assertEqual(summary.loc['a', 'max'], 40.0)
+        self.assertEqual(pe._profile.value_counts('c')['x'], 1)
+        df.loc[0, 'c'] = 'y'
+        self.assertEqual(pe._profile.value_counts('c')['y'], 2)
+        # Untouched columns keep their cached statistics
+        self.assertIs(pe._profile.moments('b'), b_moments)
+
+
+# TEST 12: FUSED STATISTICS KERNEL
+
+class TestFusedStatistics(unittest.TestCase):
+    """Test the single-pass statistics kernel behind tabular_summary"""
+    
+    def setUp(self):
+        self.mtcars = load_mtcars()
+        self.mtcars.loc[3, 'hp'] = np.nan
+        self.mtcars['const'] = 1.0
+        self.mtcars['offset'] = self.mtcars['wt'] + 1e9
+    
+    def test_numeric_moments_match_pandas(self):
+        """Test kernel output against pandas for NaN, constant and offset columns"""
+        cols = list(self.mtcars.columns)
+        result = pd.DataFrame(stats.numeric_moments(self.mtcars, cols)).T
+        expected = {
+            'count': self.mtcars.count(), 'mean': self.mtcars.mean(), 'std': self.mtcars.std(),
+            'min': self.mtcars.min(), 'max': self.mtcars.max(),
+            'skew': self.mtcars.skew(), 'kurtosis': self.mtcars.kurtosis(),
+        }
+        for key, values in expected.items():
+            np.testing.assert_allclose(result[key], values[cols].astype(float), rtol=1e-6, err_msg=key)
+    
+    def test_categorical_counts(self):
+        """Test cardinality, mode and top frequency from one factorize"""
+        series = pd.Series(['b', 'a', None, 'b', 'a', 'c'])
+        counts = stats.categorical_counts(series)
+        self.assertEqual(counts['unique'], 3)
+        self.assertEqual(counts['missing'], 1)
+        self.assertEqual(counts['top_value'], 'a')
+        self.assertEqual(counts['top_freq'], 2)
+    
+    def test_summary_schema(self):
+        """Test full summary keeps the numeric + categorical schema"""
+        data = self.mtcars.assign(brand=['x', 'y'] * 16)
+        summary = SummaryGenerator(data).tabular_summary(style='full')
+        self.assertEqual(list(summary.columns), [
+            'count', 'missing', '% missing', 'mean', 'std', 'min', 'max', 'skew',
+            'kurtosis', 'DType', 'unique', 'top_value', 'top_freq'
+        ])
+        self.assertEqual(summary.loc['brand', 'unique'], 2)
+
+
+# TEST 13: STREAMING SUMMARY
+
+class TestStreamingSummary(unittest.TestCase):
+    """Test chunked summaries for data larger than memory"""
+    
+    def setUp(self):
+        self.mtcars = load_mtcars()
+        self.mtcars['brand'] = ['Mazda', 'Merc', 'Fiat', 'Ford'] * 8
+        self.mtcars.loc[5, 'brand'] = None
+        self.chunks = [self.mtcars.iloc[i:i + 7] for i in range(0, 32, 7)]
+    
+    def test_matches_in_memory_summary(self):
+        """Test chunked summary equals tabular_summary on the whole frame"""
+        streamed = summarize_chunks(iter(self.chunks), style='full')
+        expected = SummaryGenerator(self.mtcars).tabular_summary(style='full')
+        self.assertEqual(list(streamed.columns), list(expected.columns))
+        numeric = ['count', 'missing', 'mean', 'std', 'min', 'max', 'skew', 'kurtosis']
+        np.testing.assert_allclose(streamed.loc['mpg', numeric].astype(float),
+                                   expected.loc['mpg', numeric].astype(float))
+        for col in ['missing', 'unique', 'top_value', 'top_freq']:
+            self.assertEqual(streamed.loc['brand', col], expected.loc['brand', col])
+    
+    def test_merge_partial_summaries(self):
+        """Test summaries from separate workers merge into one"""
+        left = StreamingSummary(seed=0)
+        right = StreamingSummary(seed=1)
+        for i, chunk in enumerate(self.chunks):
+            (left if i % 2 else right).update(chunk)
+        merged = StreamingSummary().merge(left).merge(right)
+        self.assertEqual(len(merged), 32)
+        self.assertAlmostEqual(merged.tabular_summary('numeric').loc['hp', 'mean'], self.mtcars['hp'].mean())
+        self.assertAlmostEqual(merged.quantiles('hp', [0.5])[0.5], self.mtcars['hp'].median())
+    
+    def test_schema_mismatch(self):
+        """Test ValueError when chunk columns change"""
+        summary = StreamingSummary().update(self.chunks[0])
+        with self.assertRaises(ValueError):
+            summary.update(self.chunks[1].drop(columns=['mpg']))
+    
+    def test_column_empty_in_first_chunks(self):
+        """Test a CSV column read as float64 while empty takes the type of its first values"""
+        import io
+        lines = ['id,note,score'] + [f'{i},,' for i in range(6)] + \
+                [f'{i},tag{i % 3},{i / 2}' for i in range(6, 20)]
+        text = '\n'.join(lines)
+        expected = PlotEase(pd.read_csv(io.StringIO(text))).tabular_summary()
+        result = summarize_chunks(pd.read_csv(io.StringIO(text), chunksize=4))
+        pd.testing.assert_frame_equal(result, expected.loc[result.index], check_dtype=False)
+        self.assertEqual(list(result.index), list(expected.index))
+        # Partial summaries typed apart are reconciled on merge
+        parts = [StreamingSummary().update(chunk) for chunk in pd.read_csv(io.StringIO(text), chunksize=4)]
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+        pd.testing.assert_frame_equal(merged.tabular_summary(), expected, check_dtype=False)
+    
+    def test_numeric_column_with_values_changing_type(self):
+        """Test TypeError when a column that had numbers turns to text"""
+        summary = StreamingSummary().update(pd.DataFrame({'v': [1.0, 2.0]}))
+        with self.assertRaises(TypeError):
+            summary.update(pd.DataFrame({'v': ['a', 'b']}))
+
+
+# TEST 14: QUANTILE BACKENDS
+
+class TestQuantileBackends(unittest.TestCase):
+    """Test exact and sketch quantile backends"""
+    
+    def setUp(self):
+        self.mtcars = load_mtcars()
+        self.values = pd.Series(np.random.default_rng(0).lognormal(size=200000))
+    
+    def test_exact_matches_pandas(self):
+        """Test exact backend reproduces Series.quantile"""
+        q1, q3 = quantile_summary(self.mtcars['hp'], method='exact').quantiles([0.25, 0.75])
+        self.assertAlmostEqual(q1, self.mtcars['hp'].quantile(0.25))
+        self.assertAlmostEqual(q3, self.mtcars['hp'].quantile(0.75))
+    
+    def test_exact_profile_keeps_only_values(self):
+        """Test the profile caches exact quantiles, not a copy of the column"""
+        pe = PlotEase(self.mtcars)
+        q = pe._profile.quantiles('hp', (0.25, 0.5))
+        self.assertAlmostEqual(q[0.5], self.mtcars['hp'].median())
+        stats_ = pe._profile.boxplot_stats('hp')
+        self.assertAlmostEqual(stats_['q3'], self.mtcars['hp'].quantile(0.75))
+        entry = pe._profile._columns['hp']
+        self.assertNotIn('quantile_summary', entry)
+        self.assertEqual(set(entry['quantiles']), {0.25, 0.5, 0.75})
+        
+        sketched = PlotEase(self.values.to_frame('v'), quantile_method='sketch')
+        sketched._profile.quantiles('v')
+        self.assertIn('quantile_summary', sketched._profile._columns['v'])
+    
+    def test_sketch_rank_error(self):
+        """Test KLL sketch stays within its rank error bound"""
+        sketch = KLLSketch(k=200, seed=0)
+        for chunk in np.array_split(self.values.to_numpy(), 10):
+            sketch.update(chunk)
+        for q in [0.01, 0.25, 0.5, 0.75, 0.99]:
+            rank = (self.values <= sketch.quantile(q)).mean()
+            self.assertLess(abs(rank - q), 0.02)
+    
+    def test_outliers_and_statistics(self):
+        """Test IQR outliers and q1/q3 with both backends"""
+        exact = utils.detect_outliers_iqr(self.mtcars['hp'])
+        self.assertEqual(int(exact.sum()), 1)
+        approx = utils.calculate_statistics(self.values, method='sketch')
+        self.assertAlmostEqual(approx['q1'], self.values.quantile(0.25), delta=0.02)
+        with self.assertRaises(ValueError):
+            utils.detect_outliers_iqr(self.mtcars['hp'], method='tdigest')
+    
+    def test_boxplot_stats_match_matplotlib(self):
+        """Test profile box statistics agree with matplotlib's"""
+        from matplotlib import cbook
+        pe = PlotEase(self.mtcars)
+        ours = pe._profile.boxplot_stats('hp')
+        theirs = cbook.boxplot_stats(self.mtcars['hp'].to_numpy())[0]
+        for key in ['q1', 'med', 'q3', 'whislo', 'whishi']:
+            self.assertAlmostEqual(ours[key], theirs[key])
+        self.assertEqual(len(ours['fliers']), len(theirs['fliers']))
+
+
+# TEST 15: SCATTER REDUCTION
+
+class TestScatterReduction(unittest.TestCase):
+    """Test render-side reduction of large scatter plots"""
+    
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.data = pd.DataFrame({'x': rng.normal(size=50000), 'y': rng.normal(size=50000)})
+        self.data.loc[0, ['x', 'y']] = [40.0, 40.0]  # lone outlier
+    
+    def tearDown(self):
+        import matplotlib.pyplot as plt
+        plt.close('all')
+    
+    def test_stratified_sample_keeps_outliers(self):
+        """Test sample size and that sparse cells survive"""
+        x, y = self.data['x'].to_numpy(), self.data['y'].to_numpy()
+        keep = stratified_sample(x, y, 5000, random_state=1)
+        self.assertLessEqual(abs(len(keep) - 5000), 500)
+        self.assertIn(0, keep)
+        np.testing.assert_array_equal(keep, stratified_sample(x, y, 5000, random_state=1))
+    
+    def test_reduction_noted_in_title(self):
+        """Test the title reports the applied reduction"""
+        qp = QuickPlotter(self.data)
+        fig = qp.quick_plot('x', 'y', max_points=10000, show=False)
+        self.assertIn('stratified sample', fig.axes[0].get_title())
+        fig = qp.quick_plot('x', 'y', reduction='hexbin', show=False)
+        self.assertIn('hexbin', fig.axes[0].get_title())
+        fig = qp.quick_plot('x', 'y', reduction=None, max_points=10, show=False)
+        self.assertNotIn('(', fig.axes[0].get_title())
+    
+    def test_categorical_axis_not_reduced(self):
+        """Test a forced scatter with a text axis draws the raw values"""
+        data = self.data.head(100).assign(group=np.where(np.arange(100) % 2, 'odd', 'even'))
+        fig = QuickPlotter(data).quick_plot('group', 'y', kind='scatter', max_points=10, show=False)
+        ax = fig.axes[0]
+        self.assertEqual(len(ax.collections[0].get_offsets()), 100)
+        self.assertNotIn('(', ax.get_title())
+
+
+# TEST 16: HISTOGRAM ENGINE
+
+class TestHistogramEngine(unittest.TestCase):
+    """Test pre-binned, cached histograms"""
+    
+    def setUp(self):
+        self.mtcars = load_mtcars()
+    
+    def test_counts_match_numpy(self):
+        """Test counts and edges are identical to np.histogram"""
+        pe = PlotEase(self.mtcars)
+        for col in ['mpg', 'hp', 'wt']:
+            counts, edges = pe._profile.histogram(col, bins=30)
+            expected_counts, expected_edges = np.histogram(self.mtcars[col], bins=30)
+            np.testing.assert_array_equal(counts, expected_counts)
+            np.testing.assert_allclose(edges, expected_edges)
+    
+    def test_histogram_cached_across_components(self):
+        """Test autoplot and quick_plot reuse one cached histogram"""
+        import matplotlib.pyplot as plt
+        pe = PlotEase(self.mtcars)
+        pe.autoplot(target='mpg', max_plots=4)
+        cached = pe._profile.histogram('mpg', bins=30)
+        pe.set_theme('dark')
+        pe.quick_plot('mpg', kind='hist')
+        self.assertIs(pe._profile.histogram('mpg', bins=30), cached)
+        plt.close('all')
+    
+    def test_hist_only_keywords(self):
+        """Test Axes.hist options still work on pre-binned histograms"""
+        pe = PlotEase(self.mtcars)
+        counts, _ = np.histogram(self.mtcars['mpg'], bins=30)
+        fig = pe.quick_plot('mpg', kind='hist', histtype='step', show=False)
+        self.assertEqual(len(fig.axes[0].patches), 1)
+        fig = pe.quick_plot('mpg', kind='hist', cumulative=True, density=True, show=False)
+        heights = [patch.get_height() for patch in fig.axes[0].patches]
+        self.assertAlmostEqual(heights[-1], 1.0)
+        fig = pe.quick_plot('mpg', kind='hist', orientation='horizontal', show=False)
+        widths = [patch.get_width() for patch in fig.axes[0].patches]
+        np.testing.assert_array_equal(widths, counts)
+        weights = np.full(len(self.mtcars), 2.0)
+        fig = pe.quick_plot('mpg', kind='hist', weights=weights, show=False)
+        heights = [patch.get_height() for patch in fig.axes[0].patches]
+        np.testing.assert_array_equal(heights, 2 * counts)
+    
+    def test_hist_of_text_and_dates(self):
+        """Test histograms of categorical and datetime columns keep their axis units"""
+        data = pd.DataFrame({
+            'department': ['Sales', 'IT', 'IT', 'HR', None, 'Sales'],
+            'day': pd.to_datetime(['2024-01-01', '2024-02-01', None, '2024-03-01', '2024-03-02', '2024-06-01']),
+        })
+        import matplotlib.dates as mdates
+        import matplotlib.pyplot as plt
+        pe = PlotEase(data)
+        fig = pe.quick_plot('department', kind='hist', show=False)
+        heights = [patch.get_height() for patch in fig.axes[0].patches]
+        self.assertEqual(sum(heights), 5)
+        labels = [tick.get_text() for tick in fig.axes[0].get_xticklabels()]
+        self.assertIn('Sales', labels)
+        
+        fig = pe.quick_plot('day', kind='hist', bins=5, show=False)
+        ax = fig.axes[0]
+        self.assertEqual(sum(patch.get_height() for patch in ax.patches), 5)
+        # Matplotlib date numbers (days), not raw nanoseconds
+        self.assertEqual(mdates.num2date(np.mean(ax.get_xlim())).year, 2024)
+        plt.close('all')
+
+
+# TEST 17: HEADLESS BATCH RENDERING
+
+class TestBatchRendering(unittest.TestCase):
+    """Test headless rendering of plots to files"""
+    
+    def setUp(self):
+        self.mtcars = load_mtcars()
+        self.tmpdir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def test_draw_on_standalone_figure(self):
+        """Test components draw on a Figure without creating pyplot figures"""
+        import matplotlib.pyplot as plt
+        from plotease.rendering import new_figure
+        plt.close('all')
+        fig = new_figure((15, 10))
+        DiagnosticPlotter(self.mtcars).draw(fig, target='mpg', max_plots=4)
+        self.assertEqual(len(fig.axes), 4 + 1)  # + heatmap colorbar
+        QuickPlotter(self.mtcars).draw(new_figure(), 'hp', 'mpg')
+        self.assertEqual(plt.get_fignums(), [])
+    
+    def test_render_batch_formats(self):
+        """Test batch rendering writes one file per job in every format"""
+        jobs = [
+            {'data': 'cars', 'target': 'mpg', 'max_plots': 4, 'name': 'sheet'},
+            {'kind': 'quick_plot', 'data': 'cars', 'x': 'hp', 'y': 'mpg', 'format': 'svg'},
+            {'kind': 'compare_models', 'format': 'pdf', 'theme': 'minimal',
+             'results': {'A': {'acc': 0.8, 'f1': 0.7, 'auc': 0.9},
+                         'B': {'acc': 0.7, 'f1': 0.75, 'auc': 0.85}}},
+        ]
+        paths = render_batch(jobs, self.tmpdir, datasets={'cars': self.mtcars}, max_workers=2)
+        self.assertEqual([os.path.basename(p) for p in paths],
+                         ['sheet.png', 'quick_plot_00001.svg', 'compare_models_00002.pdf'])
+        with open(paths[0], 'rb') as f:
+            self.assertEqual(f.read(4), b'\x89PNG')
+        with open(paths[2], 'rb') as f:
+            self.assertEqual(f.read(4), b'%PDF')
+    
+    def test_render_batch_in_process(self):
+        """Test a single worker renders in-process from a file path"""
+        csv_path = os.path.join(self.tmpdir, 'cars.csv')
+        self.mtcars.to_csv(csv_path, index=False)
+        paths = render_batch([{'kind': 'quick_plot', 'data': csv_path, 'x': 'mpg'}],
+                             self.tmpdir, max_workers=1)
+        self.assertTrue(os.path.getsize(paths[0]) > 0)
+        with self.assertRaises(ValueError):
+            render_batch([{'data': self.mtcars, 'format': 'gif'}], self.tmpdir, max_workers=1)
+    
+    def test_file_profiles_evicted_with_frames(self):
+        """Test per-file profiles are bounded like the file cache, not kept forever"""
+        from plotease import batch
+        batch._read_file.cache_clear()
+        jobs = []
+        for i in range(6):
+            path = os.path.join(self.tmpdir, f'cars{i}.csv')
+            self.mtcars.to_csv(path, index=False)
+            jobs.append({'kind': 'quick_plot', 'data': path, 'x': 'mpg', 'name': f'plot{i}'})
+        render_batch(jobs + jobs[-1:], self.tmpdir, max_workers=1)
+        info = batch._read_file.cache_info()
+        self.assertEqual((info.currsize, info.hits), (4, 1))
+        self.assertEqual(batch._SHARED_PROFILES, {})
+
+
+# TEST 18: PER-FIGURE THEMES
+
+class TestThemeContexts(unittest.TestCase):
+    """Test themes are applied per figure, not globally"""
+    
+    def setUp(self):
+        self.mtcars = load_mtcars()
+    
+    def test_construction_leaves_rcparams_alone(self):
+        """Test creating and re-theming components changes no global style"""
+        import matplotlib as mpl
+        before = dict(mpl.rcParams)
+        pe = PlotEase(self.mtcars, theme='dark')
+        pe.set_theme('minimal')
+        self.assertEqual(dict(mpl.rcParams), before)
+    
+    def test_theme_context_applies_and_restores(self):
+        """Test the theme is active inside the context only"""
+        import matplotlib as mpl
+        from plotease.rendering import new_figure
+        pe = PlotEase(self.mtcars, theme='dark')
+        facecolor = mpl.rcParams['figure.facecolor']
+        with pe.theme_context():
+            self.assertEqual(new_figure().get_facecolor()[:3], (0.0, 0.0, 0.0))
+        self.assertEqual(mpl.rcParams['figure.facecolor'], facecolor)
+    
+    def test_concurrent_themes(self):
+        """Test threads rendering different themes do not mix them up"""
+        from concurrent.futures import ThreadPoolExecutor
+        from plotease.rendering import new_figure, themed
+        
+        def draw(theme):
+            with themed(theme):
+                fig = new_figure()
+                fig.add_subplot().plot([1, 2, 3])
+                return theme, fig.get_facecolor()[:3]
+        
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(draw, ['dark', 'minimal'] * 20))
+        colors = {theme: {color for t, color in results if t == theme} for theme in ('dark', 'minimal')}
+        self.assertEqual(colors['dark'], {(0.0, 0.0, 0.0)})
+        self.assertEqual(colors['minimal'], {(1.0, 1.0, 1.0)})
+    
+    def test_statistics_computed_outside_render_lock(self):
+        """Test a thread computes its plot statistics while another one holds the render lock"""
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from plotease.rendering import RENDER_LOCK
+        data = utils.generate_sample_data(5000)
+        diagnostic, quick = PlotEase(data), PlotEase(data.copy())
+        
+        def eventually(condition):
+            deadline = time.monotonic() + 60
+            while not condition():
+                if time.monotonic() > deadline:
+                    return False
+                time.sleep(0.01)
+            return True
+        
+        with ThreadPoolExecutor(2) as executor:
+            with RENDER_LOCK:
+                autoplot = executor.submit(diagnostic.autoplot, target='salary', show=False)
+                hist = executor.submit(quick.quick_plot, 'salary', show=False)
+                self.assertTrue(eventually(lambda: 'correlations' in diagnostic._profile._frame))
+                self.assertTrue(eventually(lambda: 'histograms' in quick._profile._columns.get('salary', {})))
+                # Drawing itself waits for the lock
+                self.assertFalse(autoplot.done() or hist.done())
+            self.assertTrue(autoplot.result(timeout=60).axes)
+            self.assertEqual(len(hist.result(timeout=60).axes), 1)
+
+
+# TEST 19: ZERO-COPY DATA ACCESS
+
+class TestZeroCopyAccess(unittest.TestCase):
+    """Test get_data() shares memory without exposing the internal frame"""
+    
+    def setUp(self):
+        self.mtcars = load_mtcars()
+    
+    def test_get_data_shares_memory(self):
+        """Test the default getter does not copy the data"""
+        pe = PlotEase(self.mtcars)
+        data = pe.get_data()
+        self.assertTrue(np.shares_memory(data['mpg'].to_numpy(), self.mtcars['mpg'].to_numpy()))
+        copied = pe.get_data(copy=True)
+        self.assertFalse(np.shares_memory(copied['mpg'].to_numpy(), self.mtcars['mpg'].to_numpy()))
+    
+    def test_writes_do_not_reach_component(self):
+        """Test modifying the returned frame leaves the component's data intact"""
+        pe = PlotEase(self.mtcars)
+        data = pe.get_data()
+        data.loc[0, 'mpg'] = -1.0
+        data['new'] = 1
+        self.assertEqual(pe.get_data().loc[0, 'mpg'], 21.0)
+        self.assertNotIn('new', pe.get_data().columns)
+
+
+# TEST 20: FINGERPRINT EQUALITY
+
+class TestFingerprintEquality(unittest.TestCase):
+    """Test fingerprint-based __eq__ and __hash__"""
+    
+    def setUp(self):
+        self.mtcars = load_mtcars()
+    
+    def test_equal_content_equal_objects(self):
+        """Test equal data compares and hashes equal, as DataFrame.equals would"""
+        a = PlotEase(self.mtcars)
+        b = PlotEase(self.mtcars.copy())
+        self.assertEqual(a, b)
+        self.assertEqual(hash(a), hash(b))
+        self.assertEqual(len({a, b, PlotEase(self.mtcars, theme='dark')}), 2)
+        self.assertEqual(DiagnosticPlotter(self.mtcars), DiagnosticPlotter(self.mtcars.copy()))
+    
+    def test_different_content(self):
+        """Test a changed value, dtype, label or index makes objects unequal"""
+        base = PlotEase(self.mtcars)
+        changed = self.mtcars.copy()
+        changed.loc[3, 'mpg'] = 99.0
+        self.assertNotEqual(base, PlotEase(changed))
+        self.assertNotEqual(base, PlotEase(self.mtcars.astype({'cyl': 'float64'})))
+        self.assertNotEqual(base, PlotEase(self.mtcars.rename(columns={'mpg': 'MPG'})))
+        self.assertNotEqual(base, PlotEase(self.mtcars.set_axis(range(1, 33))))
+    
+    def test_fingerprint_cached_and_invalidated(self):
+        """Test the fingerprint is reused and refreshed after invalidate()"""
+        data = self.mtcars.copy()
+        pe = PlotEase(data)
+        first = pe._profile.fingerprint()
+        self.assertIs(pe._profile.fingerprint(), first)
+        data.loc[0, 'hp'] = 1
+        pe._profile.invalidate(['hp'])
+        self.assertNotEqual(pe._profile.fingerprint(), first)
+        self.assertNotEqual(pe, PlotEase(self.mtcars))
+    
+    def test_in_place_edit_breaks_equality(self):
+        """Test objects stop comparing equal once one frame is edited in place"""
+        data = self.mtcars.copy()
+        a, b = PlotEase(data), PlotEase(self.mtcars)
+        self.assertEqual(a, b)
+        data.loc[0, 'hp'] = 1
+        self.assertFalse(data.equals(self.mtcars))
+        self.assertNotEqual(a, b)
+    
+    def test_mixed_object_values(self):
+        """Test object values of different types are never equal by their text"""
+        first = pd.DataFrame({'v': ['1', 1]})
+        second = pd.DataFrame({'v': [1, '1']})
+        self.assertFalse(first.equals(second))
+        self.assertNotEqual(PlotEase(first), PlotEase(second))
+        self.assertEqual(PlotEase(first), PlotEase(first.copy()))
+
+
+# TEST 21: CORRELATED PAIRS
+
+class TestCorrelatedPairs(unittest.TestCase):
+    """Test vectorized and blocked search for correlated pairs"""
+    
+    def setUp(self):
+        self.mtcars = load_mtcars()
+    
+    def test_matches_pairwise_scan(self):
+        """Test result equals a scan of every pair of the correlation matrix"""
+        corr = self.mtcars.corr()
+        expected = sorted(
+            [(a, b, corr.loc[a, b]) for j, b in enumerate(corr.columns)
+             for a in corr.columns[:j] if abs(corr.loc[a, b]) >= 0.7],
+            key=lambda pair: abs(pair[2]), reverse=True)
+        result = utils.find_highly_correlated_pairs(self.mtcars, 0.7)
+        self.assertEqual([(a, b) for a, b, _ in result], [(a, b) for a, b, _ in expected])
+        np.testing.assert_allclose([v for _, _, v in result], [v for _, _, v in expected], rtol=1e-12)
+    
+    def test_blocked_mode(self):
+        """Test blocked mode finds the same pairs, with and without missing values"""
+        data = self.mtcars.copy()
+        for frame in (data, data.mask(np.eye(32, 11, dtype=bool))):
+            full = utils.find_highly_correlated_pairs(frame, 0.6)
+            blocked = utils.find_highly_correlated_pairs(frame, 0.6, block_size=3)
+            self.assertEqual({(a, b) for a, b, _ in blocked}, {(a, b) for a, b, _ in full})
+            lookup = {(a, b): v for a, b, v in full}
+            for a, b, v in blocked:
+                self.assertAlmostEqual(v, lookup[(a, b)], places=10)
+    
+    def test_wide_sample_data(self):
+        """Test scaled sample data has the requested width and correlated features"""
+        data = utils.generate_sample_data(500, n_columns=11)
+        self.assertEqual(data.shape, (500, 11))
+        pd.testing.assert_frame_equal(data.iloc[:, :6], utils.generate_sample_data(500))
+        pairs = utils.find_highly_correlated_pairs(data, 0.8)
+        self.assertEqual({(a, b) for a, b, _ in pairs},
+                         {('feature_0', 'feature_1'), ('feature_2', 'feature_3')})
+
+
+# TEST 22: CORRELATION ENGINE
+
+class TestCorrelationEngine(unittest.TestCase):
+    """Test the blocked correlation engine against DataFrame.corr"""
+    
+    def setUp(self):
+        self.mtcars = load_mtcars()
+    
+    def test_methods_match_pandas(self):
+        """Test Pearson, Spearman and Kendall equal pandas, at any block size"""
+        for method in ('pearson', 'spearman', 'kendall'):
+            for block_size in (4, 512):
+                result = utils.calculate_correlation_matrix(self.mtcars, method, block_size=block_size)
+                pd.testing.assert_frame_equal(result, self.mtcars.corr(method), atol=1e-12)
+    
+    def test_pairwise_missing_values(self):
+        """Test missing values use pairwise-complete observations"""
+        data = self.mtcars.mask(np.eye(32, 11, dtype=bool) | np.eye(32, 11, k=-5, dtype=bool))
+        for method in ('pearson', 'spearman', 'kendall'):
+            result = utils.calculate_correlation_matrix(data, method, block_size=3)
+            pd.testing.assert_frame_equal(result, data.corr(method), atol=1e-12)
+        pd.testing.assert_frame_equal(PlotEase(data)._profile.correlation_matrix(method='spearman'),
+                                      data.corr('spearman'), atol=1e-12)
+    
+    def test_float32_and_errors(self):
+        """Test float32 products stay close and unknown methods are rejected"""
+        result = utils.calculate_correlation_matrix(self.mtcars, dtype=np.float32)
+        pd.testing.assert_frame_equal(result, self.mtcars.corr(), atol=1e-5)
+        with self.assertRaises(ValueError):
+            utils.calculate_correlation_matrix(self.mtcars, 'cosine')
+    
+    def test_profile_caches_ranks_and_matrix(self):
+        """Test the profile reuses ranks across column subsets"""
+        pe = PlotEase(self.mtcars)
+        full = pe._profile.correlation_matrix(method='spearman')
+        self.assertIs(pe._profile.correlation_matrix(method='spearman'), full)
+        ranks = pe._profile.ranks('mpg')
+        subset = pe._profile.correlation_matrix(['mpg', 'hp'], method='spearman')
+        self.assertIs(pe._profile.ranks('mpg'), ranks)
+        self.assertAlmostEqual(subset.loc['mpg', 'hp'], full.loc['mpg', 'hp'])
+
+
+# TEST 23: AUTOPLOT PREVIEW
+
+class TestAutoplotPreview(unittest.TestCase):
+    """Test sampling-based preview mode of autoplot"""
+    
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.data = pd.DataFrame({
+            'x': rng.normal(size=20000),
+            'y': rng.random(20000),
+            'label': np.where(np.arange(20000) < 3, 'rare', 'common'),
+        })
+    
+    def tearDown(self):
+        import matplotlib.pyplot as plt
+        plt.close('all')
+    
+    def test_sample_positions(self):
+        """Test samples are reproducible and cover every stratum"""
+        from plotease.reduction import sample_positions, strata_codes
+        strata = strata_codes(self.data['label'])
+        first = sample_positions(20000, 500, strata, random_state=3)
+        np.testing.assert_array_equal(first, sample_positions(20000, 500, strata, random_state=3))
+        self.assertIn(len(first), (500, 501))
+        self.assertTrue((self.data['label'].iloc[first] == 'rare').any())
+        self.assertEqual(len(np.unique(first)), len(first))
+    
+    def test_sample_top_up_bounded(self):
+        """Test every rare stratum is topped up, within a bounded number of extra rows"""
+        from plotease.reduction import sample_positions, strata_codes
+        labels = pd.Series(np.where(np.arange(20000) < 5, np.arange(20000), 99).astype(str))
+        positions = sample_positions(20000, 2000, strata_codes(labels), random_state=1)
+        self.assertEqual(set(labels.iloc[positions]), set(labels))
+        
+        ids = strata_codes(pd.Series(np.arange(20000).astype(str)))
+        positions = sample_positions(20000, 500, ids, random_state=1)
+        self.assertEqual(len(positions), 550)
+        self.assertEqual(len(np.unique(positions)), len(positions))
+    
+    def test_preview_draws_sample(self):
+        """Test preview draws from a sample and says so"""
+        dp = DiagnosticPlotter(self.data)
+        fig = dp.autoplot(target='label', sample_rows=1000, show=False)
+        self.assertIsNone(dp.refinement)
+        self.assertIn('1,00', fig.get_suptitle())
+        self.assertIn('20,000', fig.get_suptitle())
+        # The full-data profile was not touched by the preview
+        self.assertNotIn('x', dp._profile._columns)
+    
+    def test_refine_in_background(self):
+        """Test refine computes the full-data statistics off the main thread"""
+        pe = PlotEase(self.data)
+        pe.autoplot(target='x', preview=True, sample_rows=1000, refine=True)
+        self.assertIs(pe.refinement.result(timeout=60), pe._diagnostic)
+        expected, _ = np.histogram(self.data['x'], bins=30)
+        np.testing.assert_array_equal(pe._profile._columns['x']['histograms'][(30, None)][0], expected)
+    
+    def test_append_waits_for_refine(self):
+        """Test the profile lock keeps background statistics and appends apart"""
+        import threading
+        dp = DiagnosticPlotter(self.data)
+        profile = dp._profile
+        with profile.lock:
+            refinement = dp.refine('x')
+            appender = threading.Thread(target=profile.append, args=(self.data.head(100),))
+            appender.start()
+            appender.join(0.2)
+            self.assertTrue(appender.is_alive())
+            self.assertFalse(refinement.done())
+            self.assertEqual(len(profile.data), 20000)
+        appender.join(60)
+        refinement.result(timeout=60)
+        
+        full = profile.data
+        self.assertEqual(len(full), 20100)
+        expected, _ = np.histogram(full['x'], bins=30)
+        np.testing.assert_array_equal(profile.histogram('x', bins=30)[0], expected)
+        self.assertAlmostEqual(profile.moments('y')['mean'], full['y'].mean())
+
+
+# TEST 24: INCREMENTAL APPEND
+
+class TestIncrementalAppend(unittest.TestCase):
+    """Test append-aware statistics for growing DataFrames"""
+    
+    def make_batch(self, n, seed):
+        rng = np.random.default_rng(seed)
+        batch = pd.DataFrame({
+            'a': rng.normal(size=n),
+            'b': rng.normal(5, 2, size=n),
+            'c': rng.choice(['x', 'y', 'z'], n),
+        })
+        batch.loc[batch.index[::7], 'b'] = np.nan
+        return batch
+    
+    def setUp(self):
+        self.pe = PlotEase(self.make_batch(1000, 1))
+        self.pe.tabular_summary()
+        self.pe._diagnostic.precompute()
+        self.batch = self.make_batch(300, 2)
+        self.batch.loc[self.batch.index[0], 'a'] = 100.0
+    
+    def test_merged_statistics_match_recompute(self):
+        """Test merged moments, counts and correlations equal a fresh profile"""
+        self.pe.append(self.batch)
+        self.assertEqual(len(self.pe), 1300)
+        fresh = PlotEase(self.pe.get_data())
+        pd.testing.assert_frame_equal(self.pe.tabular_summary(), fresh.tabular_summary())
+        pd.testing.assert_series_equal(self.pe._profile.value_counts('c'), fresh._profile.value_counts('c'))
+        pd.testing.assert_frame_equal(self.pe._profile.correlation_matrix(),
+                                      fresh._profile.correlation_matrix())
+    
+    def test_range_index_numbered_on(self):
+        """Test batches starting at 0 continue the index, as a frame loaded in one piece"""
+        first = self.pe.get_data()
+        self.pe.append(self.batch)
+        self.pe.append(self.make_batch(50, 3))
+        data = self.pe.get_data()
+        pd.testing.assert_index_equal(data.index, pd.RangeIndex(1350), exact=True)
+        pd.testing.assert_frame_equal(data.loc[1000:1299], self.batch.set_axis(range(1000, 1300)))
+        pd.testing.assert_frame_equal(data.iloc[:1000], first)
+        # Labelled indexes are kept as they are
+        pe = PlotEase(self.make_batch(10, 4).set_axis(list('abcdefghij')))
+        pe.append(self.make_batch(2, 5).set_axis(['a', 'k']))
+        self.assertEqual(list(pe.get_data().index[-2:]), ['a', 'k'])
+    
+    def test_histograms_updated_or_dropped(self):
+        """Test histograms are merged while their bins still cover the data"""
+        before = self.pe._profile._columns['b']['histograms'][(30, None)][1]
+        self.batch['b'] = self.batch['b'].clip(before[0], before[-1])
+        self.pe.append(self.batch)
+        histograms = self.pe._profile._columns
+        expected, _ = np.histogram(self.pe.get_data()['b'].dropna(), bins=30)
+        np.testing.assert_array_equal(histograms['b']['histograms'][(30, None)][0], expected)
+        # 'a' grew past its old range: its histogram is rebuilt on demand
+        self.assertNotIn((30, None), histograms['a']['histograms'])
+        expected, _ = np.histogram(self.pe.get_data()['a'], bins=30)
+        np.testing.assert_array_equal(self.pe._profile.histogram('a')[0], expected)
+    
+    def test_append_validates_columns(self):
+        """Test mismatched batches are rejected"""
+        with self.assertRaises(ValueError):
+            self.pe.append(self.batch[['a', 'b']])
+        with self.assertRaises(TypeError):
+            self.pe.append([1, 2, 3])
+        self.assertEqual(len(self.pe), 1000)
+
+
+# TEST 25: LAZY COMPONENTS
+
+class TestLazyComponents(unittest.TestCase):
+    """Test components are built on first use and plotting imports are deferred"""
+    
+    def setUp(self):
+        self.mtcars = load_mtcars()
+    
+    def test_components_created_on_demand(self):
+        """Test only the components that are used get created, once"""
+        pe = PlotEase(self.mtcars, theme='dark')
+        self.assertEqual(pe._components, {})
+        pe.tabular_summary()
+        self.assertEqual(list(pe._components), [SummaryGenerator])
+        self.assertIs(pe._summary, pe._summary)
+        pe.set_theme('minimal')
+        self.assertEqual(pe._plotter._theme, 'minimal')
+        self.assertEqual(pe._summary._theme, 'minimal')
+    
+    def test_summary_does_not_import_matplotlib(self):
+        """Test a summary-only script never imports matplotlib or seaborn"""
+        code = ("import sys, pandas as pd, plotease; "
+                "plotease.PlotEase(pd.DataFrame({'a': [1.0, 2.0], 'b': ['x', 'y']})).tabular_summary(); "
+                "print(sorted(m for m in ('matplotlib', 'seaborn') if m in sys.modules))")
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), '[]')
+
+
+# TEST 26: LAZY IMPORTS
+
+class TestLazyImports(unittest.TestCase):
+    """Test the package loads its submodules on first access"""
+    
+    def test_public_names_resolve(self):
+        """Test every name in __all__ is importable and __all__ is unchanged"""
+        import plotease
+        self.assertEqual(plotease.__all__, [
+            'PlotEase', 'VisualizationBase', 'DiagnosticPlotter', 'SummaryGenerator',
+            'ModelComparator', 'QuickPlotter', 'StreamingSummary', 'summarize_chunks',
+            'render_batch', 'DataSource', 'ColumnCache', 'ResultCache', 'utils',
+            '__version__'])
+        namespace = {}
+        exec('from plotease import *', namespace)
+        self.assertIs(namespace['PlotEase'], PlotEase)
+        self.assertIs(namespace['utils'], utils)
+        self.assertIn('QuickPlotter', dir(plotease))
+        with self.assertRaises(AttributeError):
+            plotease.NoSuchThing
+    
+    def test_bare_import_is_light(self):
+        """Test `import plotease` loads no pandas, scipy or matplotlib"""
+        code = ("import sys, plotease; "
+                "print(sorted(m for m in ('pandas', 'scipy', 'matplotlib') if m in sys.modules))")
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), '[]')
+
+
+# TEST 27: TRACING
+
+class TestTracing(unittest.TestCase):
+    """Test opt-in per-stage timing instrumentation"""
+    
+    def setUp(self):
+        self.mtcars = load_mtcars()
+    
+    def tearDown(self):
+        import matplotlib.pyplot as plt
+        plt.close('all')
+    
+    def test_stages_recorded(self):
+        """Test validation, statistics and every panel show up as stages"""
+        from plotease.tracing import tracing
+        with tracing(memory=True) as trace:
+            pe = PlotEase(self.mtcars)
+            pe.autoplot(target='mpg')
+        totals = trace.totals()
+        for name in ('validate_data', 'create_distributions', 'create_correlations',
+                     'create_missing_data', 'create_target',
+                     'correlation_matrix', 'histogram', 'seaborn.heatmap'):
+            self.assertIn(name, totals)
+        self.assertEqual(totals['create_target']['category'], 'panel')
+        heatmap = next(s for s in trace.spans if s.name == 'seaborn.heatmap')
+        self.assertEqual(trace.spans[heatmap.parent].name, 'create_correlations')
+        self.assertTrue(all(s.peak_bytes >= 0 and s.wall >= 0 for s in trace.spans))
+        self.assertLessEqual(totals['create_correlations']['self'], totals['create_correlations']['wall'])
+    
+    def test_exports(self):
+        """Test JSON and Chrome trace exports"""
+        import json
+        from plotease.tracing import tracing
+        folder = tempfile.mkdtemp()
+        try:
+            with tracing() as trace:
+                render_batch([{'data': self.mtcars, 'kind': 'quick_plot', 'x': 'hp', 'y': 'mpg'}],
+                             output_dir=folder, max_workers=1)
+            document = trace.to_chrome_trace(os.path.join(folder, 'trace.json'))
+            self.assertEqual({e['ph'] for e in document['traceEvents']}, {'X'})
+            self.assertIn('savefig', [e['name'] for e in document['traceEvents']])
+            self.assertIn('tight_layout', json.loads(trace.to_json())['totals'])
+        finally:
+            shutil.rmtree(folder)
+    
+    def test_json_export_of_numpy_args(self):
+        """Test span arguments JSON cannot encode are exported as strings"""
+        import json
+        from plotease.tracing import tracing, stage
+        with tracing() as trace:
+            with stage('custom', rows=np.int64(32), dtype=np.dtype('float64'), key=(30, None)):
+                pass
+        args = json.loads(trace.to_json())['spans'][0]['args']
+        self.assertEqual(args, {'rows': '32', 'dtype': 'float64', 'key': [30, None]})
+    
+    def test_off_by_default(self):
+        """Test nothing is recorded outside a tracing block"""
+        from plotease.tracing import tracing
+        with tracing() as trace:
+            pass
+        SummaryGenerator(self.mtcars).tabular_summary()
+        self.assertEqual(len(trace), 0)
+
+
+# TEST 28: MEMORY OPTIMIZER
+
+class TestMemoryOptimizer(unittest.TestCase):
+    """Test lossless dtype compaction"""
+    
+    def setUp(self):
+        self.data = utils.generate_sample_data(2000)
+        self.data['halves'] = np.arange(2000) / 2
+        self.data['ids'] = [f'id{i}' for i in range(2000)]
+    
+    def test_dtypes_compacted_losslessly(self):
+        """Test ints are downcast, exact floats narrowed and low-cardinality text categorized"""
+        compact = utils.optimize_memory(self.data)
+        self.assertEqual(compact['age'].dtype, np.int8)
+        self.assertEqual(compact['salary'].dtype, np.int32)
+        self.assertEqual(compact['halves'].dtype, np.float32)
+        self.assertEqual(compact['satisfaction'].dtype, np.float64)
+        self.assertIsInstance(compact['department'].dtype, pd.CategoricalDtype)
+        self.assertNotIsInstance(compact['ids'].dtype, pd.CategoricalDtype)
+        for col in self.data.columns:
+            np.testing.assert_array_equal(compact[col].to_numpy(dtype=object), self.data[col].to_numpy(dtype=object))
+    
+    def test_plotease_optimizes_and_reports(self):
+        """Test PlotEase(optimize_memory=True) reports savings and summarizes the same values"""
+        pe = PlotEase(self.data, optimize_memory=True)
+        report = pe.memory_report()
+        self.assertGreater(report.loc['Total', 'bytes_saved'], 0)
+        self.assertEqual(report.loc['department', 'dtype_after'], 'category')
+        expected = PlotEase(self.data).tabular_summary(style='numeric')
+        pd.testing.assert_frame_equal(pe.tabular_summary(style='numeric'), expected)
+        self.assertIsNone(PlotEase(self.data).memory_report())
+
+
+# TEST 29: CATEGORICAL COUNTS ENGINE
+# ============================================================================
+
+class TestCategoricalEngine(unittest.TestCase):
+    """Test factorized categorical counts and the heavy-hitters sketch"""
+    
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.colors = pd.Series(rng.choice(['red', 'green', 'blue', None], 5000, p=[0.5, 0.3, 0.15, 0.05]))
+        # ID-like column: 20,000 distinct values plus three heavy ones
+        ids = np.concatenate([[f'id{i}' for i in range(20000)], ['hot'] * 3000, ['warm'] * 2000, ['mild'] * 1000])
+        self.ids = pd.Series(rng.permutation(ids))
+    
+    def test_category_codes_match_object_path(self):
+        """Test category columns are counted from their codes with the same results"""
+        exact = stats.categorical_counts(self.colors)
+        coded = stats.categorical_counts(self.colors.astype(pd.CategoricalDtype(['blue', 'green', 'red', 'unused'])))
+        for key in ('unique', 'missing', 'top_value', 'top_freq'):
+            self.assertEqual(coded[key], exact[key])
+        pd.testing.assert_series_equal(coded['value_counts'].sort_index(), exact['value_counts'].sort_index(),
+                                       check_index_type=False)
+        self.assertEqual(exact['missing'], int(self.colors.isna().sum()))
+    
+    def test_sketch_exact_under_capacity(self):
+        """Test the sketch equals the exact counts while few values are distinct"""
+        exact = stats.categorical_counts(self.colors)
+        sketch = stats.sketch_categorical_counts(self.colors, capacity=10, chunk_rows=700)
+        self.assertEqual(sketch['error'], 0)
+        for key in ('unique', 'missing', 'top_value', 'top_freq'):
+            self.assertEqual(sketch[key], exact[key])
+        pd.testing.assert_series_equal(sketch['value_counts'], exact['value_counts'], check_index_type=False)
+    
+    def test_sketch_finds_heavy_ids(self):
+        """Test the sketch keeps the heavy values of an ID column within its error bound"""
+        sketch = stats.sketch_categorical_counts(self.ids, capacity=50, chunk_rows=4096)
+        self.assertLessEqual(len(sketch['value_counts']), 50)
+        self.assertEqual(list(sketch['value_counts'].index[:3]), ['hot', 'warm', 'mild'])
+        for value, true in (('hot', 3000), ('warm', 2000), ('mild', 1000)):
+            self.assertLessEqual(true - sketch['error'], sketch['value_counts'][value])
+            self.assertLessEqual(sketch['value_counts'][value], true)
+        self.assertAlmostEqual(sketch['unique'], 20003, delta=20003 * 0.1)
+    
+    def test_profile_summary_and_append(self):
+        """Test the profile's categorical summary, top values and sketch merge on append"""
+        data = pd.DataFrame({'color': self.colors, 'id': self.ids[:5000]})
+        profile = PlotEase(data)._profile
+        summary = profile.categorical_summary()
+        self.assertEqual(list(summary), ['color', 'id'])
+        self.assertEqual(profile.top_values('color', 2).index.tolist(), ['red', 'green'])
+        profile.heavy_hitters = 20
+        self.assertIn('sketch', profile.categorical_counts('id'))
+        combined = profile.append(data)
+        counts = profile.categorical_counts('color')
+        self.assertEqual(counts['top_freq'], int((combined['color'] == 'red').sum()))
+        self.assertEqual(counts['missing'], int(combined['color'].isna().sum()))
+        self.assertEqual(PlotEase(data, heavy_hitters=20).tabular_summary(style='categorical').shape[0], 2)
+
+
+# ============================================================================
+# TEST 30: FILE SOURCES
+# ============================================================================
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+class TestDataSources(unittest.TestCase):
+    """Test reading projected, filtered columns from files"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.data = utils.generate_sample_data(500)
+        self.data.loc[::7, 'satisfaction'] = np.nan
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def test_csv_projection_and_filters(self):
+        """Test only the requested columns of the matching rows are loaded from CSV"""
+        path = os.path.join(self.tmpdir, 'data.csv')
+        self.data.to_csv(path, index=False)
+        source = DataSource(path)
+        self.assertEqual(source.format, 'csv')
+        self.assertEqual(source.columns, list(self.data.columns))
+        
+        frame = source.read(['salary', 'age'], filters=[('age', '>=', 40), ('department', 'in', ['Sales', 'IT'])])
+        expected = self.data.loc[(self.data['age'] >= 40) & self.data['department'].isin(['Sales', 'IT']),
+                                 ['salary', 'age']].reset_index(drop=True)
+        pd.testing.assert_frame_equal(frame, expected, check_dtype=False)
+        
+        either = source.read(['age'], filters=[[('age', '<', 25)], [('age', '>', 60)]])
+        self.assertEqual(len(either), int(((self.data['age'] < 25) | (self.data['age'] > 60)).sum()))
+        with self.assertRaises(KeyError):
+            source.read(['nope'])
+        with self.assertRaises(ValueError):
+            source.read(['age'], filters=[('age', '~', 1)])
+    
+    def test_plotease_from_csv(self):
+        """Test PlotEase.from_csv loads only the listed columns"""
+        path = os.path.join(self.tmpdir, 'data.csv')
+        self.data.to_csv(path, index=False)
+        pe = PlotEase.from_csv(path, columns=['age', 'salary'], theme='minimal')
+        self.assertEqual(list(pe._data.columns), ['age', 'salary'])
+        self.assertEqual(pe._theme, 'minimal')
+        with self.assertRaises(ValueError):
+            DataSource(os.path.join(self.tmpdir, 'data.txt'))
+    
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_parquet_footer_statistics(self):
+        """Test Parquet footer statistics and filtered reads"""
+        path = os.path.join(self.tmpdir, 'data.parquet')
+        self.data.to_parquet(path, row_group_size=100)
+        source = DataSource(path)
+        stats_frame = source.statistics()
+        self.assertEqual(stats_frame.loc['satisfaction', 'null_count'], self.data['satisfaction'].isna().sum())
+        self.assertEqual(stats_frame.loc['age', 'min'], self.data['age'].min())
+        self.assertEqual(stats_frame.loc['age', 'max'], self.data['age'].max())
+        
+        pe = PlotEase.from_parquet(path, columns=['satisfaction', 'age'])
+        self.assertEqual(pe._profile.null_count('satisfaction'), self.data['satisfaction'].isna().sum())
+        counts, edges = pe._profile.histogram('age', bins=10)
+        np.testing.assert_array_equal(counts, np.histogram(self.data['age'], bins=10)[0])
+        self.assertNotIn('moments', pe._profile._columns['age'])
+        frame = source.read(['age'], filters=[('age', '>', 50)])
+        self.assertEqual(len(frame), int((self.data['age'] > 50).sum()))
+    
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_parquet_float_nan_not_null(self):
+        """Test float NaNs, which Parquet does not count as null, still count as missing"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        path = os.path.join(self.tmpdir, 'nan.parquet')
+        pq.write_table(pa.table({'x': pa.array([1.0, np.nan, 3.0, np.nan], from_pandas=False),
+                                 'n': pa.array([1, None, 3, 4])}), path)
+        pe = PlotEase.from_parquet(path)
+        self.assertEqual(pe._profile.null_count('x'), 2)
+        self.assertEqual(pe._profile.null_count('n'), 1)
+    
+    def test_preloaded_range_skips_moments(self):
+        """Test that a preloaded footer min/max gives histogram ranges without moments"""
+        profile = PlotEase(self.data)._profile
+        low, high = float(self.data['age'].min()), float(self.data['age'].max())
+        profile.preload({'age': {'value_range': (low, high)}})
+        counts, edges = profile.histogram('age', bins=12)
+        expected_counts, expected_edges = np.histogram(self.data['age'], bins=12)
+        np.testing.assert_array_equal(counts, expected_counts)
+        np.testing.assert_allclose(edges, expected_edges)
+        self.assertNotIn('moments', profile._columns['age'])
+        
+        profile.append(self.data.iloc[:1].assign(age=int(high) + 5))
+        self.assertEqual(profile.value_range('age'), (low, high + 5))
+        counts, _ = profile.histogram('age', bins=12)
+        self.assertEqual(counts.sum(), self.data['age'].notna().sum() + 1)
+
+
+# ============================================================================
+# TEST 31: COLUMN CACHE
+# ============================================================================
+
+class TestColumnCache(unittest.TestCase):
+    """Test the memory-mapped on-disk column cache"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.data = utils.generate_sample_data(1000)
+        self.data.loc[::9, 'department'] = None
+        self.data['level'] = self.data['performance'].astype('category')
+        self.data['when'] = pd.date_range('2024-01-01', periods=1000, freq='h')
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def test_round_trip_memory_mapped(self):
+        """Test stored frames come back equal, with numeric columns memory-mapped"""
+        cache = ColumnCache(os.path.join(self.tmpdir, 'cache'))
+        self.assertIsNone(cache.get('sales'))
+        cache.put('sales', self.data)
+        self.assertIn('sales', cache)
+        loaded = cache.get('sales')
+        pd.testing.assert_frame_equal(loaded, self.data)
+        values = loaded['salary'].to_numpy()
+        self.assertFalse(values.flags.writeable)
+        self.assertFalse(values.flags.owndata)
+        indexed = self.data.set_index('when')
+        pd.testing.assert_frame_equal(cache.put('indexed', indexed), indexed)
+        summary = PlotEase(loaded).tabular_summary()
+        pd.testing.assert_frame_equal(summary, PlotEase(self.data).tabular_summary())
+    
+    def test_lru_eviction(self):
+        """Test the least recently used entries are evicted beyond max_bytes"""
+        cache = ColumnCache(os.path.join(self.tmpdir, 'cache'))
+        for key in ('a', 'b', 'c'):
+            cache.put(key, self.data)
+        size = cache.entries()['bytes'].max()
+        os.utime(os.path.join(cache._entry('a'), 'meta.pkl'), (0, 0))
+        os.utime(os.path.join(cache._entry('b'), 'meta.pkl'), (1, 1))
+        cache.get('a')
+        self.assertEqual(cache.evict(max_bytes=2 * size), ['b'])
+        cache.max_bytes = size
+        cache.put('d', self.data)
+        self.assertEqual(list(cache.entries().index), ['d'])
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+    
+    def test_source_read_through_cache(self):
+        """Test DataSource reads are cached until the file changes"""
+        path = os.path.join(self.tmpdir, 'data.csv')
+        self.data.to_csv(path, index=False)
+        cache = ColumnCache(os.path.join(self.tmpdir, 'cache'))
+        pe = PlotEase.from_csv(path, columns=['age', 'salary'], cache=cache)
+        self.assertEqual(len(cache), 1)
+        again = PlotEase.from_csv(path, columns=['age', 'salary'], cache=cache)
+        pd.testing.assert_frame_equal(again._data, pe._data)
+        self.assertEqual(len(cache), 1)
+        self.data.iloc[:10].to_csv(path, index=False)
+        self.assertEqual(len(cache.read(DataSource(path), ['age'])), 10)
+        self.assertEqual(len(cache), 2)
+
+
+# ============================================================================
+# TEST 32: RESULT CACHE
+# ============================================================================
+
+class TestResultCache(unittest.TestCase):
+    """Test the persistent cache of summaries and rendered figures"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.data = utils.generate_sample_data(300)
+        self.cache = ResultCache(os.path.join(self.tmpdir, 'results'))
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def test_summary_hit_after_miss(self):
+        """Test a summary is computed once and served from disk for equal data"""
+        expected = PlotEase(self.data).tabular_summary()
+        first = PlotEase(self.data, result_cache=self.cache).tabular_summary()
+        second = PlotEase(self.data.copy(), result_cache=self.cache).tabular_summary()
+        pd.testing.assert_frame_equal(first, expected)
+        pd.testing.assert_frame_equal(second, expected)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        
+        changed = self.data.copy()
+        changed.loc[0, 'age'] += 1
+        PlotEase(changed, result_cache=self.cache).tabular_summary()
+        self.assertEqual(self.cache.misses, 2)
+        self.assertEqual(self.cache.stats()['entries'], 2)
+    
+    def test_summary_keyed_by_profile_settings(self):
+        """Test sketched and exact summaries of the same data do not share an entry"""
+        PlotEase(self.data, heavy_hitters=2, result_cache=self.cache).tabular_summary()
+        exact = PlotEase(self.data, result_cache=self.cache).tabular_summary()
+        pd.testing.assert_frame_equal(exact, PlotEase(self.data).tabular_summary())
+        PlotEase(self.data, quantile_method='sketch', result_cache=self.cache).tabular_summary()
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 3))
+    
+    def test_figures_cached_per_theme(self):
+        """Test saved figures are copied from the cache, keyed on the theme"""
+        pe = PlotEase(self.data, result_cache=self.cache)
+        first = pe.save_plot(os.path.join(self.tmpdir, 'a.png'), target='salary')
+        second = pe.save_plot(os.path.join(self.tmpdir, 'b.png'), target='salary')
+        with open(first, 'rb') as a, open(second, 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+        self.assertEqual(self.cache.hits, 1)
+        pe.set_theme('dark')
+        pe.save_plot(os.path.join(self.tmpdir, 'c.svg'), kind='quick_plot', x='age', y='salary')
+        pe.save_plot(os.path.join(self.tmpdir, 'd.png'), target='salary')
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 3))
+    
+    def test_batch_workers_counted(self):
+        """Test hits and misses of render_batch's worker processes reach the caller's cache"""
+        jobs = [{'data': 'people', 'target': 'salary', 'name': f'sheet{i}'} for i in range(2)]
+        render_batch(jobs, self.tmpdir, datasets={'people': self.data}, max_workers=2, cache=self.cache)
+        self.assertEqual(self.cache.hits + self.cache.misses, 2)
+        self.assertGreaterEqual(self.cache.misses, 1)
+        render_batch(jobs, self.tmpdir, datasets={'people': self.data}, max_workers=2, cache=self.cache)
+        self.assertEqual(self.cache.hits + self.cache.misses, 4)
+        self.assertGreaterEqual(self.cache.hits, 2)
+    
+    def test_ttl_and_size_eviction(self):
+        """Test expired entries miss and the size limit evicts least recently used first"""
+        for i in range(3):
+            self.cache.put_frame(f'k{i}', self.data.head(50))
+        self.cache.get_frame('k0')
+        size = self.cache.entries()['bytes'].max()
+        self.assertEqual(len(self.cache.evict(max_bytes=2 * size)), 1)
+        self.assertIsNotNone(self.cache.get_frame('k0'))
+        self.assertIsNone(self.cache.get_frame('k1'))
+        
+        self.cache.ttl = 60
+        path = self.cache._lookup('k2', ('parquet', 'pkl'))
+        os.utime(path, (0, 0))
+        self.assertIsNone(self.cache.get_frame('k2'))
+        self.assertEqual(len(self.cache), 1)
+
+
+# ============================================================================
+# TEST 33: ASYNC RENDERING
+# ============================================================================
+
+class TestAsyncRendering(unittest.TestCase):
+    """Test the asyncio rendering API"""
+    
+    def setUp(self):
+        from plotease.aio import AsyncRenderer
+        self.pe = PlotEase(utils.generate_sample_data(500))
+        self.renderer = AsyncRenderer(max_workers=2, max_pending=2)
+    
+    def tearDown(self):
+        self.renderer.shutdown()
+    
+    def test_in_place_edit_changes_the_image(self):
+        """Test requests are keyed on the data's content, not on the frame object"""
+        from plotease.rendering import RENDER_LOCK
+        data = utils.generate_sample_data(500)
+        pe = PlotEase(data)
+        
+        async def run():
+            loop = asyncio.get_running_loop()
+            # Keep the first render in flight while the frame is edited
+            with RENDER_LOCK:
+                first = asyncio.ensure_future(pe.quick_plot_async('age', 'salary', renderer=self.renderer))
+                while not self.renderer._in_flight.get(loop):
+                    await asyncio.sleep(0.01)
+                data['salary'] = data['salary'] * 10
+                second = asyncio.ensure_future(pe.quick_plot_async('age', 'salary', renderer=self.renderer))
+                # (A request for the old data would share the first render instead)
+                for _ in range(200):
+                    if len(self.renderer._in_flight[loop]) == 2:
+                        break
+                    await asyncio.sleep(0.01)
+            return await first, await second
+        first, second = asyncio.run(run())
+        self.assertNotEqual(first, second)
+    
+    def test_quick_plot_data_prepared_outside_render_lock(self):
+        """Test quick plot jobs compute their data while another thread holds the render lock"""
+        import time
+        from plotease.batch import render_bytes
+        from plotease.rendering import RENDER_LOCK
+        profile = self.pe._profile
+        with RENDER_LOCK:
+            work = self.renderer._executor.submit(
+                render_bytes, {'kind': 'quick_plot', 'data': self.pe._data, 'x': 'age'}, 'png', 100, profile)
+            deadline = time.monotonic() + 60
+            while 'histograms' not in profile._columns.get('age', {}) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertIn('histograms', profile._columns.get('age', {}))
+            self.assertFalse(work.done())
+        self.assertTrue(work.result(timeout=60).startswith(b'\x89PNG'))
+    
+    def test_thread_jobs_wait_for_profile_lock(self):
+        """Test thread-pool jobs compute statistics under the shared profile's lock"""
+        from concurrent.futures import wait
+        from plotease.batch import render_bytes
+        profile = self.pe._profile
+        jobs = [{'kind': 'quick_plot', 'data': self.pe._data, 'x': 'age'},
+                {'kind': 'autoplot', 'data': self.pe._data, 'target': 'salary'}]
+        with profile.lock:
+            works = [self.renderer._executor.submit(render_bytes, job, 'png', 100, profile) for job in jobs]
+            wait(works, timeout=0.2)
+            self.assertFalse(any(work.done() for work in works))
+            self.assertNotIn('age', profile._columns)
+        for work in works:
+            self.assertTrue(work.result(timeout=60).startswith(b'\x89PNG'))
+    
+    def test_returns_image_bytes(self):
+        """Test async variants return encoded images"""
+        async def run():
+            png = await self.pe.autoplot_async(target='salary', renderer=self.renderer)
+            svg = await self.pe.quick_plot_async('age', 'salary', fmt='svg', renderer=self.renderer)
+            return png, svg
+        png, svg = asyncio.run(run())
+        self.assertTrue(png.startswith(b'\x89PNG'))
+        self.assertIn(b'<svg', svg[:500])
+    
+    def test_identical_requests_share_one_render(self):
+        """Test concurrent identical requests get the very same result object"""
+        async def run():
+            return await asyncio.gather(*[self.pe.autoplot_async(target='age', renderer=self.renderer)
+                                          for _ in range(4)],
+                                        self.pe.autoplot_async(target='salary', renderer=self.renderer))
+        results = asyncio.run(run())
+        self.assertTrue(all(r is results[0] for r in results[:4]))
+        self.assertIsNot(results[4], results[0])
+    
+    def test_cancellation_and_backpressure(self):
+        """Test cancelled requests raise CancelledError and free their slots"""
+        async def run():
+            tasks = [asyncio.create_task(self.pe.quick_plot_async('age', title=str(i), renderer=self.renderer))
+                     for i in range(6)]
+            await asyncio.sleep(0)
+            for task in tasks[2:]:
+                task.cancel()
+            outcome = await asyncio.gather(*tasks, return_exceptions=True)
+            # Every slot is available again afterwards
+            after = await asyncio.wait_for(asyncio.gather(
+                *[self.pe.quick_plot_async('age', title=f'after {i}', renderer=self.renderer)
+                  for i in range(3)]), timeout=60)
+            return outcome, after
+        outcome, after = asyncio.run(run())
+        self.assertTrue(all(isinstance(o, bytes) for o in outcome[:2]))
+        self.assertTrue(all(isinstance(o, asyncio.CancelledError) for o in outcome[2:]))
+        self.assertEqual(len(after), 3)
+
+
+# ============================================================================
+# TEST 34: FIGURE OWNERSHIP
+# ============================================================================
+
+class TestFigureOwnership(unittest.TestCase):
+    """Test plots are drawn on standalone figures returned to the caller"""
+    
+    def setUp(self):
+        import matplotlib.pyplot as plt
+        plt.close('all')
+        self.data = utils.generate_sample_data(300)
+        self.pe = PlotEase(self.data)
+    
+    def test_plots_return_figures_without_pyplot_state(self):
+        """Test show=False returns the Figure and registers nothing with pyplot"""
+        import matplotlib.pyplot as plt
+        from matplotlib.figure import Figure
+        results = {'A': {'accuracy': 0.9, 'f1': 0.8}, 'B': {'accuracy': 0.85, 'f1': 0.82}}
+        figures = [self.pe.quick_plot('age', 'salary', show=False),
+                   self.pe.autoplot(target='salary', show=False),
+                   self.pe.compare_models(results, show=False)]
+        for fig in figures:
+            self.assertIsInstance(fig, Figure)
+            self.assertTrue(fig.axes)
+        self.assertEqual(plt.get_fignums(), [])
+    
+    def test_shown_figures_are_closed(self):
+        """Test showing a plot does not leave figures open on a headless backend"""
+        import matplotlib.pyplot as plt
+        for _ in range(3):
+            self.assertIsNone(self.pe.quick_plot('age', 'salary'))
+        self.assertIsNone(self.pe.autoplot(target='salary'))
+        self.assertEqual(plt.get_fignums(), [])
+    
+    def test_adopt_figure_without_pyplot_support(self):
+        """Test standalone figures are shown on matplotlib versions whose pyplot cannot adopt them"""
+        import matplotlib.pyplot as plt
+        from unittest import mock
+        from plotease.rendering import new_figure, _adopt_figure
+        fig = new_figure()
+        with mock.patch.object(plt, 'figure', side_effect=ValueError("not managed by pyplot")):
+            _adopt_figure(fig)
+        self.assertIs(plt.gcf(), fig)
+        plt.close(fig)
+        self.assertEqual(plt.get_fignums(), [])
+    
+    def test_concurrent_threads_draw_their_own_figures(self):
+        """Test threads plotting at once each get their own, complete figure"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        def plot(i):
+            return i, self.pe.quick_plot('age', 'salary', title=f'plot {i}', show=False)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(plot, range(16)))
+        for i, fig in results:
+            self.assertEqual(len(fig.axes), 1)
+            self.assertEqual(fig.axes[0].get_title(), f'plot {i}')
+    
+    def test_release_figure(self):
+        """Test releasing a figure drops its artists"""
+        from plotease.rendering import release_figure
+        fig = self.pe.quick_plot('age', 'salary', show=False)
+        release_figure(fig)
+        self.assertEqual(fig.axes, [])
+
+
+# ============================================================================
 # RUN ALL TESTS
 
 if __name__ == '__main__':